@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, g
 import os
 import json
 import subprocess
@@ -10,30 +10,385 @@ import time
 from datetime import datetime
 import psutil
 import gc
+import copy
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
 import uuid
 from threading import Lock
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+import heapq
+import itertools
 from flask import Response
 import json
 import re
-import tempfile
-import cv2
-import numpy as np
-import easyocr
-from fuzzywuzzy import fuzz
+import sqlite3
+import hashlib
+import atexit
+import queue
+import bisect
+import logging
+import socket
+import sys
+import pickle
+from fractions import Fraction
 
 app = Flask(__name__)
 
-# Initialize OCR reader (lazy loaded)
+# Logging
+# VIDEOEDITOR_LOG_LEVEL sets the base level (use WARNING in production, DEBUG for per-frame
+# detail), VIDEOEDITOR_LOG_LEVELS overrides single loggers ("tracking=DEBUG,ffmpeg=WARNING")
+# and VIDEOEDITOR_LOG_FORMAT=json switches to one JSON object per line.
+LOG_LEVEL = os.environ.get('VIDEOEDITOR_LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.environ.get('VIDEOEDITOR_LOG_LEVELS', '')
+LOG_FORMAT = os.environ.get('VIDEOEDITOR_LOG_FORMAT', 'text').lower()
+LOG_FRAME_SAMPLE_EVERY = max(1, int(os.environ.get('VIDEOEDITOR_LOG_FRAME_SAMPLE', 50)))  # Per-frame debug lines are kept for every Nth frame
+LOG_PROGRESS_INTERVAL = 5.0  # Seconds between progress lines of one job
+LOG_RATE_LIMIT_INTERVAL = 10.0  # Seconds between repeats of one rate-limited message
+LOG_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonLogFormatter(logging.Formatter):
+    """Formats records as single-line JSON, including fields passed with extra="""
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in LOG_RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging():
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(name)s: %(message)s'))
+    root_logger = logging.getLogger('videoeditor')
+    root_logger.addHandler(handler)
+    root_logger.setLevel(LOG_LEVEL)
+    root_logger.propagate = False
+    for override in filter(None, (item.strip() for item in LOG_LEVELS.split(','))):
+        name, _, level = override.partition('=')
+        logging.getLogger(f'videoeditor.{name.strip()}').setLevel(level.strip().upper())
+
+configure_logging()
+jobs_log = logging.getLogger('videoeditor.jobs')
+ffmpeg_log = logging.getLogger('videoeditor.ffmpeg')
+frames_log = logging.getLogger('videoeditor.frames')
+export_log = logging.getLogger('videoeditor.export')
+tracking_log = logging.getLogger('videoeditor.tracking')
+rectangles_log = logging.getLogger('videoeditor.rectangles')
+metrics_log = logging.getLogger('videoeditor.metrics')
+
+class LogRateLimiter:
+    """Lets one message per key through every interval seconds and counts the rest"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._last = {}  # key -> (last emitted monotonic time, suppressed count)
+        self._lock = Lock()
+    
+    def allow(self, key=None):
+        """Return the number of messages suppressed since the last one, or None to skip this one"""
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._last.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._last[key] = (last, suppressed + 1)
+                return None
+            self._last[key] = (now, 0)
+            if len(self._last) > 1024:
+                # Drop the oldest keys so per-job keys don't accumulate
+                for stale in sorted(self._last, key=lambda k: self._last[k][0])[:512]:
+                    del self._last[stale]
+            return suppressed
+
+progress_log_limiter = LogRateLimiter(LOG_PROGRESS_INTERVAL)
+warning_log_limiter = LogRateLimiter(LOG_RATE_LIMIT_INTERVAL)
+
+def frame_log_sampled(logger, frame_index):
+    """True when logger has DEBUG enabled and frame_index falls on the sampling stride"""
+    return frame_index % LOG_FRAME_SAMPLE_EVERY == 0 and logger.isEnabledFor(logging.DEBUG)
+
+# Tracking dependencies
+# OpenCV, numpy and fuzzywuzzy are only needed for tracking, so they are imported on
+# first use instead of at startup. OCR runs in VIDEOEDITOR_OCR_WORKERS worker
+# processes (ocr_worker.py), each holding its own easyocr reader, so the torch
+# stack never loads into the web process; 0 runs OCR in-process instead. Set
+# VIDEOEDITOR_OCR_WARMUP=1 to start the workers (or build the in-process reader)
+# in the background once the server is accepting connections; /health reports
+# the progress.
+OCR_WARMUP = os.environ.get('VIDEOEDITOR_OCR_WARMUP', '0').lower() in ('1', 'true', 'yes')
+OCR_WARMUP_WAIT_SECONDS = 30  # How long warm-up waits for the server to start listening
+OCR_WORKER_PROCESSES = max(0, int(os.environ.get('VIDEOEDITOR_OCR_WORKERS', 1)))
+OCR_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_worker.py')
+OCR_BATCH_MAX = 8  # Requests handed to a worker in one batch
+OCR_BATCH_WAIT = 0.005  # Seconds a worker waits for more requests to fill a batch
+OCR_REQUEST_TIMEOUT = 120  # Includes waiting for a worker to load its model
+OCR_RESTART_BACKOFF = 5.0  # Seconds before respawning a worker that failed to start
+
+cv2 = None
+np = None
+fuzz = None
 ocr_reader = None
+tracking_modules_lock = Lock()
+ocr_status = {
+    'state': 'not_loaded',  # not_loaded, loading, ready or error
+    'mode': 'processes' if OCR_WORKER_PROCESSES else 'in_process',
+    'import_seconds': None,
+    'reader_seconds': None,
+    'error': None
+}
+
+def load_tracking_modules():
+    """Import the tracking modules into module globals on first use"""
+    global cv2, np, fuzz
+    if fuzz is not None:
+        return
+    with tracking_modules_lock:
+        if fuzz is not None:
+            return
+        start = time.perf_counter()
+        try:
+            import cv2 as cv2_module
+            import numpy as numpy_module
+            from fuzzywuzzy import fuzz as fuzz_module
+        except ImportError as e:
+            ocr_status.update({'state': 'error', 'error': str(e)})
+            raise
+        cv2, np = cv2_module, numpy_module
+        fuzz = fuzz_module
+        ocr_status['import_seconds'] = round(time.perf_counter() - start, 3)
+        tracking_log.info("Tracking modules imported in %.2fs", ocr_status['import_seconds'])
 
 def get_ocr_reader():
+    """In-process easyocr reader, used when OCR_WORKER_PROCESSES is 0"""
     global ocr_reader
     if ocr_reader is None:
-        ocr_reader = easyocr.Reader(['en'])
+        with tracking_modules_lock:
+            if ocr_reader is None:
+                ocr_status['state'] = 'loading'
+                start = time.perf_counter()
+                try:
+                    import easyocr
+                    reader = easyocr.Reader(['en'])
+                except Exception as e:
+                    ocr_status.update({'state': 'error', 'error': str(e)})
+                    raise
+                ocr_status['reader_seconds'] = round(time.perf_counter() - start, 3)
+                ocr_status['state'] = 'ready'
+                ocr_reader = reader
+                tracking_log.info("OCR reader ready in %.2fs", ocr_status['reader_seconds'])
     return ocr_reader
 
+class OCRWorkerPool:
+    """Runs readtext in worker processes fed from one batching request queue
+    
+    Each worker process is owned by a dispatcher thread that takes up to
+    OCR_BATCH_MAX queued requests at a time, sends them to its process and
+    resolves their futures. A worker that dies is restarted and only the
+    requests of its current batch fail.
+    """
+    
+    def __init__(self, size, batch_max=OCR_BATCH_MAX, batch_wait=OCR_BATCH_WAIT):
+        self.size = size
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait
+        self._requests = queue.Queue()
+        self._request_ids = itertools.count()
+        self._threads = []
+        self._processes = {}  # slot -> Popen
+        self._ready = set()
+        self._stats = {'batches': 0, 'requests': 0, 'restarts': 0}
+        self._lock = Lock()
+        self._stopping = threading.Event()
+    
+    def start(self):
+        with self._lock:
+            if self._threads or self._stopping.is_set():
+                return
+            if ocr_status['state'] == 'not_loaded':
+                ocr_status['state'] = 'loading'
+            for slot in range(self.size):
+                thread = threading.Thread(target=self._serve, args=(slot,), name=f'ocr-dispatch-{slot}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+    
+    def submit(self, image):
+        """Queue an image for OCR, returning a Future of its readtext results"""
+        self.start()
+        future = Future()
+        self._requests.put((next(self._request_ids), image, future))
+        return future
+    
+    def readtext(self, image, timeout=OCR_REQUEST_TIMEOUT):
+        return self.submit(image).result(timeout=timeout)
+    
+    def status(self):
+        with self._lock:
+            return dict(self._stats, workers=self.size, ready=len(self._ready), queued=self._requests.qsize())
+    
+    def stop(self):
+        self._stopping.set()
+        for _ in self._threads:
+            self._requests.put(None)
+        for process in list(self._processes.values()):
+            try:
+                pickle.dump(('stop',), process.stdin)
+                process.stdin.flush()
+            except OSError:
+                pass
+        for process in list(self._processes.values()):
+            try:
+                process.wait(timeout=PROCESS_TERMINATE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    def _spawn(self, slot):
+        """Start a worker process and wait for its model to load, None if it failed"""
+        threads = max(1, (os.cpu_count() or 1) // self.size)
+        process = subprocess.Popen(
+            [sys.executable, OCR_WORKER_SCRIPT, '--threads', str(threads)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        try:
+            message = pickle.load(process.stdout)
+        except (EOFError, pickle.UnpicklingError):
+            message = ('failed', f'worker exited with code {process.wait()}')
+        if message[0] != 'ready':
+            process.kill()
+            process.wait()
+            tracking_log.error("OCR worker %d failed to start: %s", slot, message[1])
+            with self._lock:
+                if not self._ready:
+                    ocr_status.update({'state': 'error', 'error': message[1]})
+            return None
+        with self._lock:
+            self._processes[slot] = process
+            self._ready.add(slot)
+            if ocr_status['state'] != 'ready':
+                ocr_status.update({'state': 'ready', 'reader_seconds': round(message[1], 3), 'error': None})
+        tracking_log.info("OCR worker %d (pid %d) ready in %.2fs", slot, process.pid, message[1])
+        return process
+    
+    def _next_batch(self):
+        """Block for one request, then take whatever else arrives within batch_wait"""
+        first = self._requests.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_max:
+            try:
+                request = self._requests.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if request is None:
+                self._requests.put(None)  # Leave the stop marker for this thread's next call
+                break
+            batch.append(request)
+        return [request for request in batch if request[2].set_running_or_notify_cancel()]
+    
+    def _fail_queued_if_no_workers(self):
+        """Fail waiting requests instead of letting them time out when no worker can start"""
+        with self._lock:
+            if self._ready:
+                return
+        error = RuntimeError(f"OCR workers unavailable: {ocr_status['error']}")
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if request is None:
+                self._requests.put(None)
+                return
+            if request[2].set_running_or_notify_cancel():
+                request[2].set_exception(error)
+    
+    def _serve(self, slot):
+        process = None
+        while not self._stopping.is_set():
+            if process is None:
+                process = self._spawn(slot)
+                if process is None:
+                    self._fail_queued_if_no_workers()
+                    self._stopping.wait(OCR_RESTART_BACKOFF)
+                    continue
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if not batch:
+                continue
+            try:
+                pickle.dump(('batch', [(request_id, image) for request_id, image, _ in batch]),
+                            process.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+                process.stdin.flush()
+                _, replies = pickle.load(process.stdout)
+            except (EOFError, OSError, pickle.UnpicklingError) as e:
+                tracking_log.error("OCR worker %d died (%s), restarting it", slot, e)
+                for _, _, future in batch:
+                    future.set_exception(RuntimeError(f'OCR worker died: {e}'))
+                process.kill()
+                process.wait()
+                with self._lock:
+                    self._ready.discard(slot)
+                    self._processes.pop(slot, None)
+                    self._stats['restarts'] += 1
+                process = None
+                continue
+            
+            futures = {request_id: future for request_id, _, future in batch}
+            for request_id, results, error in replies:
+                if error:
+                    futures[request_id].set_exception(RuntimeError(error))
+                else:
+                    futures[request_id].set_result(results)
+            with self._lock:
+                self._stats['batches'] += 1
+                self._stats['requests'] += len(batch)
+
+ocr_pool = OCRWorkerPool(OCR_WORKER_PROCESSES) if OCR_WORKER_PROCESSES else None
+if ocr_pool:
+    atexit.register(ocr_pool.stop)
+
+def ocr_readtext(image):
+    """Run easyocr readtext on an image, in the worker pool when it is enabled"""
+    if ocr_pool:
+        return ocr_pool.readtext(image)
+    return get_ocr_reader().readtext(image)
+
+def start_ocr():
+    """Start loading OCR (worker processes or the in-process reader) without using it"""
+    if ocr_pool:
+        ocr_pool.start()
+    else:
+        get_ocr_reader()
+
+def warm_up_ocr(host, port):
+    """Wait until the server accepts connections, then load the OCR stack"""
+    deadline = time.monotonic() + OCR_WARMUP_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    jobs_log.info("Server accepting connections %.2fs after process start", time.time() - psutil.Process().create_time())
+    try:
+        load_tracking_modules()
+        start_ocr()
+    except Exception as e:
+        tracking_log.error("OCR warm-up failed: %s", e)
+
 # Global tracking state
 tracking_state = {
     'active': False,
@@ -50,13 +405,922 @@ tracking_state = {
 UPLOAD_FOLDER = 'data'
 FRAMES_FOLDER = 'frames'
 EXPORT_FOLDER = 'exports'
+EXTRACTION_FRAME_RATE = Fraction(30)  # Every video's frames are extracted at this rate
+
+def frame_time(frame_index):
+    """Seconds from the start of the video to an extracted frame (or a duration in frames)"""
+    return float(frame_index / EXTRACTION_FRAME_RATE)
 
 for folder in [UPLOAD_FOLDER, FRAMES_FOLDER, EXPORT_FOLDER]:
     os.makedirs(folder, exist_ok=True)
 
 # Job tracking system
-jobs = {}
+JOB_DB_PATH = os.path.join(EXPORT_FOLDER, 'jobs.sqlite3')
+JOB_TTL_SECONDS = 24 * 60 * 60  # Finished jobs are deleted from the store after this long
+JOB_MEMORY_GRACE_SECONDS = 60  # Finished jobs stay in memory this long for clients still polling
+JOB_FLUSH_INTERVAL = 2.0
+TERMINAL_JOB_STATUSES = ('completed', 'error', 'cancelled', 'interrupted')
+
+class SQLiteJobBackend:
+    """Persists job entries as JSON rows in a SQLite database"""
+
+    def __init__(self, db_path):
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, job_type TEXT, status TEXT, '
+                'created_at REAL, updated_at REAL, finished_at REAL, data TEXT)'
+            )
+
+    def save_many(self, rows):
+        """rows: iterable of (job_id, job_type, status, created_at, finished_at, data_json)"""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO jobs (id, job_type, status, created_at, updated_at, finished_at, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(job_id, job_type, status, created_at, now, finished_at, data)
+                 for job_id, job_type, status, created_at, finished_at, data in rows]
+            )
+
+    def load(self, job_id):
+        with self._lock:
+            row = self._connection.execute('SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_by_status(self, status):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT data FROM jobs WHERE status = ? ORDER BY created_at DESC', (status,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_unfinished_interrupted(self):
+        """Flag jobs that were still running when the server stopped, returns their count"""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, data FROM jobs WHERE status NOT IN ({})'.format(','.join('?' * len(TERMINAL_JOB_STATUSES))),
+                TERMINAL_JOB_STATUSES
+            ).fetchall()
+        if not rows:
+            return 0
+        
+        now = time.time()
+        updated = []
+        for job_id, data in rows:
+            job = json.loads(data)
+            job['previous_status'] = job.get('status')
+            job['status'] = 'interrupted'
+            job['message'] = 'Server restarted before the job finished'
+            job['interrupted_at'] = now
+            updated.append((job_id, job.get('job_type'), 'interrupted', job.get('created_at'), now, json.dumps(job, default=str)))
+        self.save_many(updated)
+        return len(updated)
+
+    def delete_finished_before(self, cutoff):
+        with self._lock, self._connection:
+            return self._connection.execute(
+                'DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?', (cutoff,)
+            ).rowcount
+
+class JobEntry(dict):
+    """Job dict that counts its modifications, so flushes only copy jobs that changed"""
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        self.version += 1
+        return super().pop(key, *default)
+
+class JobStore:
+    """Job registry: running jobs live in memory, every job is persisted to a backend
+    
+    Supports the dict operations the rest of the app uses on `jobs`; callers must
+    hold jobs_lock. Assigned jobs are stored as JobEntry so changes can be detected
+    from a version counter instead of comparing serialized copies. Finished jobs are dropped from memory after a grace period and
+    served from the backend until they expire.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._live = {}
+        self._flushed = {}  # job_id -> (entry, version) last written to the backend
+        self._finished_at = {}
+        self._released = set()  # Jobs whose worker has returned
+        self.interrupted_on_startup = backend.mark_unfinished_interrupted()
+
+    def __contains__(self, job_id):
+        return job_id in self._live
+
+    def __getitem__(self, job_id):
+        return self._live[job_id]
+
+    def __setitem__(self, job_id, job):
+        self._live[job_id] = job if isinstance(job, JobEntry) else JobEntry(job)
+
+    def __delitem__(self, job_id):
+        del self._live[job_id]
+
+    def __len__(self):
+        return len(self._live)
+
+    def get(self, job_id, default=None):
+        return self._live.get(job_id, default)
+
+    def values(self):
+        return self._live.values()
+
+    def items(self):
+        return self._live.items()
+
+    def release(self, job_id):
+        """Record that a job's worker has returned, must hold jobs_lock"""
+        job = self._live.get(job_id)
+        if job is None:
+            return
+        if job.get('status') not in TERMINAL_JOB_STATUSES:
+            job['status'] = 'error'
+            job.setdefault('error', 'Job ended without reporting a result')
+        self._released.add(job_id)
+
+    def collect_changes(self):
+        """Snapshot jobs changed since the last flush, must hold jobs_lock
+        
+        Returns (job_id, job_type, status, created_at, finished_at, job copy) rows.
+        The copies are shallow, which is enough because job values are never mutated
+        in place; serialize them after releasing the lock.
+        """
+        now = time.time()
+        rows = []
+        for job_id, job in self._live.items():
+            if job.get('status') in TERMINAL_JOB_STATUSES:
+                self._finished_at.setdefault(job_id, now)
+            flushed = self._flushed.get(job_id)
+            if flushed is None or flushed[0] is not job or flushed[1] != job.version:
+                self._flushed[job_id] = (job, job.version)
+                rows.append((job_id, job.get('job_type'), job.get('status'), job.get('created_at'),
+                             self._finished_at.get(job_id), dict(job)))
+        return rows
+
+    def evict_finished(self):
+        """Drop persisted finished jobs from memory after the grace period, must hold jobs_lock
+        
+        Only jobs whose worker has returned are evicted, so a cancelled job that is
+        still winding down keeps seeing its own entry.
+        """
+        cutoff = time.time() - JOB_MEMORY_GRACE_SECONDS
+        expired = [j for j, finished in self._finished_at.items() if finished < cutoff and j in self._released]
+        for job_id in expired:
+            self._live.pop(job_id, None)
+            self._flushed.pop(job_id, None)
+            self._released.discard(job_id)
+            del self._finished_at[job_id]
+
+def flush_jobs():
+    """Persist changed jobs, evict finished ones from memory and expire old rows and profiles"""
+    with jobs_lock:
+        changes = jobs.collect_changes()
+    if changes:
+        jobs.backend.save_many([(*change[:5], json.dumps(change[5], default=str)) for change in changes])
+    with jobs_lock:
+        jobs.evict_finished()
+    jobs.backend.delete_finished_before(time.time() - JOB_TTL_SECONDS)
+    expire_job_profiles()
+
+def job_store_maintenance_loop():
+    while True:
+        time.sleep(JOB_FLUSH_INTERVAL)
+        try:
+            flush_jobs()
+        except Exception as e:
+            jobs_log.exception("Error persisting jobs: %s", e)
+
+jobs = JobStore(SQLiteJobBackend(JOB_DB_PATH))
 jobs_lock = Lock()
+if jobs.interrupted_on_startup:
+    jobs_log.info("Marked %s unfinished jobs from the previous run as interrupted", jobs.interrupted_on_startup)
+threading.Thread(target=job_store_maintenance_loop, name='job-store', daemon=True).start()
+atexit.register(flush_jobs)
+
+# Job scheduling
+JOB_CONCURRENCY_LIMITS = {'export': 1, 'preview': 2, 'extraction': 1, 'tracking': 1}
+JOB_PRIORITIES = {'preview': 0, 'tracking': 0, 'extraction': 1, 'export': 2}  # Lower runs first
+SCHEDULER_MAX_CPU_PERCENT = 90  # Hold queued background jobs while the machine is busier than this
+SCHEDULER_MIN_AVAILABLE_MEMORY_MB = 1024  # ...or has less free memory than this
+SCHEDULER_RECHECK_INTERVAL = 1.0
+
+class JobScheduler:
+    """Priority queue for background jobs with per-type concurrency limits
+    
+    Jobs are admitted in priority order (then submission order) when their type
+    has a free slot. Background jobs (priority above 0: extraction, export) also
+    wait for CPU and memory headroom; interactive ones (preview, tracking) skip
+    that check, since a running export alone keeps the CPU near 100%. A job is
+    always admitted when nothing else is running, so an idle server never stalls
+    on the resource check. Queue position and ETA are written into the job's entry.
+    """
+
+    def __init__(self, limits, priorities):
+        self.limits = dict(limits)
+        self.priorities = dict(priorities)
+        self._queue = []  # Heap of (priority, sequence, entry)
+        self._running = {job_type: 0 for job_type in self.limits}
+        self._durations = {}  # job_type -> moving average run time in seconds
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='job-scheduler', daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, job_id, job_type, target, args=(), priority=None):
+        """Queue target(*args) to run on its own thread once admitted"""
+        self._enqueue(job_id, job_type, priority, target=target, args=args)
+
+    @contextmanager
+    def slot(self, job_id, job_type, priority=None):
+        """Block the calling thread until admitted, for work that runs inline"""
+        event = threading.Event()
+        entry = self._enqueue(job_id, job_type, priority, event=event)
+        event.wait()
+        try:
+            yield
+        finally:
+            self._finish(entry)
+
+    def status(self):
+        with self._condition:
+            queued = [entry for _, _, entry in sorted(self._queue, key=lambda item: item[:2])]
+            return {
+                'limits': dict(self.limits),
+                'running': dict(self._running),
+                'queued': [{'job_id': e['job_id'], 'type': e['job_type'], 'priority': e['priority']} for e in queued],
+                'average_durations': dict(self._durations)
+            }
+
+    def _enqueue(self, job_id, job_type, priority, target=None, args=(), event=None):
+        if job_type not in self.limits:
+            raise ValueError(f'Unknown job type: {job_type}')
+        if priority is None:
+            priority = self.priorities.get(job_type, 1)
+        entry = {
+            'job_id': job_id,
+            'job_type': job_type,
+            'priority': priority,
+            'target': target,
+            'args': args,
+            'event': event,
+            'started_at': None
+        }
+        with self._condition:
+            heapq.heappush(self._queue, (priority, next(self._sequence), entry))
+            self._condition.notify()
+        self._publish_queue()
+        return entry
+
+    def _resources_available(self):
+        try:
+            cpu_percent = psutil.cpu_percent(interval=None)
+            available_mb = psutil.virtual_memory().available / 1024 / 1024
+        except Exception:
+            return True
+        return cpu_percent < SCHEDULER_MAX_CPU_PERCENT and available_mb > SCHEDULER_MIN_AVAILABLE_MEMORY_MB
+
+    def _admit_ready(self):
+        """Pop every queued job that can start now, must hold the condition"""
+        admitted = []
+        cancelled = []
+        remaining = []
+        for item in sorted(self._queue, key=lambda item: item[:2]):
+            entry = item[2]
+            if is_job_cancelled(entry['job_id']):
+                cancelled.append(entry)
+                continue
+            job_type = entry['job_type']
+            gated = entry['priority'] > 0 and any(self._running.values())
+            if self._running[job_type] < self.limits[job_type] and (not gated or self._resources_available()):
+                self._running[job_type] += 1
+                entry['started_at'] = time.time()
+                admitted.append(entry)
+            else:
+                remaining.append(item)
+        self._queue = remaining
+        heapq.heapify(self._queue)
+        return admitted, cancelled
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                admitted, cancelled = self._admit_ready()
+                if not admitted and not cancelled:
+                    self._condition.wait(timeout=SCHEDULER_RECHECK_INTERVAL)
+                    continue
+            
+            for entry in cancelled:
+                with jobs_lock:
+                    if entry['job_id'] in jobs:
+                        jobs[entry['job_id']]['status'] = 'cancelled'
+                        jobs[entry['job_id']]['queue_position'] = None
+                        jobs[entry['job_id']]['message'] = 'Cancelled before starting'
+                        jobs[entry['job_id']]['resources_released'] = True
+                    jobs.release(entry['job_id'])
+                if entry['event']:
+                    entry['event'].set()
+            
+            for entry in admitted:
+                with jobs_lock:
+                    if entry['job_id'] in jobs:
+                        jobs[entry['job_id']]['queue_position'] = None
+                        jobs[entry['job_id']]['started_at'] = entry['started_at']
+                if entry['event']:
+                    entry['event'].set()
+                else:
+                    thread = threading.Thread(target=self._run, args=(entry,), name=f"{entry['job_type']}-{entry['job_id'][:8]}")
+                    thread.daemon = True
+                    thread.start()
+            
+            self._publish_queue()
+
+    def _run(self, entry):
+        try:
+            entry['target'](*entry['args'])
+        finally:
+            self._finish(entry)
+
+    def _finish(self, entry):
+        duration = time.time() - entry['started_at']
+        # The worker has returned; make sure it left no child processes running
+        leftover = terminate_job_processes(entry['job_id'], timeout=PROCESS_TERMINATE_TIMEOUT)
+        if leftover:
+            jobs_log.warning("Stopped %s leftover processes of job %s", leftover, entry['job_id'])
+        with jobs_lock:
+            if entry['job_id'] in jobs and jobs[entry['job_id']].get('cancelled'):
+                jobs[entry['job_id']]['resources_released'] = True
+            jobs.release(entry['job_id'])
+        with self._condition:
+            job_type = entry['job_type']
+            self._running[job_type] -= 1
+            previous = self._durations.get(job_type)
+            self._durations[job_type] = duration if previous is None else previous * 0.7 + duration * 0.3
+            self._condition.notify()
+        self._publish_queue()
+
+    def _publish_queue(self):
+        """Write queue positions and estimated wait times into the job entries"""
+        with self._condition:
+            queued = [entry for _, _, entry in sorted(self._queue, key=lambda item: item[:2])]
+            running = dict(self._running)
+            durations = dict(self._durations)
+        
+        ahead_by_type = dict(running)
+        with jobs_lock:
+            # Cancelled jobs keep their status until _admit_ready drops them, and wait for nothing
+            queued = [entry for entry in queued
+                      if not (entry['job_id'] in jobs and jobs[entry['job_id']].get('cancelled'))]
+            for position, entry in enumerate(queued, start=1):
+                job_type = entry['job_type']
+                ahead = ahead_by_type.get(job_type, 0)
+                ahead_by_type[job_type] = ahead + 1
+                
+                # Jobs ahead of this one drain in waves of `limit`, then it runs itself
+                average = durations.get(job_type)
+                eta = (ahead // self.limits[job_type] + 1) * average if average is not None else None
+                
+                # Skip entries admitted since the snapshot was taken
+                if entry['started_at'] is None and entry['job_id'] in jobs:
+                    job = jobs[entry['job_id']]
+                    job['status'] = 'queued'
+                    job['queue_position'] = position
+                    job['eta_seconds'] = eta
+                    job['message'] = f'Waiting in queue (position {position})'
+
+def is_job_cancelled(job_id):
+    """Check whether a job has been flagged for cancellation"""
+    with jobs_lock:
+        return job_id in jobs and jobs[job_id].get('cancelled', False)
+
+# Child processes per job, so cancellation can stop them
+PROCESS_TERMINATE_TIMEOUT = 5  # Seconds between SIGTERM and SIGKILL
+job_processes = {}
+job_processes_lock = Lock()
+
+def register_job_process(job_id, process):
+    """Track a job's child process; terminates it at once if the job was already cancelled"""
+    with job_processes_lock:
+        job_processes.setdefault(job_id, set()).add(process)
+    if is_job_cancelled(job_id):
+        process.terminate()
+
+def unregister_job_process(job_id, process):
+    with job_processes_lock:
+        processes = job_processes.get(job_id)
+        if processes is not None:
+            processes.discard(process)
+            if not processes:
+                del job_processes[job_id]
+
+def terminate_job_processes(job_id, timeout=None):
+    """Terminate a job's running child processes, returns how many were still running
+    
+    With a timeout, waits for them to exit and kills any that don't.
+    """
+    with job_processes_lock:
+        processes = list(job_processes.get(job_id, ()))
+    running = [process for process in processes if process.poll() is None]
+    for process in running:
+        process.terminate()
+    if timeout is not None:
+        for process in running:
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                jobs_log.warning("Process %s of job %s ignored SIGTERM, killing it", process.pid, job_id)
+                process.kill()
+    return len(running)
+
+def finish_cancelled_job(job_id, message, partial_paths=()):
+    """Remove a cancelled job's partial outputs and mark it cancelled"""
+    removed = 0
+    for path in partial_paths:
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        elif os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    with jobs_lock:
+        if job_id in jobs:
+            jobs[job_id]['status'] = 'cancelled'
+            jobs[job_id]['message'] = message
+            jobs[job_id]['partial_outputs_removed'] = removed
+    jobs_log.info("Job %s cancelled, removed %s partial outputs", job_id, removed)
+
+def estimate_job_eta(job):
+    """Estimate remaining seconds for a running job from its progress"""
+    started_at = job.get('started_at')
+    progress = job.get('progress') or 0
+    if not started_at or progress <= 0 or progress >= 100:
+        return None
+    elapsed = time.time() - started_at
+    return elapsed * (100 - progress) / progress
+
+def get_job_snapshot(job_id):
+    """Copy a job entry with the ETA filled in for running jobs, None if unknown
+    
+    Finished jobs that were evicted from memory are read back from the job store.
+    """
+    with jobs_lock:
+        job = jobs[job_id].copy() if job_id in jobs else None
+    if job is None:
+        job = jobs.backend.load(job_id)
+        if job is None:
+            return None
+    if job.get('status') != 'queued' and job.get('status') not in TERMINAL_JOB_STATUSES:
+        job['eta_seconds'] = estimate_job_eta(job)
+    return job
+
+job_scheduler = JobScheduler(JOB_CONCURRENCY_LIMITS, JOB_PRIORITIES)
+
+# Video metadata (ffprobe) cache
+PROBE_CACHE_MAX_ENTRIES = 64
+
+VideoMetadata = namedtuple('VideoMetadata', [
+    'path', 'duration', 'frame_rate', 'width', 'height', 'pix_fmt',
+    'video_codec', 'video_bit_rate', 'has_audio', 'audio_codec'
+])
+VideoMetadata.__doc__ = """Probed video properties; frame_rate is an exact Fraction (e.g. 30000/1001)"""
+
+probe_cache = OrderedDict()  # (path, size, mtime_ns) -> VideoMetadata or None
+probe_cache_lock = Lock()
+probe_stats = {'hits': 0, 'probes': 0}
+
+def parse_frame_rate(video_stream):
+    """Exact frame rate of a stream as a Fraction, preferring r_frame_rate"""
+    for key in ('r_frame_rate', 'avg_frame_rate'):
+        try:
+            frame_rate = Fraction(video_stream.get(key, ''))
+        except (ValueError, ZeroDivisionError):
+            continue
+        if frame_rate > 0:
+            return frame_rate
+    return Fraction(30)
+
+def probe_video(video_path):
+    """Return VideoMetadata for a file (None if it has no video stream)
+    
+    Results are cached by path, size and modification time, so a file is only
+    probed again after it changes. Raises CalledProcessError if ffprobe fails.
+    """
+    stat = os.stat(video_path)
+    fingerprint = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+    with probe_cache_lock:
+        if fingerprint in probe_cache:
+            probe_cache.move_to_end(fingerprint)
+            probe_stats['hits'] += 1
+            return probe_cache[fingerprint]
+    
+    cmd = [
+        'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', video_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    info = json.loads(result.stdout)
+    
+    video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
+    audio_stream = next((s for s in info['streams'] if s['codec_type'] == 'audio'), None)
+    metadata = None
+    if video_stream:
+        duration = info['format'].get('duration') or video_stream.get('duration') or 0
+        metadata = VideoMetadata(
+            path=video_path,
+            duration=float(duration),
+            frame_rate=parse_frame_rate(video_stream),
+            width=video_stream['width'],
+            height=video_stream['height'],
+            pix_fmt=video_stream.get('pix_fmt', 'yuv420p'),
+            video_codec=video_stream.get('codec_name'),
+            video_bit_rate=video_stream.get('bit_rate'),
+            has_audio=audio_stream is not None,
+            audio_codec=audio_stream.get('codec_name', 'unknown') if audio_stream else None
+        )
+    
+    with probe_cache_lock:
+        probe_stats['probes'] += 1
+        probe_cache[fingerprint] = metadata
+        while len(probe_cache) > PROBE_CACHE_MAX_ENTRIES:
+            probe_cache.popitem(last=False)
+    return metadata
+
+# Job profiling
+PROFILE_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+PROFILE_RSS_SAMPLE_INTERVAL = 0.5
+PROFILES_FOLDER = os.path.join(EXPORT_FOLDER, 'profiles')
+os.makedirs(PROFILES_FOLDER, exist_ok=True)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+    
+    def __init__(self, buckets_ms=PROFILE_LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)  # Last slot counts values above every bucket
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+    
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets_ms, seconds * 1000)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+    
+    def to_dict(self):
+        buckets = {f'<={bound}ms': count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets[f'>{self.buckets_ms[-1]}ms'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total_seconds, 4),
+            'mean_ms': round(self.total_seconds / self.count * 1000, 3) if self.count else None,
+            'max_ms': round(self.max_seconds * 1000, 3),
+            'buckets': buckets
+        }
+
+class JobProfiler:
+    """Collects stage wall times, per-frame latency histograms, peak RSS and CPU use for one job
+    
+    begin(stage) times the job's sequential phases (probe, encode, ...). measure(name)
+    records per-frame work such as decode/blur/write, which runs on several threads,
+    as summed seconds plus a latency histogram. RSS and CPU are process-wide.
+    """
+    
+    def __init__(self, job_id, job_type):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.stages = {}
+        self.histograms = {}
+        self._lock = Lock()
+        self._current_stage = None
+        self._stage_start = None
+        self._process = psutil.Process()
+        self._started_at = time.time()
+        self._start_perf = time.perf_counter()
+        self._start_cpu = self._process.cpu_times()
+        self._start_rss = self._process.memory_info().rss
+        self.peak_rss = self._start_rss
+        self._finished = threading.Event()
+        threading.Thread(target=self._sample_rss, name=f'profiler-{job_id[:8]}', daemon=True).start()
+    
+    def _sample_rss(self):
+        while not self._finished.wait(PROFILE_RSS_SAMPLE_INTERVAL):
+            try:
+                self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+            except psutil.Error:
+                return
+    
+    def begin(self, stage):
+        """Start timing a sequential stage, ending the previous one"""
+        now = time.perf_counter()
+        with self._lock:
+            if self._current_stage is not None:
+                self.stages[self._current_stage] = self.stages.get(self._current_stage, 0) + now - self._stage_start
+            self._current_stage = stage
+            self._stage_start = now
+    
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    @contextmanager
+    def measure(self, name):
+        """Time one unit of per-frame work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def finish(self):
+        """Stop sampling and return the profile as a JSON-ready dict"""
+        self.begin(None)
+        self._finished.set()
+        wall_seconds = time.perf_counter() - self._start_perf
+        cpu = self._process.cpu_times()
+        cpu_seconds = (cpu.user - self._start_cpu.user) + (cpu.system - self._start_cpu.system)
+        children_cpu_seconds = (cpu.children_user - self._start_cpu.children_user) + \
+            (cpu.children_system - self._start_cpu.children_system)
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+        with self._lock:
+            return {
+                'job_id': self.job_id,
+                'job_type': self.job_type,
+                'started_at': self._started_at,
+                'wall_seconds': round(wall_seconds, 4),
+                'stages': {stage: round(seconds, 4) for stage, seconds in self.stages.items()},
+                'frame_latency': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+                'start_rss_mb': round(self._start_rss / 1024 / 1024, 2),
+                'peak_rss_mb': round(self.peak_rss / 1024 / 1024, 2),
+                'cpu_seconds': round(cpu_seconds, 3),
+                'cpu_percent': round(cpu_seconds / wall_seconds * 100, 1) if wall_seconds > 0 else None,
+                'children_cpu_seconds': round(children_cpu_seconds, 3),
+                'cpu_count': os.cpu_count()
+            }
+
+def profile_path(job_id):
+    return os.path.join(PROFILES_FOLDER, f'{job_id}.json')
+
+def expire_job_profiles():
+    """Delete profile files older than the job store's TTL, like the job rows they belong to"""
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for entry in os.scandir(PROFILES_FOLDER):
+        try:
+            if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass  # Removed concurrently
+
+expire_job_profiles()
+
+def save_job_profile(profiler):
+    """Finish a profiler and store its profile on the job and as a JSON file"""
+    profile = profiler.finish()
+    with jobs_lock:
+        if profiler.job_id in jobs:
+            jobs[profiler.job_id]['profile'] = profile
+    tmp_path = profile_path(profiler.job_id) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, profile_path(profiler.job_id))
+    stage_summary = ', '.join(f'{stage}={seconds:.2f}s' for stage, seconds in profile['stages'].items())
+    jobs_log.info("Profile for %s job %s: %s, peak RSS %sMB", profiler.job_type, profiler.job_id, stage_summary, profile['peak_rss_mb'])
+    return profile
+
+# Metrics
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_OCR_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_SPEED_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+def format_metric_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def format_metric_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base for metrics kept in memory and rendered in Prometheus text format"""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # Tuple of label values -> value
+        self._lock = Lock()
+    
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+    
+    def header(self):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+    
+    def render(self):
+        with self._lock:
+            values = list(self._values.items())
+        lines = self.header()
+        for key, value in values:
+            lines.append(f'{self.name}{format_metric_labels(zip(self.labelnames, key))} {format_metric_value(value)}')
+        return lines
+
+class Counter(Metric):
+    metric_type = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    metric_type = 'gauge'
+    
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def render(self):
+        with self._lock:
+            values = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in values:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                bucket_labels = format_metric_labels(labels + [('le', format_metric_value(float(bound)))])
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{format_metric_labels(labels)} {format_metric_value(total)}')
+            lines.append(f'{self.name}_count{format_metric_labels(labels)} {count}')
+        return lines
+
+class MetricsRegistry:
+    """Holds metrics plus collectors that refresh gauges when /metrics is scraped"""
+    
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+    
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+        return collector
+    
+    def render(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                metrics_log.exception("Metrics collector error: %s", e)
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+metric_http_latency = metrics.histogram(
+    'videoeditor_http_request_duration_seconds', 'Time to produce a response, by route', ('route', 'method'))
+metric_http_requests = metrics.counter(
+    'videoeditor_http_requests_total', 'HTTP requests by route and status code', ('route', 'method', 'status'))
+metric_frame_requests = metrics.counter(
+    'videoeditor_frame_requests_total', 'Frames served by /get_frame, by frame cache result', ('cache',))
+metric_frame_bytes = metrics.counter(
+    'videoeditor_frame_bytes_served_total', 'Frame bytes served by /get_frame')
+metric_frames_blurred = metrics.counter(
+    'videoeditor_frames_blurred_total', 'Frames written by blur workers', ('result',))
+metric_ffmpeg_speed = metrics.histogram(
+    'videoeditor_ffmpeg_speed_ratio', 'ffmpeg progress speed as a multiple of realtime', ('job_type',), METRICS_SPEED_BUCKETS)
+metric_ffmpeg_fps = metrics.gauge(
+    'videoeditor_ffmpeg_fps', 'Most recent ffmpeg progress frame rate', ('job_type',))
+metric_ocr_latency = metrics.histogram(
+    'videoeditor_ocr_duration_seconds', 'OCR readtext calls, by kind of scan', ('kind',), METRICS_OCR_BUCKETS)
+metric_jobs = metrics.gauge(
+    'videoeditor_jobs', 'Scheduled jobs by type and state', ('job_type', 'state'))
+metric_frame_cache = metrics.gauge(
+    'videoeditor_frame_cache', 'Frame cache size and lookups', ('stat',))
+metric_probe_cache = metrics.gauge(
+    'videoeditor_probe_cache', 'ffprobe metadata cache size and lookups', ('stat',))
+metric_ocr_pool = metrics.gauge(
+    'videoeditor_ocr_pool', 'OCR worker pool size, readiness, queue depth and batches', ('stat',))
+
+@metrics.add_collector
+def collect_scheduler_metrics():
+    status = job_scheduler.status()
+    queued = {job_type: 0 for job_type in status['limits']}
+    for entry in status['queued']:
+        queued[entry['type']] = queued.get(entry['type'], 0) + 1
+    for job_type, count in queued.items():
+        metric_jobs.set(count, job_type=job_type, state='queued')
+        metric_jobs.set(status['running'].get(job_type, 0), job_type=job_type, state='running')
+
+@metrics.add_collector
+def collect_cache_metrics():
+    for stat, value in frame_cache.stats().items():
+        metric_frame_cache.set(value, stat=stat)
+    with probe_cache_lock:
+        probe_values = {'entries': len(probe_cache), 'hits': probe_stats['hits'], 'probes': probe_stats['probes']}
+    for stat, value in probe_values.items():
+        metric_probe_cache.set(value, stat=stat)
+    if ocr_pool:
+        for stat, value in ocr_pool.status().items():
+            metric_ocr_pool.set(value, stat=stat)
+
+def job_type_of(job_id):
+    """Job type label for metrics, 'none' for commands run outside a job"""
+    if not job_id:
+        return 'none'
+    with jobs_lock:
+        return jobs[job_id].get('job_type', 'unknown') if job_id in jobs else 'unknown'
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Label by URL rule rather than path so video names don't multiply series
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metric_http_latency.observe(time.perf_counter() - started, route=route, method=request.method)
+        metric_http_requests.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose counters, gauges and histograms in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
@@ -74,17 +1338,17 @@ def get_videos():
 def get_first_video():
     try:
         files = os.listdir(UPLOAD_FOLDER)
-        print(f"Files in {UPLOAD_FOLDER}: {files}")
+        frames_log.debug("Files in %s: %s", UPLOAD_FOLDER, files)
         
         for file in files:
             if file.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
-                print(f"Found video file: {file}")
+                frames_log.debug("Found video file: %s", file)
                 return jsonify({'video': file})
         
-        print("No video files found")
+        frames_log.info("No video files found")
         return jsonify({'video': None})
     except Exception as e:
-        print(f"Error in get_first_video: {e}")
+        frames_log.error("Error in get_first_video: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/get_video_info/<video_name>')
@@ -92,24 +1356,21 @@ def get_video_info(video_name):
     video_path = os.path.join(UPLOAD_FOLDER, video_name)
     
     try:
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        
-        video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
-        if video_stream:
-            duration = float(info['format']['duration'])
-            fps = eval(video_stream['r_frame_rate'])
-            total_frames = int(duration * fps)
+        metadata = probe_video(video_path)
+        if metadata:
+            total_frames = int(metadata.duration * EXTRACTION_FRAME_RATE)
             
             return jsonify({
-                'duration': duration,
-                'fps': fps,
+                'duration': metadata.duration,
+                'fps': float(metadata.frame_rate),
+                'frame_rate': str(metadata.frame_rate),
+                'extraction_fps': float(EXTRACTION_FRAME_RATE),  # Rate of the extracted frames that total_frames counts
                 'total_frames': total_frames,
-                'width': video_stream['width'],
-                'height': video_stream['height']
+                'width': metadata.width,
+                'height': metadata.height,
+                'pix_fmt': metadata.pix_fmt,
+                'has_audio': metadata.has_audio,
+                'playback_max_fps': PLAYBACK_MAX_FPS  # /stream_frames clamps its rate to this
             })
         
         return jsonify({'error': 'No video stream found'}), 400
@@ -127,7 +1388,7 @@ def extract_frames(video_name):
         frame_files = sorted([f for f in os.listdir(video_frames_folder) if f.startswith('frame_')])
         
         if frame_files:
-            print(f"Found existing {len(frame_files)} frames for {video_name}, skipping extraction")
+            ffmpeg_log.info("Found existing %s frames for %s, skipping extraction", len(frame_files), video_name)
             frames_info = []
             
             for i, filename in enumerate(frame_files):
@@ -157,18 +1418,18 @@ def extract_frames(video_name):
             'video_name': video_name,
             'total_frames': 0,
             'extracted_frames': 0,
+            'job_type': 'extraction',
             'created_at': time.time()
         }
     
-    # Start extraction in background thread
-    thread = threading.Thread(target=extract_frames_async, args=(job_id, video_name, video_path, video_frames_folder))
-    thread.daemon = True
-    thread.start()
+    # Queue extraction on the job scheduler
+    job_scheduler.submit(job_id, 'extraction', extract_frames_async, (job_id, video_name, video_path, video_frames_folder))
     
     return jsonify({'job_id': job_id, 'message': 'Frame extraction started'})
 
 def extract_frames_async(job_id, video_name, video_path, video_frames_folder):
     """Asynchronous frame extraction with progress tracking"""
+    profiler = JobProfiler(job_id, 'extraction')
     try:
         # Get video duration and frame count first
         with jobs_lock:
@@ -177,17 +1438,10 @@ def extract_frames_async(job_id, video_name, video_path, video_frames_folder):
                 jobs[job_id]['message'] = 'Analyzing video properties...'
         
         # Get video info for progress calculation
-        cmd_info = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', video_path
-        ]
-        result = subprocess.run(cmd_info, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        
-        video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
-        if video_stream:
-            duration = float(info['format']['duration'])
-            fps = eval(video_stream['r_frame_rate'])
-            total_frames = int(duration * 30)  # 30 fps extraction
+        profiler.begin('probe')
+        metadata = probe_video(video_path)
+        if metadata:
+            total_frames = int(metadata.duration * EXTRACTION_FRAME_RATE)
             
             with jobs_lock:
                 if job_id in jobs:
@@ -201,134 +1455,67 @@ def extract_frames_async(job_id, video_name, video_path, video_frames_folder):
         
         frame_pattern = os.path.join(video_frames_folder, 'frame_%06d.jpg')
         
-        # Create temporary file for FFmpeg progress
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.txt') as progress_file:
-            progress_path = progress_file.name
+        with jobs_lock:
+            if job_id in jobs:
+                jobs[job_id]['status'] = 'extracting'
+                jobs[job_id]['progress'] = 0
         
-        try:
-            with jobs_lock:
-                if job_id in jobs:
-                    jobs[job_id]['status'] = 'extracting'
-                    jobs[job_id]['progress'] = 0
-            
-            print(f"Extracting frames for {video_name}...")
-            cmd = [
-                'ffmpeg', '-i', video_path,
-                '-vf', 'fps=fps=30',  # Extract at 30 fps for smooth timeline
-                '-q:v', '2',  # High quality
-                '-y',  # Overwrite existing files
-                '-progress', progress_path,  # Progress output
-                '-stats_period', '0.5',  # Update every 0.5 seconds
-                frame_pattern
-            ]
-            
-            # Start FFmpeg process
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # Monitor progress in a separate thread
-            def monitor_progress():
-                last_pos = 0
-                while process.poll() is None:
-                    try:
-                        with open(progress_path, 'r') as f:
-                            f.seek(last_pos)
-                            content = f.read()
-                            last_pos = f.tell()
-                            
-                            if content:
-                                # Parse FFmpeg progress output
-                                lines = content.strip().split('\n')
-                                current_data = {}
-                                
-                                for line in lines:
-                                    if '=' in line:
-                                        key, value = line.split('=', 1)
-                                        current_data[key] = value
-                                    elif line == 'progress=end':
-                                        # Extraction finished
-                                        with jobs_lock:
-                                            if job_id in jobs:
-                                                jobs[job_id]['progress'] = 100
-                                                jobs[job_id]['status'] = 'completing'
-                                                jobs[job_id]['message'] = 'Finalizing frame extraction...'
-                                        break
-                                
-                                # Update progress based on current frame
-                                if 'frame' in current_data and current_data['frame'].isdigit():
-                                    current_frame = int(current_data['frame'])
-                                    progress = min(95, (current_frame / total_frames) * 100) if total_frames > 0 else 0
-                                    
-                                    # Get speed info
-                                    speed = current_data.get('speed', 'N/A')
-                                    
-                                    with jobs_lock:
-                                        if job_id in jobs:
-                                            jobs[job_id]['progress'] = progress
-                                            jobs[job_id]['extracted_frames'] = current_frame
-                                            jobs[job_id]['speed'] = speed
-                                            jobs[job_id]['message'] = f'Extracted {current_frame}/{total_frames} frames'
-                                    
-                                    print(f"Frame extraction progress: {progress:.1f}% ({current_frame}/{total_frames} frames) Speed: {speed}")
-                        
-                        time.sleep(0.5)  # Check every 500ms
-                        
-                    except Exception as e:
-                        print(f"Error monitoring frame extraction progress: {e}")
-                        break
-            
-            # Start progress monitoring thread
-            progress_thread = threading.Thread(target=monitor_progress)
-            progress_thread.daemon = True
-            progress_thread.start()
-            
-            # Wait for FFmpeg to complete
-            stdout, stderr = process.communicate()
-            
-            # Wait for progress thread to finish
-            progress_thread.join(timeout=2)
-            
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, cmd, stderr)
-            
-            # Count extracted frames
-            frame_files = sorted([f for f in os.listdir(video_frames_folder) if f.startswith('frame_')])
-            frames_info = []
-            
-            for i, filename in enumerate(frame_files):
-                frames_info.append({
-                    'index': i,
-                    'filename': filename,
-                    'path': os.path.join(video_frames_folder, filename)
-                })
+        ffmpeg_log.info("Extracting frames for %s", video_name)
+        profiler.begin('extract')  # ffmpeg decode + JPEG write
+        cmd = [
+            'ffmpeg', '-i', video_path,
+            '-vf', f'fps=fps={EXTRACTION_FRAME_RATE}',  # Fixed rate for a smooth timeline
+            '-q:v', '2',  # High quality
+            '-y',  # Overwrite existing files
+            frame_pattern
+        ]
+        
+        def report_progress(event):
+            if event.done:
+                # Extraction finished
+                with jobs_lock:
+                    if job_id in jobs:
+                        jobs[job_id]['progress'] = 100
+                        jobs[job_id]['status'] = 'completing'
+                        jobs[job_id]['message'] = 'Finalizing frame extraction...'
+                return
+            if event.frame is None:
+                return
+            progress = min(95, (event.frame / total_frames) * 100) if total_frames > 0 else 0
+            speed = format_ffmpeg_speed(event)
             
-            # Update job status to completed
             with jobs_lock:
                 if job_id in jobs:
-                    jobs[job_id]['status'] = 'completed'
-                    jobs[job_id]['progress'] = 100
-                    jobs[job_id]['message'] = f'Successfully extracted {len(frame_files)} frames'
-                    jobs[job_id]['frames_info'] = frames_info
-                    jobs[job_id]['total'] = len(frame_files)
-            
-            print(f"Extracted {len(frame_files)} frames for {video_name}")
+                    jobs[job_id]['progress'] = progress
+                    jobs[job_id]['extracted_frames'] = event.frame
+                    jobs[job_id]['speed'] = speed
+                    jobs[job_id]['message'] = f'Extracted {event.frame}/{total_frames} frames'
             
-        finally:
-            # Clean up temporary progress file
-            try:
-                os.unlink(progress_path)
-            except:
-                pass
+            if progress_log_limiter.allow((job_id, 'extract')) is not None:
+                ffmpeg_log.info("Frame extraction progress: %.1f%% (%s/%d frames) Speed: %s", progress, event.frame, total_frames, speed)
+        
+        if run_ffmpeg(cmd, job_id, on_progress=report_progress) is None:
+            # A partial extraction is unusable; drop its frames
+            frame_cache.clear()
+            finish_cancelled_job(job_id, 'Extraction cancelled by user', [video_frames_folder])
+            return
+        
+        # Count extracted frames
+        frame_files = [f for f in os.listdir(video_frames_folder) if f.startswith('frame_')]
+        
+        # Update job status to completed (the frame list itself is not kept on the job)
+        with jobs_lock:
+            if job_id in jobs:
+                jobs[job_id]['status'] = 'completed'
+                jobs[job_id]['progress'] = 100
+                jobs[job_id]['message'] = f'Successfully extracted {len(frame_files)} frames'
+                jobs[job_id]['total'] = len(frame_files)
+        
+        ffmpeg_log.info("Extracted %s frames for %s", len(frame_files), video_name)
                 
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr
-        print(f"FFmpeg error during frame extraction: {error_msg}")
+        ffmpeg_log.error("FFmpeg error during frame extraction: %s", error_msg)
         
         with jobs_lock:
             if job_id in jobs:
@@ -336,97 +1523,185 @@ def extract_frames_async(job_id, video_name, video_path, video_frames_folder):
                 jobs[job_id]['error'] = f'FFmpeg error: {error_msg}'
                 
     except Exception as e:
-        print(f"Frame extraction error: {str(e)}")
+        ffmpeg_log.exception("Frame extraction error: %s", e)
         with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]['status'] = 'error'
                 jobs[job_id]['error'] = f'Extraction error: {str(e)}'
+    finally:
+        save_job_profile(profiler)
 
 @app.route('/extraction_progress/<job_id>')
 def get_extraction_progress(job_id):
     """Get progress of frame extraction job"""
-    with jobs_lock:
-        if job_id in jobs:
-            job = jobs[job_id].copy()
-            return jsonify(job)
-        else:
-            return jsonify({'error': 'Job not found'}), 404
+    job = get_job_snapshot(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
-@app.route('/check_ffmpeg')
-def check_ffmpeg():
-    """Check if FFmpeg is installed and accessible, and detect available hardware encoders"""
+# Encoder capability detection (scanned and probed once per process)
+ENCODER_CANDIDATES = {
+    'libx264': {'name': 'libx264 (Software CPU)', 'type': 'software'},
+    'h264_nvenc': {'name': 'NVIDIA NVENC H.264', 'type': 'nvidia'},
+    'hevc_nvenc': {'name': 'NVIDIA NVENC HEVC', 'type': 'nvidia'},
+    'h264_qsv': {'name': 'Intel QuickSync H.264', 'type': 'intel'},
+    'hevc_qsv': {'name': 'Intel QuickSync HEVC', 'type': 'intel'},
+    'h264_amf': {'name': 'AMD AMF H.264', 'type': 'amd'},
+    'hevc_amf': {'name': 'AMD AMF HEVC', 'type': 'amd'}
+}
+ENCODER_PROBE_FRAMES = 60
+ENCODER_PROBE_SIZE = '1280x720'
+ENCODER_PROBE_TIMEOUT = 10  # Seconds before an encoder probe counts as failed
+
+encoder_capabilities = None
+encoder_capabilities_lock = Lock()
+encoder_probe_thread = None
+encoder_probe_outcome = None  # Last background probe's capabilities, or the exception it raised
+encoder_probe_lock = Lock()
+
+def probe_encoder(encoder_id):
+    """Encode a few synthetic frames with an encoder, returns whether it works and its fps"""
+    cmd = [
+        'ffmpeg', '-y', '-f', 'lavfi', '-i', f'testsrc2=size={ENCODER_PROBE_SIZE}:rate=30',
+        '-frames:v', str(ENCODER_PROBE_FRAMES),
+        '-c:v', encoder_id, '-pix_fmt', 'yuv420p',
+        '-f', 'null', '-'
+    ]
+    start_time = time.time()
     try:
-        # Try to run ffmpeg -version command
-        result = subprocess.run(['ffmpeg', '-version'], 
-                              capture_output=True, text=True, timeout=10)
-        
+        run_ffmpeg(cmd, timeout=ENCODER_PROBE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {'works': False, 'fps': None, 'error': 'Probe timed out'}
+    except subprocess.CalledProcessError as e:
+        error_lines = (e.stderr or '').strip().splitlines()
+        return {'works': False, 'fps': None, 'error': error_lines[-1] if error_lines else 'Encoder failed'}
+    elapsed = time.time() - start_time
+    return {'works': True, 'fps': round(ENCODER_PROBE_FRAMES / elapsed, 1) if elapsed > 0 else None, 'error': None}
+
+def detect_encoder_capabilities(refresh=False):
+    """Scan the ffmpeg build for candidate encoders and probe each one, cached for the process"""
+    global encoder_capabilities
+    with encoder_capabilities_lock:
+        if encoder_capabilities is not None and not refresh:
+            return encoder_capabilities
+        
+        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=10)
         if result.returncode != 0:
-            return jsonify({
-                'available': False,
-                'error': result.stderr,
-                'message': 'FFmpeg command failed'
-            })
-        
-        # Parse version info from output
+            # Not cached, so a fixed installation is picked up by a refresh
+            return {'available': False, 'error': result.stderr, 'message': 'FFmpeg command failed'}
         version_line = result.stdout.split('\n')[0]
         
-        # Check for available encoders
-        encoders_result = subprocess.run(['ffmpeg', '-encoders'], 
-                                       capture_output=True, text=True, timeout=10)
-        
-        available_encoders = []
-        hardware_encoders = []
-        
+        encoders_result = subprocess.run(['ffmpeg', '-encoders'], capture_output=True, text=True, timeout=10)
+        built_encoders = set()
         if encoders_result.returncode == 0:
-            encoder_lines = encoders_result.stdout.split('\n')
-            
-            # Debug: Log all encoder lines containing nvenc
-            print("DEBUG: Searching for hardware encoders...")
-            nvenc_lines = [line for line in encoder_lines if 'nvenc' in line.lower()]
-            print(f"DEBUG: Found {len(nvenc_lines)} lines containing 'nvenc':")
-            for line in nvenc_lines:
-                print(f"  {line}")
-            
-            # Look for specific hardware encoders
-            encoder_checks = {
-                'h264_nvenc': {'name': 'NVIDIA NVENC H.264', 'type': 'nvidia'},
-                'hevc_nvenc': {'name': 'NVIDIA NVENC HEVC', 'type': 'nvidia'},
-                'h264_qsv': {'name': 'Intel QuickSync H.264', 'type': 'intel'},
-                'hevc_qsv': {'name': 'Intel QuickSync HEVC', 'type': 'intel'},
-                'h264_amf': {'name': 'AMD AMF H.264', 'type': 'amd'},
-                'hevc_amf': {'name': 'AMD AMF HEVC', 'type': 'amd'}
-            }
-            
-            for line in encoder_lines:
-                for encoder_id, encoder_info in encoder_checks.items():
-                    # Check if encoder is in the line and it's a video encoder
-                    if encoder_id in line and ('V' in line[:10]):  # More flexible video encoder check
-                        print(f"DEBUG: Found encoder {encoder_id} in line: {line}")
-                        available_encoders.append(encoder_id)
-                        hardware_encoders.append({
-                            'id': encoder_id,
-                            'name': encoder_info['name'],
-                            'type': encoder_info['type']
-                        })
-                        
-            print(f"DEBUG: Final available_encoders: {available_encoders}")
-            print(f"DEBUG: Final hardware_encoders: {hardware_encoders}")
-        
-        # Always include software encoder
-        codec_options = [
-            {'id': 'libx264', 'name': 'libx264 (Software CPU)', 'type': 'software', 'default': True}
-        ]
+            for line in encoders_result.stdout.split('\n'):
+                parts = line.split()
+                # Encoder lines look like " V....D libx264   libx264 H.264 ..."
+                if len(parts) >= 2 and parts[0].startswith('V') and parts[1] in ENCODER_CANDIDATES:
+                    built_encoders.add(parts[1])
+        
+        encoders = {}
+        for encoder_id, encoder_info in ENCODER_CANDIDATES.items():
+            if encoder_id not in built_encoders:
+                continue
+            probe = probe_encoder(encoder_id)
+            encoders[encoder_id] = dict(encoder_info, id=encoder_id, **probe)
+            status = f"{probe['fps']} fps" if probe['works'] else f"unusable ({probe['error']})"
+            ffmpeg_log.info("Encoder probe %s: %s", encoder_id, status)
         
-        # Add detected hardware encoders
-        codec_options.extend(hardware_encoders)
+        encoder_capabilities = {
+            'available': True,
+            'version': version_line,
+            'encoders': encoders,
+            'probed_at': time.time()
+        }
+        return encoder_capabilities
+
+def run_encoder_probe(refresh):
+    global encoder_probe_outcome
+    try:
+        encoder_probe_outcome = detect_encoder_capabilities(refresh=refresh)
+    except Exception as e:
+        ffmpeg_log.warning("Encoder probe failed: %s", e)
+        encoder_probe_outcome = e
+
+def start_encoder_probe(refresh=False):
+    """Run the encoder scan and probes in a background thread, unless one is running"""
+    global encoder_probe_thread
+    with encoder_probe_lock:
+        if encoder_probe_thread is not None and encoder_probe_thread.is_alive():
+            return
+        encoder_probe_thread = threading.Thread(target=run_encoder_probe, args=(refresh,), name='encoder-probe', daemon=True)
+        encoder_probe_thread.start()
+
+def encoder_probe_running():
+    thread = encoder_probe_thread
+    return thread is not None and thread.is_alive()
+
+def working_codec_options(capabilities):
+    """Encoders that passed the probe, fastest first; the fastest is the default"""
+    working = [encoder for encoder in capabilities['encoders'].values() if encoder['works']]
+    working.sort(key=lambda encoder: encoder['fps'] or 0, reverse=True)
+    options = []
+    for index, encoder in enumerate(working):
+        options.append({
+            'id': encoder['id'],
+            'name': f"{encoder['name']} ({encoder['fps']:.0f} fps)" if encoder['fps'] else encoder['name'],
+            'type': encoder['type'],
+            'fps': encoder['fps'],
+            'default': index == 0
+        })
+    return options
+
+def resolve_video_codec(requested):
+    """Fall back to the fastest working encoder if the requested one failed its probe"""
+    capabilities = encoder_capabilities
+    if not capabilities or requested not in capabilities['encoders'] and requested not in ENCODER_CANDIDATES:
+        return requested  # Not probed (yet); let ffmpeg decide
+    encoder = capabilities['encoders'].get(requested)
+    if encoder and encoder['works']:
+        return requested
+    options = working_codec_options(capabilities)
+    if not options:
+        return requested
+    ffmpeg_log.warning("Encoder %s is not usable here, falling back to %s", requested, options[0]['id'])
+    return options[0]['id']
+
+@app.route('/check_ffmpeg')
+def check_ffmpeg():
+    """Check if FFmpeg is installed and report the encoders that actually work
+    
+    The encoder scan and functional probes run once per process in a background
+    thread, started at server startup or by the first check; until they finish
+    this returns {'probing': True}. Pass ?refresh=1 to run them again.
+    """
+    try:
+        if request.args.get('refresh') == '1':
+            start_encoder_probe(refresh=True)
+        elif encoder_probe_outcome is None:
+            start_encoder_probe()
+        if encoder_probe_running():
+            return jsonify({'probing': True, 'message': 'Probing video encoders...'})
+        
+        capabilities = encoder_probe_outcome
+        if isinstance(capabilities, Exception):
+            raise capabilities
+        if not capabilities['available']:
+            return jsonify(capabilities)
+        
+        codec_options = working_codec_options(capabilities)
+        hardware_encoders = [option['id'] for option in codec_options if option['type'] != 'software']
+        unusable = {encoder_id: encoder['error'] for encoder_id, encoder in capabilities['encoders'].items()
+                    if not encoder['works']}
         
         return jsonify({
             'available': True,
-            'version': version_line,
+            'version': capabilities['version'],
             'message': 'FFmpeg is properly installed and accessible',
-            'available_encoders': available_encoders,
+            'available_encoders': hardware_encoders,
             'codec_options': codec_options,
-            'hardware_count': len(hardware_encoders)
+            'hardware_count': len(hardware_encoders),
+            'unusable_encoders': unusable
         })
             
     except subprocess.TimeoutExpired:
@@ -476,7 +1751,10 @@ def cleanup_frames():
                     total_size += folder_size
                     deleted_files += file_count
                     deleted_folders += 1
-                    print(f"Deleted frame folder: {folder_path} ({folder_size / (1024*1024):.1f} MB, {file_count} files)")
+                    frames_log.info("Deleted frame folder: %s (%.1f MB, %s files)", folder_path, folder_size / (1024*1024), file_count)
+        
+        # Drop resized variants of the deleted frames
+        frame_cache.clear()
         
         # Format size for display
         if total_size > 1024*1024*1024:  # GB
@@ -498,7 +1776,7 @@ def cleanup_frames():
         })
         
     except Exception as e:
-        print(f"Error during cleanup: {str(e)}")
+        frames_log.error("Error during cleanup: %s", e)
         return jsonify({'error': f'Cleanup failed: {str(e)}'}), 500
 
 @app.route('/force_extract_frames/<video_name>')
@@ -510,54 +1788,363 @@ def force_extract_frames(video_name):
     if os.path.exists(video_frames_folder):
         import shutil
         shutil.rmtree(video_frames_folder)
-        print(f"Removed existing frames folder for {video_name}")
+        frames_log.info("Removed existing frames folder for %s", video_name)
     
     # Now extract frames fresh
     return extract_frames(video_name)
 
-@app.route('/get_frame/<video_name>/<int:frame_index>')
-def get_frame(video_name, frame_index):
+# In-memory frame cache (extracted JPEGs and display-sized variants)
+FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 MB of encoded frames
+FRAME_VARIANT_WIDTH_STEP = 64  # Round requested widths up to limit cache fragmentation
+FRAME_VARIANT_FORMATS = {
+    'webp': {'pil_format': 'WEBP', 'mimetype': 'image/webp', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'pil_format': 'JPEG', 'mimetype': 'image/jpeg', 'options': {'quality': 85}}
+}
+
+class FrameCache:
+    """Thread-safe LRU cache of encoded frame bytes, bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, record_stats=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record_stats:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if record_stats:
+                self.hits += 1
+            return entry
+
+    def put(self, key, data, mimetype):
+        size = len(data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= len(self._entries.pop(key)[0])
+            self._entries[key] = (data, mimetype)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0
+            }
+
+frame_cache = FrameCache(FRAME_CACHE_MAX_BYTES)
+
+# Scrubbing read-ahead and batch fetch
+READAHEAD_WINDOW = 8  # Frames prefetched in the scrub direction after each request (0 disables)
+READAHEAD_WORKERS = 2
+FRAME_BATCH_MAX = 60  # Maximum frames returned by one /get_frames request
+readahead_executor = ThreadPoolExecutor(max_workers=READAHEAD_WORKERS, thread_name_prefix='readahead')
+readahead_state = {}  # video_name -> {'last_index': int, 'generation': int}
+readahead_lock = Lock()
+
+# Playback streaming
+PLAYBACK_MAX_FPS = 60
+PLAYBACK_BOUNDARY = 'frame'
+
+def get_frame_path(video_name, frame_index):
+    """Return the extracted JPEG path for a 0-based UI frame index"""
     video_frames_folder = os.path.join(FRAMES_FOLDER, video_name.split('.')[0])
     
     # FFmpeg starts numbering from 1, so add 1 to the frame index
     ffmpeg_frame_number = frame_index + 1
     frame_filename = f'frame_{ffmpeg_frame_number:06d}.jpg'
-    frame_path = os.path.join(video_frames_folder, frame_filename)
+    return os.path.join(video_frames_folder, frame_filename)
+
+def render_frame_variant(frame_path, width, fmt):
+    """Downscale a frame to the given width and encode it"""
+    format_info = FRAME_VARIANT_FORMATS[fmt]
+    with Image.open(frame_path) as image:
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            # Let the JPEG decoder skip detail we are about to throw away (DCT scaling)
+            image.draft('RGB', (width, height))
+            image = image.convert('RGB').resize((width, height), Image.BILINEAR)
+        else:
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, format=format_info['pil_format'], **format_info['options'])
+    return buffer.getvalue()
+
+def get_frame_bytes(frame_path, width=None, fmt='webp', record_stats=True):
+    """Return (bytes, mimetype, cache_hit) for a frame, using the shared LRU
+    
+    A falsy width returns the extracted JPEG itself; otherwise a resized variant
+    in the given format is rendered on a miss.
+    """
+    if width:
+        # Snap the width to a bucket so nearby display sizes share one cache entry
+        width = max(FRAME_VARIANT_WIDTH_STEP, -(-width // FRAME_VARIANT_WIDTH_STEP) * FRAME_VARIANT_WIDTH_STEP)
+    else:
+        width, fmt = None, 'original'
+    # Include the mtime so re-extracted frames never serve stale data
+    key = (frame_path, os.stat(frame_path).st_mtime_ns, width, fmt)
+    
+    cached = frame_cache.get(key, record_stats=record_stats)
+    if cached is not None:
+        data, mimetype = cached
+        return data, mimetype, True
+    
+    if width:
+        data = render_frame_variant(frame_path, width, fmt)
+        mimetype = FRAME_VARIANT_FORMATS[fmt]['mimetype']
+    else:
+        with open(frame_path, 'rb') as f:
+            data = f.read()
+        mimetype = 'image/jpeg'
+    frame_cache.put(key, data, mimetype)
+    return data, mimetype, False
+
+def schedule_readahead(video_name, frame_index, width, fmt, direction=None):
+    """Prefetch the next frames in the scrub direction on a background thread
+    
+    The direction is inferred from the previous request for the same video
+    unless given explicitly. Each new request supersedes pending read-ahead.
+    """
+    if READAHEAD_WINDOW <= 0:
+        return
     
-    if os.path.exists(frame_path):
+    with readahead_lock:
+        state = readahead_state.setdefault(video_name, {'last_index': frame_index, 'generation': 0})
+        if direction is None:
+            direction = -1 if frame_index < state['last_index'] else 1
+        state['last_index'] = frame_index
+        state['generation'] += 1
+        generation = state['generation']
+    
+    readahead_executor.submit(prefetch_frames, video_name, frame_index, direction, width, fmt, generation)
+
+def prefetch_frames(video_name, frame_index, direction, width, fmt, generation):
+    """Load a window of frames after frame_index into the frame cache"""
+    for step in range(1, READAHEAD_WINDOW + 1):
+        with readahead_lock:
+            if readahead_state[video_name]['generation'] != generation:
+                return  # A newer request moved the scrub position
+        
+        next_index = frame_index + step * direction
+        if next_index < 0:
+            return
+        frame_path = get_frame_path(video_name, next_index)
+        if not os.path.exists(frame_path):
+            return
+        
+        try:
+            get_frame_bytes(frame_path, width, fmt, record_stats=False)
+        except Exception as e:
+            frames_log.warning("Read-ahead error for frame %s: %s", next_index, e)
+            return
+
+@app.route('/get_frame/<video_name>/<int:frame_index>')
+def get_frame(video_name, frame_index):
+    """Serve a frame, optionally downscaled with ?width=<px>&format=webp|jpeg
+    
+    Resized variants are for display only; rectangle coordinates always stay
+    in the full-resolution pixel space of the extracted frames. Serving a frame
+    starts read-ahead of the following frames unless readahead=0 is passed.
+    """
+    frame_path = get_frame_path(video_name, frame_index)
+    
+    if not os.path.exists(frame_path):
+        return "Frame not found", 404
+    
+    width = request.args.get('width', 0, type=int)
+    width = width if width > 0 else None
+    fmt = request.args.get('format', 'webp').lower()
+    if fmt not in FRAME_VARIANT_FORMATS:
+        return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+    
+    try:
+        data, mimetype, cache_hit = get_frame_bytes(frame_path, width, fmt)
+    except Exception as e:
+        frames_log.warning("Error loading frame %s: %s", frame_index, e)
         return send_file(frame_path)
-    return "Frame not found", 404
+    
+    # Thumbnails and other one-off fetches pass readahead=0
+    if request.args.get('readahead', 1, type=int):
+        schedule_readahead(video_name, frame_index, width, fmt, request.args.get('direction', type=int))
+    
+    metric_frame_requests.inc(cache='hit' if cache_hit else 'miss')
+    metric_frame_bytes.inc(len(data))
+    
+    response = Response(data, mimetype=mimetype)
+    response.headers['X-Frame-Cache'] = 'hit' if cache_hit else 'miss'
+    response.set_etag(f'{frame_index}-{os.stat(frame_path).st_mtime_ns}-{width}-{fmt}')
+    return response.make_conditional(request)
+
+@app.route('/get_frames/<video_name>')
+def get_frames(video_name):
+    """Return several frames in one response as base64 data
+    
+    Frames are selected either with start/count (a contiguous range) or with a
+    comma separated list of indices. Supports the same width/format options as
+    /get_frame and triggers read-ahead past the end of the batch.
+    """
+    indices_param = request.args.get('indices')
+    if indices_param:
+        try:
+            indices = [int(i) for i in indices_param.split(',') if i.strip()]
+        except ValueError:
+            return jsonify({'error': 'indices must be a comma separated list of integers'}), 400
+    else:
+        start = request.args.get('start', type=int)
+        if start is None:
+            return jsonify({'error': 'Either start or indices is required'}), 400
+        count = request.args.get('count', 10, type=int)
+        direction = -1 if request.args.get('direction', 1, type=int) < 0 else 1
+        indices = [start + i * direction for i in range(max(0, count))]
+    
+    if len(indices) > FRAME_BATCH_MAX:
+        return jsonify({'error': f'At most {FRAME_BATCH_MAX} frames per request'}), 400
+    
+    width = request.args.get('width', 0, type=int)
+    width = width if width > 0 else None
+    fmt = request.args.get('format', 'webp').lower()
+    if fmt not in FRAME_VARIANT_FORMATS:
+        return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+    
+    frames = []
+    missing = []
+    for frame_index in indices:
+        frame_path = get_frame_path(video_name, frame_index)
+        if frame_index < 0 or not os.path.exists(frame_path):
+            missing.append(frame_index)
+            continue
+        data, mimetype, cache_hit = get_frame_bytes(frame_path, width, fmt)
+        frames.append({
+            'index': frame_index,
+            'mimetype': mimetype,
+            'data': base64.b64encode(data).decode('ascii'),
+            'cached': cache_hit
+        })
+    
+    # Continue reading ahead from the end of a contiguous range
+    if frames and not indices_param:
+        schedule_readahead(video_name, frames[-1]['index'], width, fmt, direction)
+    
+    return jsonify({'frames': frames, 'missing': missing})
+
+@app.route('/stream_frames/<video_name>')
+def stream_frames(video_name):
+    """Stream frames as multipart MJPEG for playback, paced at the requested fps
+    
+    Query parameters: start (0-based frame index), fps and an optional display
+    width. The stream follows the wall clock, so frames are dropped rather than
+    delayed when the server falls behind, keeping the client's frame counter in sync.
+    """
+    start_frame = max(0, request.args.get('start', 0, type=int))
+    fps = request.args.get('fps', 30, type=float)
+    fps = max(1.0, min(fps, PLAYBACK_MAX_FPS))
+    width = request.args.get('width', 0, type=int)
+    
+    if not os.path.exists(get_frame_path(video_name, start_frame)):
+        return "Frame not found", 404
+    
+    def generate():
+        stream_start = time.monotonic()
+        last_sent = start_frame - 1
+        
+        while True:
+            target_frame = start_frame + int((time.monotonic() - stream_start) * fps)
+            if target_frame <= last_sent:
+                # Sleep until the next frame is due
+                next_due = stream_start + (last_sent + 1 - start_frame) / fps
+                time.sleep(max(0.0, next_due - time.monotonic()))
+                continue
+            
+            frame_path = get_frame_path(video_name, target_frame)
+            if not os.path.exists(frame_path):
+                break  # End of video
+            
+            # Playback frames are not cached so they don't evict scrubbing frames
+            if width > 0:
+                data = render_frame_variant(frame_path, width, 'jpeg')
+            else:
+                with open(frame_path, 'rb') as f:
+                    data = f.read()
+            
+            yield (b'--' + PLAYBACK_BOUNDARY.encode() + b'\r\n'
+                   b'Content-Type: image/jpeg\r\n'
+                   b'Content-Length: ' + str(len(data)).encode() + b'\r\n'
+                   b'X-Frame-Index: ' + str(target_frame).encode() + b'\r\n\r\n' +
+                   data + b'\r\n')
+            last_sent = target_frame
+    
+    return Response(
+        generate(),
+        mimetype=f'multipart/x-mixed-replace; boundary={PLAYBACK_BOUNDARY}',
+        headers={'Cache-Control': 'no-cache', 'X-Playback-FPS': f'{fps:g}'}
+    )
+
+@app.route('/frame_cache_stats')
+def frame_cache_stats():
+    """Return resized frame cache statistics"""
+    return jsonify(frame_cache.stats())
 
 def apply_gaussian_blur(image, blur_radius=1):
     """Apply Gaussian blur effect to an image region"""
     return image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
 
 
-def process_frame_with_blur(frame_info):
-    """Process a single frame with blur effect using CPU only"""
+def process_frame_with_blur(frame_info, profiler=None):
+    """Process a single frame with blur effect using CPU only
+    
+    With a profiler, decode/blur/write/frame latencies are recorded per frame.
+    """
     import time
     start_time = time.time()
+    stage_start = time.perf_counter()
     
     original_frame_path, blurred_frame_path, frame_index, precomputed_rectangles, blur_radius = frame_info
     
     # Get precomputed active rectangles for this frame
     active_rectangles = precomputed_rectangles.get(frame_index, {})
     
-    # Log frame processing details
-    if frame_index % 50 == 0 or len(active_rectangles) > 0:
-        rectangle_ids = list(active_rectangles.keys())
-        if len(active_rectangles) > 0:
-            rect_details = []
-            for rect_id, rect_data in active_rectangles.items():
-                rect_details.append(f"{rect_id}:({rect_data.get('x', 'N/A')},{rect_data.get('y', 'N/A')},{rect_data.get('width', 'N/A')},{rect_data.get('height', 'N/A')})")
-            print(f"Processing frame {frame_index}: {len(active_rectangles)} rectangles [{', '.join(rect_details)}]")
-        else:
-            print(f"Processing frame {frame_index}: {len(active_rectangles)} rectangles")
+    # Log frame processing details for a sample of frames, only when debugging
+    if frame_log_sampled(export_log, frame_index):
+        rect_details = [
+            f"{rect_id}:({rect_data.get('x', 'N/A')},{rect_data.get('y', 'N/A')},{rect_data.get('width', 'N/A')},{rect_data.get('height', 'N/A')})"
+            for rect_id, rect_data in active_rectangles.items()
+        ]
+        export_log.debug("Processing frame %d: %d rectangles [%s]", frame_index, len(active_rectangles), ', '.join(rect_details))
     
     # Apply blur to this frame if there are active rectangles
     if active_rectangles:
         # Open the original image
         image = Image.open(original_frame_path)
+        image.load()
+        if profiler:
+            now = time.perf_counter()
+            profiler.observe('decode', now - stage_start)
+            stage_start = now
         
         # Apply blur to each rectangle region
         for rect_id, rect in active_rectangles.items():
@@ -581,6 +2168,11 @@ def process_frame_with_blur(frame_info):
                     # Paste the blurred region back onto the image
                     image.paste(blurred_region, (x, y))
         
+        if profiler:
+            now = time.perf_counter()
+            profiler.observe('blur', now - stage_start)
+            stage_start = now
+        
         # Save the blurred image
         image.save(blurred_frame_path)
         image.close()  # Explicitly close to free memory
@@ -589,15 +2181,123 @@ def process_frame_with_blur(frame_info):
         shutil.copy2(original_frame_path, blurred_frame_path)
     
     total_time = time.time() - start_time
-    if frame_index % 50 == 0 or total_time > 0.5:
-        print(f"Frame {frame_index} processing time: {total_time:.3f}s")
+    metric_frames_blurred.inc(result='blurred' if active_rectangles else 'copied')
+    if profiler:
+        profiler.observe('write', time.perf_counter() - stage_start)
+        profiler.observe('frame', total_time)
+    if total_time > 0.5:
+        suppressed = warning_log_limiter.allow('slow_frame')
+        if suppressed is not None:
+            export_log.warning("Frame %d took %.3fs to blur (%d other slow frames not logged)", frame_index, total_time, suppressed)
     
     return frame_index
 
-def process_frames_multithreaded(frame_tasks, job_id, max_workers=4):
-    """Process frames using multithreading with progress tracking"""
-    total_frames = len(frame_tasks)
-    processed_frames = 0
+# Export checkpoints (resumable and incremental exports)
+EXPORT_CHUNK_FRAMES = 250  # Frames per checkpointed chunk, aligned to absolute frame numbers
+EXPORT_CHECKPOINT_FILENAME = 'export_checkpoint.json'
+EXPORT_REQUESTS_FOLDER = os.path.join(EXPORT_FOLDER, 'export_requests')
+os.makedirs(EXPORT_REQUESTS_FOLDER, exist_ok=True)
+
+def frame_render_hash(source_frame_path, active_rectangles, blur_radius):
+    """Hash everything a blurred frame depends on
+    
+    That is the source frame's fingerprint (size and mtime), the geometry of its
+    active rectangles and the blur radius. Rectangle ids are ignored, so renaming
+    or re-creating an identical rectangle does not invalidate the frame.
+    """
+    source_stat = os.stat(source_frame_path)
+    geometry = sorted((r['x'], r['y'], r['width'], r['height']) for r in active_rectangles.values())
+    payload = json.dumps([source_stat.st_size, source_stat.st_mtime_ns, blur_radius, geometry])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def chunk_start_for_frame(frame_index):
+    return frame_index - frame_index % EXPORT_CHUNK_FRAMES
+
+def build_export_chunks(frame_tasks, precomputed_rectangles, blur_radius):
+    """Group frame tasks into chunks with their frame range and per-frame/chunk render hashes"""
+    chunks = {}
+    for task in frame_tasks:
+        frame_index = task[2]
+        chunk = chunks.setdefault(chunk_start_for_frame(frame_index), {
+            'start': frame_index, 'end': frame_index, 'frame_hashes': {}, 'tasks': []
+        })
+        chunk['start'] = min(chunk['start'], frame_index)
+        chunk['end'] = max(chunk['end'], frame_index)
+        chunk['frame_hashes'][str(frame_index)] = frame_render_hash(
+            task[0], precomputed_rectangles.get(frame_index, {}), blur_radius)
+        chunk['tasks'].append(task)
+    
+    for chunk in chunks.values():
+        ordered_hashes = [chunk['frame_hashes'][str(task[2])] for task in chunk['tasks']]
+        chunk['rect_hash'] = hashlib.sha1(''.join(ordered_hashes).encode()).hexdigest()
+    return chunks
+
+def load_export_checkpoint(blurred_frames_folder):
+    path = os.path.join(blurred_frames_folder, EXPORT_CHECKPOINT_FILENAME)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'chunks': {}}
+
+def save_export_checkpoint(blurred_frames_folder, checkpoint):
+    """Write the checkpoint atomically so a crash never leaves a torn file"""
+    path = os.path.join(blurred_frames_folder, EXPORT_CHECKPOINT_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def find_stale_frame_tasks(checkpoint, chunk_start, chunk):
+    """Return the chunk's tasks whose cached blurred frame is missing or outdated"""
+    entry = checkpoint['chunks'].get(str(chunk_start))
+    cached_hashes = entry.get('frame_hashes', {}) if entry else {}
+    return [task for task in chunk['tasks']
+            if cached_hashes.get(str(task[2])) != chunk['frame_hashes'][str(task[2])]
+            or not os.path.exists(task[1])]
+
+def is_chunk_checkpointed(checkpoint, chunk_start, chunk, blur_radius):
+    """Check that a chunk was finished with the same inputs and its output frames still exist"""
+    entry = checkpoint['chunks'].get(str(chunk_start))
+    if not entry:
+        return False
+    if (entry['start'], entry['end'], entry['rect_hash'], entry['blur_radius']) != \
+            (chunk['start'], chunk['end'], chunk['rect_hash'], blur_radius):
+        return False
+    return all(os.path.exists(task[1]) for task in chunk['tasks'])
+
+def export_request_path(job_id):
+    return os.path.join(EXPORT_REQUESTS_FOLDER, f'{job_id}.json')
+
+def expire_export_requests():
+    """Delete saved requests of exports that were never resumed, after the job store's TTL
+    
+    Failed and cancelled exports keep their request so they can be resumed, but
+    like their job rows they expire after JOB_TTL_SECONDS.
+    """
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for entry in os.scandir(EXPORT_REQUESTS_FOLDER):
+        try:
+            if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass  # Removed or resumed concurrently
+
+expire_export_requests()
+
+def process_frames_multithreaded(frame_tasks, job_id, max_workers=4, already_processed=0, on_chunk_done=None, profiler=None):
+    """Process frames using multithreading with progress tracking
+    
+    already_processed counts frames skipped by the caller (e.g. resumed chunks)
+    towards progress. on_chunk_done(chunk_start) is called once every task of a
+    chunk has completed.
+    """
+    total_frames = len(frame_tasks) + already_processed
+    processed_frames = already_processed
+    remaining_per_chunk = {}
+    for task in frame_tasks:
+        chunk_start = chunk_start_for_frame(task[2])
+        remaining_per_chunk[chunk_start] = remaining_per_chunk.get(chunk_start, 0) + 1
     
     # Update job progress
     with jobs_lock:
@@ -605,30 +2305,48 @@ def process_frames_multithreaded(frame_tasks, job_id, max_workers=4):
             jobs[job_id]['progress'] = 0
             jobs[job_id]['status'] = 'processing_frames'
             jobs[job_id]['total_frames'] = total_frames
-            jobs[job_id]['processed_frames'] = 0
+            jobs[job_id]['processed_frames'] = processed_frames
     
-    print(f"Starting multithreaded frame processing with {max_workers} workers for {total_frames} frames...")
+    export_log.info("Starting multithreaded frame processing with %s workers for %s frames", max_workers, total_frames)
     processing_start_time = time.time()
     
+    task_iter = iter(frame_tasks)
+    in_flight = set()
+    
+    def submit_next(executor):
+        task = next(task_iter, None)
+        if task is not None:
+            in_flight.add(executor.submit(process_frame_with_blur, task, profiler))
+    
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_frame = {executor.submit(process_frame_with_blur, task): task for task in frame_tasks}
-        
-        # Process completed tasks
-        for future in as_completed(future_to_frame):
+        # Only a couple of tasks per worker are queued at a time, so a cancel
+        # stops new work after the frames already being blurred
+        for _ in range(max_workers * 2):
+            submit_next(executor)
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            in_flight.discard(future)
+            
             # Check if job was cancelled
-            with jobs_lock:
-                if job_id in jobs and jobs[job_id]['cancelled']:
-                    print(f"Job {job_id} was cancelled, stopping frame processing")
-                    # Cancel remaining futures
-                    for f in future_to_frame:
-                        f.cancel()
-                    return False
+            if is_job_cancelled(job_id):
+                export_log.info("Job %s was cancelled, stopping frame processing", job_id)
+                for f in in_flight:
+                    f.cancel()
+                return False
+            
+            submit_next(executor)
             
             try:
                 frame_index = future.result()
                 processed_frames += 1
                 
+                chunk_start = chunk_start_for_frame(frame_index)
+                remaining_per_chunk[chunk_start] -= 1
+                if remaining_per_chunk[chunk_start] == 0 and on_chunk_done:
+                    on_chunk_done(chunk_start)
+                
                 # Update progress
                 progress_percent = (processed_frames / total_frames) * 100
                 with jobs_lock:
@@ -636,132 +2354,410 @@ def process_frames_multithreaded(frame_tasks, job_id, max_workers=4):
                         jobs[job_id]['progress'] = progress_percent
                         jobs[job_id]['processed_frames'] = processed_frames
                 
-                # Log progress every 10 frames
-                if processed_frames % 10 == 0 or processed_frames == total_frames:
+                # Log progress every few seconds
+                if export_log.isEnabledFor(logging.INFO) and progress_log_limiter.allow((job_id, 'blur')) is not None:
                     elapsed = time.time() - processing_start_time
                     fps = processed_frames / elapsed if elapsed > 0 else 0
-                    print(f"Processed {processed_frames}/{total_frames} frames ({progress_percent:.1f}%) | FPS: {fps:.2f}")
+                    export_log.info("Processed %d/%d frames (%.1f%%) | FPS: %.2f", processed_frames, total_frames, progress_percent, fps)
                     
             except Exception as e:
-                print(f"Error processing frame: {e}")
+                export_log.exception("Error processing frame: %s", e)
                 with jobs_lock:
                     if job_id in jobs:
                         jobs[job_id]['error'] = str(e)
                         jobs[job_id]['status'] = 'error'
+                for f in in_flight:
+                    f.cancel()
                 return False
     
-    print(f"Completed processing {processed_frames} frames in {time.time() - processing_start_time:.2f}s")
+    export_log.info("Completed processing %s frames in %.2fs", processed_frames, time.time() - processing_start_time)
     return True
 
-def run_ffmpeg_with_progress(cmd, job_id, total_frames, fps):
-    """Run FFmpeg command with real-time progress monitoring"""
+# FFmpeg execution
+FFMPEG_STDERR_TAIL_LINES = 200  # Only the end of stderr is kept for error messages
+FFMPEG_WATCHDOG_INTERVAL = 0.5  # Seconds between cancellation/timeout checks
+
+FFmpegProgress = namedtuple('FFmpegProgress', ['frame', 'fps', 'speed', 'bitrate_kbps', 'out_time', 'total_size', 'done'])
+FFmpegProgress.__doc__ = """One `-progress` report: speed is a multiple of realtime, out_time in seconds; unknown values are None"""
+
+def parse_ffmpeg_number(value, suffix=''):
+    """Parse an ffmpeg progress value like '1.5x' or '812.3kbits/s', None for 'N/A'"""
+    if value is None:
+        return None
+    value = value.strip()
+    if suffix and value.endswith(suffix):
+        value = value[:-len(suffix)]
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def parse_ffmpeg_progress(fields):
+    """Build an FFmpegProgress from one block of `-progress` key=value fields"""
+    frame = parse_ffmpeg_number(fields.get('frame'))
+    total_size = parse_ffmpeg_number(fields.get('total_size'))
+    out_time_us = parse_ffmpeg_number(fields.get('out_time_us') or fields.get('out_time_ms'))
+    return FFmpegProgress(
+        frame=int(frame) if frame is not None else None,
+        fps=parse_ffmpeg_number(fields.get('fps')),
+        speed=parse_ffmpeg_number(fields.get('speed'), 'x'),
+        bitrate_kbps=parse_ffmpeg_number(fields.get('bitrate'), 'kbits/s'),
+        out_time=out_time_us / 1_000_000 if out_time_us is not None and out_time_us >= 0 else None,
+        total_size=int(total_size) if total_size is not None else None,
+        done=fields.get('progress') == 'end'
+    )
+
+def run_ffmpeg(cmd, job_id=None, on_progress=None, frame_source=None, timeout=None):
+    """Run an ffmpeg command, streaming its progress as FFmpegProgress events
+    
+    Progress is read from `-progress pipe:1` as it is written and passed to
+    on_progress. Only the last FFMPEG_STDERR_TAIL_LINES of stderr are kept.
+    frame_source is an optional iterable of encoded frames written to stdin.
+    Returns the stderr tail, or None if job_id's job was cancelled (ffmpeg is
+    terminated). Raises CalledProcessError on failure and TimeoutExpired after
+    killing ffmpeg when it runs longer than timeout seconds.
+    """
+    full_cmd = [cmd[0], '-nostats', '-progress', 'pipe:1'] + list(cmd[1:])
+    ffmpeg_log.debug("Executing FFmpeg: %s", ' '.join(full_cmd))
+    process = subprocess.Popen(
+        full_cmd,
+        stdin=subprocess.PIPE if frame_source is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if job_id:
+        register_job_process(job_id, process)
+    job_type = job_type_of(job_id)
     
-    # Create a temporary file for progress output
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.txt') as progress_file:
-        progress_path = progress_file.name
+    stderr_tail = deque(maxlen=FFMPEG_STDERR_TAIL_LINES)
+    feed_errors = []
+    timed_out = threading.Event()
+    finished = threading.Event()
+    
+    def drain_stderr():
+        for line in process.stderr:
+            stderr_tail.append(line)
+    
+    def feed_frames():
+        try:
+            for frame_data in frame_source:
+                process.stdin.write(frame_data)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg exited; its return code reports why
+        except Exception as e:
+            feed_errors.append(e)
+            process.kill()
+        finally:
+            if hasattr(frame_source, 'close'):
+                frame_source.close()  # Stop producers still ahead of the encoder
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+    
+    def watchdog():
+        deadline = time.time() + timeout if timeout else None
+        while not finished.wait(FFMPEG_WATCHDOG_INTERVAL):
+            if job_id and is_job_cancelled(job_id):
+                process.terminate()
+                return
+            if deadline and time.time() > deadline:
+                timed_out.set()
+                process.kill()
+                return
+    
+    helpers = [threading.Thread(target=drain_stderr, daemon=True)]
+    if frame_source is not None:
+        helpers.append(threading.Thread(target=feed_frames, daemon=True))
+    for helper in helpers:
+        helper.start()
+    watchdog_thread = threading.Thread(target=watchdog, daemon=True)
+    watchdog_thread.start()
     
     try:
-        # Add progress monitoring to FFmpeg command
-        cmd_with_progress = cmd.copy()
-        # Insert progress parameters before the output file
-        output_file = cmd_with_progress.pop()  # Remove output file
-        cmd_with_progress.extend(['-progress', progress_path, '-stats_period', '0.5'])
-        cmd_with_progress.append(output_file)  # Add output file back
-        
-        print(f"Executing FFmpeg with progress: {' '.join(cmd_with_progress)}")
-        
-        # Start FFmpeg process
-        process = subprocess.Popen(
-            cmd_with_progress,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+        fields = {}
+        for raw_line in process.stdout:
+            key, _, value = raw_line.decode(errors='replace').strip().partition('=')
+            if not key:
+                continue
+            fields[key] = value
+            if key == 'progress':
+                event = parse_ffmpeg_progress(fields)
+                if event.speed:
+                    metric_ffmpeg_speed.observe(event.speed, job_type=job_type)
+                if event.fps is not None:
+                    metric_ffmpeg_fps.set(event.fps, job_type=job_type)
+                if on_progress:
+                    on_progress(event)
+                fields = {}
+        process.wait()
+    finally:
+        finished.set()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        for helper in helpers:
+            helper.join()
+        if job_id:
+            unregister_job_process(job_id, process)
+    
+    stderr = b''.join(stderr_tail).decode(errors='replace')
+    if job_id and is_job_cancelled(job_id):
+        return None
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(full_cmd, timeout, stderr=stderr)
+    if feed_errors:
+        raise feed_errors[0]
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, full_cmd, stderr=stderr)
+    return stderr
+
+def format_ffmpeg_speed(event):
+    return f'{event.speed:.2f}x' if event.speed is not None else 'N/A'
+
+def format_ffmpeg_bitrate(event):
+    return f'{event.bitrate_kbps:.1f}kbits/s' if event.bitrate_kbps is not None else 'N/A'
+
+def run_ffmpeg_with_progress(cmd, job_id, total_frames, fps, progress_callback=None, frame_source=None):
+    """Run an encoding FFmpeg command, reporting its progress on the job
+    
+    Progress is written to the job unless progress_callback(event) is given, in
+    which case the caller aggregates the FFmpegProgress events (e.g. chunked
+    encoding). Returns ('', stderr), or (None, stderr) if the job was cancelled.
+    """
+    def report_progress(event):
+        if progress_callback:
+            progress_callback(event)
+            return
+        if event.done:
+            encoding_progress = 100
+        elif event.frame is not None:
+            encoding_progress = min(100, (event.frame / total_frames) * 100) if total_frames else 100
+        else:
+            return
         
-        # Monitor progress in a separate thread
-        def monitor_progress():
-            last_pos = 0
-            while process.poll() is None:
-                try:
-                    with open(progress_path, 'r') as f:
-                        f.seek(last_pos)
-                        content = f.read()
-                        last_pos = f.tell()
-                        
-                        if content:
-                            # Parse FFmpeg progress output
-                            lines = content.strip().split('\n')
-                            current_data = {}
-                            
-                            for line in lines:
-                                if '=' in line:
-                                    key, value = line.split('=', 1)
-                                    current_data[key] = value
-                                elif line == 'progress=end':
-                                    # Encoding finished
-                                    with jobs_lock:
-                                        if job_id in jobs:
-                                            jobs[job_id]['encoding_progress'] = 100
-                                            jobs[job_id]['progress'] = 98
-                                    break
-                            
-                            # Update progress based on current frame
-                            if 'frame' in current_data and current_data['frame'].isdigit():
-                                current_frame = int(current_data['frame'])
-                                encoding_progress = min(100, (current_frame / total_frames) * 100)
-                                
-                                # Get additional info
-                                speed = current_data.get('speed', 'N/A')
-                                bitrate = current_data.get('bitrate', 'N/A')
-                                
-                                with jobs_lock:
-                                    if job_id in jobs and not jobs[job_id]['cancelled']:
-                                        jobs[job_id]['encoding_progress'] = encoding_progress
-                                        jobs[job_id]['encoding_frame'] = current_frame
-                                        jobs[job_id]['encoding_speed'] = speed
-                                        jobs[job_id]['encoding_bitrate'] = bitrate
-                                        # Overall progress: 80% for frame processing + 18% for encoding
-                                        jobs[job_id]['progress'] = 80 + (encoding_progress * 0.18)
-                                
-                                print(f"Encoding progress: {encoding_progress:.1f}% ({current_frame}/{total_frames} frames) Speed: {speed}")
-                    
-                    time.sleep(0.5)  # Check every 500ms
-                    
-                except Exception as e:
-                    print(f"Error monitoring FFmpeg progress: {e}")
+        with jobs_lock:
+            if job_id in jobs and not jobs[job_id]['cancelled']:
+                jobs[job_id]['encoding_progress'] = encoding_progress
+                jobs[job_id]['encoding_frame'] = event.frame
+                jobs[job_id]['encoding_speed'] = format_ffmpeg_speed(event)
+                jobs[job_id]['encoding_bitrate'] = format_ffmpeg_bitrate(event)
+                # Overall progress: 80% for frame processing + 18% for encoding
+                jobs[job_id]['progress'] = 80 + (encoding_progress * 0.18)
+        
+        if progress_log_limiter.allow((job_id, 'encode')) is not None:
+            export_log.info("Encoding progress: %.1f%% (%s/%d frames) Speed: %s", encoding_progress, event.frame, total_frames, format_ffmpeg_speed(event))
+    
+    stderr = run_ffmpeg(cmd, job_id, on_progress=report_progress, frame_source=frame_source)
+    if stderr is None:
+        return None, ''
+    return '', stderr
+
+# Overlapped blur/encode pipeline
+PIPELINE_QUEUE_DEPTH = 32  # Frames allowed in flight between the blur workers and the encoder
+
+def pipelined_blurred_frames(frame_tasks, pending_tasks, job_id, max_workers=4, on_chunk_done=None, profiler=None):
+    """Yield blurred JPEG frames in output order while later frames are still being blurred
+    
+    Blur tasks run at most PIPELINE_QUEUE_DEPTH frames ahead of the encoder. Frames
+    finishing out of order wait in the window (the reorder buffer) until every
+    earlier frame has been handed on, so memory is capped by the queue depth.
+    Frames not in pending_tasks are reused from disk.
+    """
+    pending_indices = {task[2] for task in pending_tasks}
+    remaining_per_chunk = {}
+    for task in pending_tasks:
+        chunk_start = chunk_start_for_frame(task[2])
+        remaining_per_chunk[chunk_start] = remaining_per_chunk.get(chunk_start, 0) + 1
+    
+    total_frames = len(frame_tasks)
+    processed_frames = total_frames - len(pending_tasks)
+    with jobs_lock:
+        if job_id in jobs:
+            jobs[job_id]['status'] = 'blur_encoding'
+            jobs[job_id]['progress'] = 0
+            jobs[job_id]['encoding_progress'] = 0
+            jobs[job_id]['total_frames'] = total_frames
+            jobs[job_id]['processed_frames'] = processed_frames
+    
+    export_log.info("Starting pipelined blur/encode with %s workers for %s frames (queue depth %s)", max_workers, total_frames, PIPELINE_QUEUE_DEPTH)
+    window = deque()
+    task_iter = iter(frame_tasks)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                # Keep the window full so blur workers stay ahead of the encoder
+                while len(window) < PIPELINE_QUEUE_DEPTH:
+                    task = next(task_iter, None)
+                    if task is None:
+                        break
+                    future = executor.submit(process_frame_with_blur, task, profiler) if task[2] in pending_indices else None
+                    window.append((task, future))
+                if not window:
                     break
-        
-        # Start progress monitoring thread
-        progress_thread = threading.Thread(target=monitor_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-        
-        # Wait for FFmpeg to complete
-        stdout, stderr = process.communicate()
-        
-        # Wait for progress thread to finish
-        progress_thread.join(timeout=2)
-        
-        if process.returncode != 0:
-            raise subprocess.CalledProcessError(process.returncode, cmd_with_progress, stderr)
-        
-        return stdout, stderr
-        
+                
+                if is_job_cancelled(job_id):
+                    export_log.info("Job %s was cancelled, stopping pipelined export", job_id)
+                    return
+                
+                task, future = window.popleft()
+                if future is not None:
+                    frame_index = future.result()  # Propagate blur errors
+                    processed_frames += 1
+                    chunk_start = chunk_start_for_frame(frame_index)
+                    remaining_per_chunk[chunk_start] -= 1
+                    if remaining_per_chunk[chunk_start] == 0 and on_chunk_done:
+                        on_chunk_done(chunk_start)
+                    with jobs_lock:
+                        if job_id in jobs:
+                            jobs[job_id]['processed_frames'] = processed_frames
+                
+                with open(task[1], 'rb') as f:
+                    yield f.read()
+        finally:
+            for _, future in window:
+                if future is not None:
+                    future.cancel()
+
+# Chunk-parallel encoding
+EXPORT_GOP_SIZE = 50  # Keyframe interval in chunked mode; EXPORT_CHUNK_FRAMES is a multiple of it
+CHUNK_ENCODE_THREADS = 2  # ffmpeg threads per software chunk encoder
+HARDWARE_CHUNK_ENCODERS = 2  # Hardware encoders only allow a few concurrent sessions
+
+def chunk_encode_workers(video_codec, chunk_count):
+    """Number of chunk encoders to run at once, bounded by cores"""
+    if video_codec.startswith('lib'):
+        workers = (os.cpu_count() or 2) // CHUNK_ENCODE_THREADS
+    else:
+        workers = HARDWARE_CHUNK_ENCODERS
+    return max(1, min(workers, chunk_count))
+
+def encode_chunks_parallel(job_id, chunks, frame_pattern, segments_folder, frame_rate, encode_args, checkpoint, blurred_frames_folder):
+    """Encode each chunk of blurred frames to its own segment, returns segment paths in order
+    (None if the job was cancelled) and the number of reused segments
+    
+    Segments whose chunk inputs and encoder settings are unchanged since a
+    previous export are reused. Per-chunk progress is rolled up into the job's
+    encoding_progress.
+    """
+    os.makedirs(segments_folder, exist_ok=True)
+    encode_key = hashlib.sha1(json.dumps([encode_args, str(frame_rate), EXPORT_GOP_SIZE]).encode()).hexdigest()
+    segment_records = checkpoint.setdefault('segments', {})
+    video_codec = encode_args[encode_args.index('-c:v') + 1]
+    
+    total_frames = sum(len(chunk['tasks']) for chunk in chunks.values())
+    encoded_frames = {}
+    progress_lock = Lock()
+    
+    def update_progress(chunk_start, frame, speed=None):
+        with progress_lock:
+            encoded_frames[chunk_start] = frame
+            done = sum(encoded_frames.values())
+        encoding_progress = min(100, (done / total_frames) * 100) if total_frames else 100
+        with jobs_lock:
+            if job_id in jobs and not jobs[job_id]['cancelled']:
+                jobs[job_id]['encoding_progress'] = encoding_progress
+                jobs[job_id]['encoding_frame'] = done
+                if speed:
+                    jobs[job_id]['encoding_speed'] = speed
+                jobs[job_id]['progress'] = 80 + (encoding_progress * 0.18)
+    
+    segments = {}
+    pending = []
+    for chunk_start, chunk in sorted(chunks.items()):
+        segment_path = os.path.join(segments_folder, f'segment_{chunk_start:06d}.mp4')
+        segments[chunk_start] = segment_path
+        record = segment_records.get(str(chunk_start))
+        if (record and record['rect_hash'] == chunk['rect_hash'] and record['encode_key'] == encode_key
+                and record['start'] == chunk['start'] and os.path.exists(segment_path)):
+            update_progress(chunk_start, len(chunk['tasks']))
+            continue
+        segment_records.pop(str(chunk_start), None)
+        pending.append((chunk_start, chunk, segment_path))
+    
+    reused = len(chunks) - len(pending)
+    workers = chunk_encode_workers(video_codec, len(pending))
+    export_log.info("Encoding %s chunks with %s parallel encoders (%s segments reused)", len(pending), workers, reused)
+    
+    def encode_chunk(chunk_start, chunk, segment_path):
+        if is_job_cancelled(job_id):
+            return False  # Don't start new encoders for a cancelled job
+        cmd = [
+            'ffmpeg', '-y',
+            '-framerate', str(frame_rate),
+            '-start_number', str(chunk['start'] + 1),
+            '-i', frame_pattern,
+            '-frames:v', str(len(chunk['tasks'])),
+        ]
+        cmd.extend(encode_args)
+        cmd.extend(['-g', str(EXPORT_GOP_SIZE), '-an'])
+        if video_codec.startswith('lib'):
+            cmd.extend(['-threads', str(CHUNK_ENCODE_THREADS)])
+        cmd.append(segment_path)
+        stdout, _ = run_ffmpeg_with_progress(cmd, job_id, len(chunk['tasks']), frame_rate,
+                                             progress_callback=lambda event: update_progress(chunk_start, event.frame or 0, format_ffmpeg_speed(event)))
+        return stdout is not None
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_chunk = {executor.submit(encode_chunk, *item): item for item in pending}
+            for future in as_completed(future_to_chunk):
+                chunk_start, chunk, _ = future_to_chunk[future]
+                if not future.result():  # Propagates ffmpeg errors
+                    continue
+                update_progress(chunk_start, len(chunk['tasks']))
+                segment_records[str(chunk_start)] = {
+                    'start': chunk['start'],
+                    'rect_hash': chunk['rect_hash'],
+                    'encode_key': encode_key
+                }
+                save_export_checkpoint(blurred_frames_folder, checkpoint)
+    
+    if is_job_cancelled(job_id):
+        # Segments cut short by the cancel are partial; finished ones stay reusable
+        for chunk_start, _, segment_path in pending:
+            if str(chunk_start) not in segment_records and os.path.exists(segment_path):
+                os.remove(segment_path)
+        return None, reused
+    
+    return [segments[chunk_start] for chunk_start in sorted(segments)], reused
+
+def concat_segments(segment_paths, output_path, audio_input_args=None, job_id=None):
+    """Join encoded segments with the concat demuxer, muxing audio in once
+    
+    audio_input_args are the ffmpeg input options for the audio source,
+    e.g. ['-ss', '12.0', '-t', '10.0', '-i', path] for a trimmed export.
+    Returns False if the job was cancelled while joining.
+    """
+    list_path = output_path + '.segments.txt'
+    with open(list_path, 'w') as f:
+        for segment_path in segment_paths:
+            escaped_path = os.path.abspath(segment_path).replace("'", "'\\''")
+            f.write(f"file '{escaped_path}'\n")
+    
+    try:
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_path]
+        if audio_input_args:
+            cmd.extend(audio_input_args)
+            cmd.extend(['-map', '0:v:0', '-map', '1:a:0', '-c:a', 'copy'])
+        cmd.extend(['-c:v', 'copy', output_path])
+        export_log.info("Concatenating %s segments", len(segment_paths))
+        return run_ffmpeg(cmd, job_id) is not None
     finally:
-        # Clean up temporary progress file
         try:
-            os.unlink(progress_path)
-        except:
+            os.unlink(list_path)
+        except OSError:
             pass
 
 def export_blurred_async(job_id, data):
     """Asynchronous export function that runs in a separate thread"""
+    profiler = JobProfiler(job_id, 'export')
+    has_audio = False  # Read by the ffmpeg error handler, which ffprobe can reach first
+    chunked = False
     try:
         video_name = data['video_name']
         blur_radius = data.get('blur_radius', 5)
-        video_codec = data.get('video_codec', 'libx264')
+        video_codec = resolve_video_codec(data.get('video_codec', 'libx264'))
         trim_start_frame = data.get('trim_start_frame')
         trim_end_frame = data.get('trim_end_frame')
         
@@ -772,7 +2768,7 @@ def export_blurred_async(job_id, data):
                     if job_id in jobs:
                         jobs[job_id]['status'] = 'error'
                         jobs[job_id]['message'] = f'Invalid trim range: start frame {trim_start_frame} must be before end frame {trim_end_frame}'
-                print(f"Export failed: Invalid trim range {trim_start_frame} >= {trim_end_frame}")
+                export_log.error("Export failed: Invalid trim range %s >= %s", trim_start_frame, trim_end_frame)
                 return
         
         with jobs_lock:
@@ -786,17 +2782,17 @@ def export_blurred_async(job_id, data):
         # First check if we have direct frames array
         if 'frames' in data:
             frames_data = data['frames']
-            print("Found frames data directly in request")
+            export_log.debug("Found frames data directly in request")
         # Check if it's wrapped in all_frame_rectangles
         elif 'all_frame_rectangles' in data:
             all_frame_rectangles = data['all_frame_rectangles']
             if isinstance(all_frame_rectangles, dict) and 'frames' in all_frame_rectangles:
                 frames_data = all_frame_rectangles['frames']
-                print("Found frames data in all_frame_rectangles.frames")
+                export_log.debug("Found frames data in all_frame_rectangles.frames")
             elif isinstance(all_frame_rectangles, list):
                 # Maybe it's already a list of frame events
                 frames_data = all_frame_rectangles
-                print("all_frame_rectangles is already a list")
+                export_log.debug("all_frame_rectangles is already a list")
         
         original_video_path = os.path.join(UPLOAD_FOLDER, video_name)
         video_frames_folder = os.path.join(FRAMES_FOLDER, video_name.split('.')[0])
@@ -807,21 +2803,37 @@ def export_blurred_async(job_id, data):
         export_start_time = time.time()
         process = psutil.Process()
         initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-        print(f"Starting export - Initial memory usage: {initial_memory:.2f} MB")
+        export_log.info("Starting export - Initial memory usage: %.2f MB", initial_memory)
         
         # Create blurred frames for all frames that have rectangles
         blurred_frames_folder = os.path.join(FRAMES_FOLDER, f"{video_name.split('.')[0]}_blurred")
         os.makedirs(blurred_frames_folder, exist_ok=True)
         
-        # First, copy all original frames to the blurred folder
-        frame_files = sorted([f for f in os.listdir(video_frames_folder) if f.startswith('frame_')])
+        profiler.begin('scan_frames')
+        # Resolve the frame range to export. With a trim end only the frames inside
+        # the range are looked up, so a short cut never lists the whole video
+        range_start = trim_start_frame if trim_start_frame is not None else 0
+        if trim_end_frame is not None:
+            frame_files = [f'frame_{i + 1:06d}.jpg' for i in range(range_start, trim_end_frame + 1)
+                           if os.path.exists(os.path.join(video_frames_folder, f'frame_{i + 1:06d}.jpg'))]
+        else:
+            frame_files = sorted([f for f in os.listdir(video_frames_folder) if f.startswith('frame_')])
+            frame_files = [f for f in frame_files if int(f.split('_')[1].split('.')[0]) - 1 >= range_start]
+        
+        if not frame_files:
+            with jobs_lock:
+                if job_id in jobs:
+                    jobs[job_id]['status'] = 'error'
+                    jobs[job_id]['message'] = 'No extracted frames in the selected range'
+            return
         
         # Get the total number of frames
         total_frames = len(frame_files)
         
-        # Get the maximum frame number
-        max_frame = max([int(f.split('_')[1].split('.')[0]) for f in frame_files]) - 1
+        # Get the last frame number of the range
+        max_frame = int(frame_files[-1].split('_')[1].split('.')[0]) - 1
         
+        profiler.begin('rect_precompute')
         # Check if we have frames data or need to handle legacy format
         if not frames_data:
             # Try legacy format
@@ -829,13 +2841,15 @@ def export_blurred_async(job_id, data):
                 all_frame_rectangles = data['all_frame_rectangles']
                 # Skip if it's wrapped frames data
                 if 'frames' not in all_frame_rectangles:
-                    print("Processing legacy rectangle format (complete states per frame)...")
+                    export_log.info("Processing legacy rectangle format (complete states per frame)")
                     
                     # Process legacy format - each frame has complete rectangle state
                     precomputed_rectangles = {}
                     
                     for frame_index, rectangles in all_frame_rectangles.items():
                         frame_num = int(frame_index)
+                        if not range_start <= frame_num <= max_frame:
+                            continue  # Outside the exported range
                         active_rects = {}
                         
                         for i, rect in enumerate(rectangles):
@@ -863,8 +2877,8 @@ def export_blurred_async(job_id, data):
                     frames_with_rects = len(precomputed_rectangles)
                     max_active = max((len(rects) for rects in precomputed_rectangles.values()), default=0)
                     
-                    print(f"Legacy format processed: {frames_with_rects} frames with rectangles")
-                    print(f"Maximum active rectangles at once: {max_active}")
+                    export_log.info("Legacy format processed: %d frames with rectangles, at most %d active at once",
+                                    frames_with_rects, max_active)
                     
                     # Skip event processing and jump to frame processing
                     frames_data = None
@@ -872,13 +2886,11 @@ def export_blurred_async(job_id, data):
             if not frames_data and 'precomputed_rectangles' not in locals():
                 return jsonify({'error': 'No rectangle data provided. Please load rectangle data from a JSON file.'}), 400
         
-        if frames_data:
-            print(f"Processing {len(frames_data)} frames with events...")
-        
         # Only process events if we have frames_data
         if frames_data:
             # Process events to track rectangle lifecycle
-            print("Processing rectangle events...")
+            export_log.info("Processing rectangle events of %d frames", len(frames_data))
+            trace = export_log.isEnabledFor(logging.DEBUG)
             active_rectangles = {}  # Currently active rectangles by rectangleId
             
             # Sort frames by frame number
@@ -893,12 +2905,15 @@ def export_blurred_async(job_id, data):
             
             for frame_data in frames_data:
                 frame_num = frame_data['frame_number']
+                if frame_num > max_frame:
+                    break  # Events after the range can't affect it
                 
-                # Fill frames between last processed and current frame
-                while frame_idx < frame_num:
-                    if active_rectangles:
-                        precomputed_rectangles[frame_idx] = active_rectangles.copy()
-                    frame_idx += 1
+                # Fill frames between last processed and current frame. Events before
+                # the range only update the state carried into its first frame
+                if active_rectangles:
+                    for fill_idx in range(max(frame_idx, range_start), frame_num):
+                        precomputed_rectangles[fill_idx] = active_rectangles.copy()
+                frame_idx = max(frame_idx, frame_num)
                 
                 # Process events at this frame
                 for event in frame_data['events']:
@@ -915,9 +2930,10 @@ def export_blurred_async(job_id, data):
                                 'width': event['width'],
                                 'height': event['height']
                             }
-                            print(f"Frame {frame_num}: Created rectangle {rect_id}")
+                            if trace:
+                                export_log.debug("Frame %d: Created rectangle %s", frame_num, rect_id)
                         else:
-                            print(f"Frame {frame_num}: ERROR - rectangleCreated event missing coordinates")
+                            export_log.warning("Frame %d: rectangleCreated event missing coordinates", frame_num)
                     
                     elif event_type == 'rectangleMoved':
                         # Move existing rectangle
@@ -929,34 +2945,35 @@ def export_blurred_async(job_id, data):
                                     'width': event['width'],
                                     'height': event['height']
                                 }
-                                print(f"Frame {frame_num}: Moved rectangle {rect_id}")
+                                if trace:
+                                    export_log.debug("Frame %d: Moved rectangle %s", frame_num, rect_id)
                             else:
-                                print(f"Frame {frame_num}: ERROR - rectangleMoved event missing coordinates")
+                                export_log.warning("Frame %d: rectangleMoved event missing coordinates", frame_num)
                         else:
-                            print(f"Frame {frame_num}: WARNING - Trying to move non-existent rectangle {rect_id}")
+                            export_log.warning("Frame %d: Trying to move non-existent rectangle %s", frame_num, rect_id)
                     
                     elif event_type == 'rectangleDeleted':
                         # Delete rectangle
                         if rect_id in active_rectangles:
                             del active_rectangles[rect_id]
-                            print(f"Frame {frame_num}: Deleted rectangle {rect_id}")
+                            if trace:
+                                export_log.debug("Frame %d: Deleted rectangle %s", frame_num, rect_id)
                         else:
-                            print(f"Frame {frame_num}: WARNING - Trying to delete non-existent rectangle {rect_id}")
+                            export_log.warning("Frame %d: Trying to delete non-existent rectangle %s", frame_num, rect_id)
                 
                 # Store state after processing events
-                if active_rectangles:
+                if active_rectangles and frame_idx >= range_start:
                     precomputed_rectangles[frame_idx] = active_rectangles.copy()
-                    # Log the active rectangleIds for this frame
-                    rectangle_ids = list(active_rectangles.keys())
-                    print(f"Frame {frame_num} final state: {len(active_rectangles)} active rectangles - IDs: {rectangle_ids}")
+                    if trace:
+                        export_log.debug("Frame %d final state: %d active rectangles - IDs: %s",
+                                         frame_num, len(active_rectangles), list(active_rectangles))
                 
                 frame_idx = frame_num + 1
             
-            # Fill remaining frames
-            while frame_idx <= max_frame:
-                if active_rectangles:
-                    precomputed_rectangles[frame_idx] = active_rectangles.copy()
-                frame_idx += 1
+            # Fill remaining frames of the range
+            if active_rectangles:
+                for fill_idx in range(max(frame_idx, range_start), max_frame + 1):
+                    precomputed_rectangles[fill_idx] = active_rectangles.copy()
             
             # Log statistics about rectangles
             frames_with_rects = len(precomputed_rectangles)
@@ -968,34 +2985,25 @@ def export_blurred_async(job_id, data):
             
             max_active = max((len(rects) for rects in precomputed_rectangles.values()), default=0)
             
-            print(f"\nRectangle processing complete:")
-            print(f"Total events processed: {event_count}")
-            print(f"Total unique rectangles: {len(unique_rect_ids)}")
-            print(f"Unique rectangleIds processed: {sorted(unique_rect_ids)}")
-            print(f"Frames with active rectangles: {frames_with_rects}/{max_frame + 1}")
-            print(f"Maximum active rectangles at once: {max_active}")
+            export_log.info(
+                "Rectangle processing complete: %d events, %d unique rectangles, %d/%d frames with rectangles, at most %d active at once",
+                event_count, len(unique_rect_ids), frames_with_rects, total_frames, max_active,
+                extra={'job_id': job_id, 'events': event_count, 'unique_rectangles': len(unique_rect_ids), 'frames_with_rectangles': frames_with_rects}
+            )
             
             # Log a sample of frames with their active rectangles for debugging
-            sample_frames = sorted(list(precomputed_rectangles.keys()))[:10]  # Show first 10 frames with rectangles
-            if sample_frames:
-                print(f"Sample of frames with rectangles (first 10):")
-                for frame_idx in sample_frames:
-                    rect_ids = list(precomputed_rectangles[frame_idx].keys())
-                    print(f"  Frame {frame_idx}: {rect_ids}")
-        
-        # Prepare frame processing tasks (with trim support)
+            if trace:
+                export_log.debug("Unique rectangleIds processed: %s", sorted(unique_rect_ids))
+                for frame_idx in sorted(precomputed_rectangles)[:10]:
+                    export_log.debug("  Frame %d: %s", frame_idx, list(precomputed_rectangles[frame_idx]))
+        
+        # Prepare frame processing tasks (frame_files already covers only the trim range)
         frame_tasks = []
         for frame_file in frame_files:
             # Extract frame index from filename (FFmpeg starts from 1, but UI uses 0-based)
             ffmpeg_frame_number = int(frame_file.split('_')[1].split('.')[0])
             ui_frame_index = ffmpeg_frame_number - 1  # Convert to 0-based indexing for UI
             
-            # Apply trim filtering
-            if trim_start_frame is not None and ui_frame_index < trim_start_frame:
-                continue  # Skip frames before trim start
-            if trim_end_frame is not None and ui_frame_index > trim_end_frame:
-                continue  # Skip frames after trim end
-            
             original_frame_path = os.path.join(video_frames_folder, frame_file)
             blurred_frame_path = os.path.join(blurred_frames_folder, frame_file)
             
@@ -1005,8 +3013,8 @@ def export_blurred_async(job_id, data):
         if trim_start_frame is not None or trim_end_frame is not None:
             start_info = f"frame {trim_start_frame}" if trim_start_frame is not None else "start"
             end_info = f"frame {trim_end_frame}" if trim_end_frame is not None else "end"
-            print(f"Trimming enabled: {start_info} → {end_info}")
-            print(f"Processing {len(frame_tasks)} frames (trimmed from {len(frame_files)} total frames)")
+            export_log.info("Trimming enabled: %s → %s, processing %d frames (%d-%d)",
+                            start_info, end_info, len(frame_tasks), range_start, max_frame)
         
         # Process frames with multithreading and progress tracking
         processing_start_time = time.time()
@@ -1014,93 +3022,201 @@ def export_blurred_async(job_id, data):
         # Check if job was cancelled before starting
         with jobs_lock:
             if job_id in jobs and jobs[job_id]['cancelled']:
-                print(f"Job {job_id} was cancelled before frame processing")
+                export_log.info("Job %s was cancelled before frame processing", job_id)
                 return
         
-        # Process frames using multithreading
-        success = process_frames_multithreaded(frame_tasks, job_id, max_workers=4)
+        profiler.begin('checkpoint_scan')
+        # Split the work into checkpointed chunks. Blurred frames left by an earlier
+        # (or interrupted) export are reused when the source frame, rectangle
+        # geometry and blur radius are unchanged, so only affected frames are redrawn
+        chunks = build_export_chunks(frame_tasks, precomputed_rectangles, blur_radius)
+        checkpoint = load_export_checkpoint(blurred_frames_folder)
+        full_render = data.get('force_full_render', False)
+        
+        def record_chunk_checkpoint(chunk_start):
+            chunk = chunks[chunk_start]
+            checkpoint['chunks'][str(chunk_start)] = {
+                'start': chunk['start'],
+                'end': chunk['end'],
+                'rect_hash': chunk['rect_hash'],
+                'blur_radius': blur_radius,
+                'frame_hashes': chunk['frame_hashes'],
+                'completed_at': time.time()
+            }
+            save_export_checkpoint(blurred_frames_folder, checkpoint)
+        
+        skipped_frames = 0
+        pending_tasks = []
+        reusable_chunks = []
+        for chunk_start, chunk in sorted(chunks.items()):
+            if not full_render and is_chunk_checkpointed(checkpoint, chunk_start, chunk, blur_radius):
+                skipped_frames += len(chunk['tasks'])
+                continue
+            stale_tasks = chunk['tasks'] if full_render else find_stale_frame_tasks(checkpoint, chunk_start, chunk)
+            skipped_frames += len(chunk['tasks']) - len(stale_tasks)
+            if not stale_tasks:
+                # Every frame is reusable but the chunk's range changed (e.g. a new trim)
+                reusable_chunks.append(chunk_start)
+                continue
+            # Forget the old checkpoint before rewriting the chunk's frames
+            checkpoint['chunks'].pop(str(chunk_start), None)
+            pending_tasks.extend(stale_tasks)
+        save_export_checkpoint(blurred_frames_folder, checkpoint)
+        for chunk_start in reusable_chunks:
+            record_chunk_checkpoint(chunk_start)
+        
+        if skipped_frames:
+            export_log.info("Reusing %s previously blurred frames, %s frames to render", skipped_frames, len(pending_tasks))
+            with jobs_lock:
+                if job_id in jobs:
+                    jobs[job_id]['reused_frames'] = skipped_frames
         
-        if not success:
+        # Get original video properties (cached after the first probe of this file)
+        profiler.begin('probe')
+        metadata = probe_video(original_video_path)
+        if not metadata:
             with jobs_lock:
                 if job_id in jobs:
-                    if jobs[job_id]['cancelled']:
-                        jobs[job_id]['status'] = 'cancelled'
-                        jobs[job_id]['message'] = 'Export cancelled by user'
-                    else:
-                        jobs[job_id]['status'] = 'error'
-                        jobs[job_id]['message'] = 'Error during frame processing'
+                    jobs[job_id]['status'] = 'error'
+                    jobs[job_id]['error'] = 'No video stream found'
             return
-        
-        # Get original video properties
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', original_video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        
-        video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
-        audio_stream = next((s for s in info['streams'] if s['codec_type'] == 'audio'), None)
-        
-        if not video_stream:
-            return jsonify({'error': 'No video stream found'}), 400
+        has_audio = metadata.has_audio
         
         # Build FFmpeg command to recreate video with same settings
         frame_pattern = os.path.join(blurred_frames_folder, 'frame_%06d.jpg')
+        frame_rate = EXTRACTION_FRAME_RATE  # The rate the frame sequence was extracted at
+        
+        # Video encoding settings shared by the single-pass and chunked encoders
+        encode_args = [
+            '-c:v', video_codec,  # Use selected codec
+            '-pix_fmt', metadata.pix_fmt,  # Use original pixel format
+        ]
+        if metadata.video_bit_rate:
+            encode_args.extend(['-b:v', metadata.video_bit_rate])
         
         cmd = [
             'ffmpeg', '-y',  # Overwrite output file
-            '-framerate', str(eval(video_stream['r_frame_rate'])),  # Use original framerate
+            '-framerate', str(frame_rate),  # Play the sequence back at its extraction rate
+            '-start_number', str(range_start + 1),  # First frame of the range
             '-i', frame_pattern,  # Input frame pattern
         ]
         
-        # Add audio if it exists
-        if audio_stream:
-            print(f"Found audio stream: {audio_stream.get('codec_name', 'unknown')} - copying to output")
-            cmd.extend(['-i', original_video_path])  # Add original video as audio source
+        # Audio is seeked to the range start and cut to the range duration
+        audio_input_args = None
+        if has_audio:
+            export_log.info("Found audio stream: %s - copying to output", metadata.audio_codec)
+            audio_input_args = [
+                '-ss', f'{frame_time(range_start):.6f}',
+                '-t', f'{frame_time(total_frames):.6f}',
+                '-i', original_video_path  # Add original video as audio source
+            ]
+            cmd.extend(audio_input_args)
             cmd.extend(['-c:a', 'copy'])  # Copy audio codec (no re-encoding)
             cmd.extend(['-map', '0:v:0', '-map', '1:a:0'])  # Map video from frames, audio from original
         else:
-            print("No audio stream found in original video")
+            export_log.info("No audio stream found in original video")
         
         # Video encoding settings - use selected codec
-        cmd.extend([
-            '-c:v', video_codec,  # Use selected codec
-            '-pix_fmt', video_stream.get('pix_fmt', 'yuv420p'),  # Use original pixel format
-        ])
-        
-        # Add bitrate if available
-        if 'bit_rate' in video_stream:
-            cmd.extend(['-b:v', video_stream['bit_rate']])
+        cmd.extend(encode_args)
+        cmd.extend(['-frames:v', str(total_frames)])  # Encoded duration equals the trim
         
         cmd.append(export_video_path)
         
-        # Update job status for FFmpeg encoding
-        with jobs_lock:
-            if job_id in jobs:
-                jobs[job_id]['status'] = 'encoding'
-                jobs[job_id]['progress'] = 80
-                jobs[job_id]['encoding_progress'] = 0
+        chunked = data.get('encode_mode') == 'chunked'
+        if chunked:
+            # Process frames using multithreading
+            profiler.begin('blur')
+            success = process_frames_multithreaded(pending_tasks, job_id, max_workers=4,
+                                                   already_processed=skipped_frames,
+                                                   on_chunk_done=record_chunk_checkpoint,
+                                                   profiler=profiler)
+        
+            if not success:
+                with jobs_lock:
+                    if job_id in jobs:
+                        if jobs[job_id]['cancelled']:
+                            jobs[job_id]['status'] = 'cancelled'
+                            jobs[job_id]['message'] = 'Export cancelled by user'
+                        else:
+                            jobs[job_id]['status'] = 'error'
+                            jobs[job_id]['message'] = 'Error during frame processing'
+                return
         
         # Execute FFmpeg command with progress monitoring
         ffmpeg_start_time = time.time()
-        stdout, stderr = run_ffmpeg_with_progress(cmd, job_id, total_frames, eval(video_stream['r_frame_rate']))
+        if chunked:
+            # Update job status for FFmpeg encoding
+            with jobs_lock:
+                if job_id in jobs:
+                    jobs[job_id]['status'] = 'encoding'
+                    jobs[job_id]['progress'] = 80
+                    jobs[job_id]['encoding_progress'] = 0
+            
+            # Encode chunks in parallel, then join them and mux the audio once
+            profiler.begin('encode')
+            segments_folder = os.path.join(blurred_frames_folder, 'segments')
+            segment_paths, reused_segments = encode_chunks_parallel(
+                job_id, chunks, frame_pattern, segments_folder, frame_rate, encode_args,
+                checkpoint, blurred_frames_folder)
+            if segment_paths is None:
+                finish_cancelled_job(job_id, 'Export cancelled by user')
+                return
+            profiler.begin('mux')
+            if not concat_segments(segment_paths, export_video_path, audio_input_args, job_id):
+                finish_cancelled_job(job_id, 'Export cancelled by user', [export_video_path])
+                return
+            with jobs_lock:
+                if job_id in jobs:
+                    jobs[job_id]['reused_segments'] = reused_segments
+        else:
+            # Blur and encode concurrently: the encoder reads blurred frames from
+            # stdin in order while later frames are still being blurred (audio is
+            # muxed by the same ffmpeg process, so there is no separate mux stage)
+            profiler.begin('blur_encode')
+            pipe_cmd = ['ffmpeg', '-y', '-f', 'image2pipe', '-c:v', 'mjpeg',
+                        '-framerate', str(frame_rate), '-i', 'pipe:0'] + cmd[cmd.index(frame_pattern) + 1:]
+            frame_source = pipelined_blurred_frames(frame_tasks, pending_tasks, job_id, max_workers=4,
+                                                    on_chunk_done=record_chunk_checkpoint,
+                                                    profiler=profiler)
+            
+            def pipeline_progress(event):
+                if event.frame is None:
+                    return
+                encoding_progress = min(100, (event.frame / len(frame_tasks)) * 100) if frame_tasks else 100
+                with jobs_lock:
+                    if job_id in jobs and not jobs[job_id]['cancelled']:
+                        jobs[job_id]['encoding_progress'] = encoding_progress
+                        jobs[job_id]['encoding_frame'] = event.frame
+                        jobs[job_id]['encoding_speed'] = format_ffmpeg_speed(event)
+                        jobs[job_id]['encoding_bitrate'] = format_ffmpeg_bitrate(event)
+                        jobs[job_id]['progress'] = encoding_progress * 0.98
+            
+            stdout, stderr = run_ffmpeg_with_progress(pipe_cmd, job_id, len(frame_tasks), frame_rate,
+                                                      progress_callback=pipeline_progress,
+                                                      frame_source=frame_source)
+            if stdout is None:
+                # Don't leave a truncated video behind
+                finish_cancelled_job(job_id, 'Export cancelled by user', [export_video_path])
+                return
         ffmpeg_time = time.time() - ffmpeg_start_time
-        print(f"FFmpeg export completed in {ffmpeg_time:.2f}s")
         
         # Final performance report
         total_export_time = time.time() - export_start_time
         final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        
-        print("\n=== EXPORT PERFORMANCE SUMMARY ===")
-        print(f"Total export time: {total_export_time:.2f}s")
-        print(f"Frame processing time: {time.time() - processing_start_time - ffmpeg_time:.2f}s")
-        print(f"FFmpeg encoding time: {ffmpeg_time:.2f}s")
-        print(f"Memory usage: Initial={initial_memory:.2f}MB, Final={final_memory:.2f}MB, Peak increase={final_memory - initial_memory:.2f}MB")
-        print("=================================\n")
+        frame_processing_time = time.time() - processing_start_time - ffmpeg_time
+        export_log.info(
+            "Export %s finished in %.2fs (frame processing %.2fs, ffmpeg %.2fs), memory %.2fMB → %.2fMB",
+            job_id, total_export_time, frame_processing_time, ffmpeg_time, initial_memory, final_memory,
+            extra={'job_id': job_id, 'total_seconds': round(total_export_time, 3),
+                   'frame_processing_seconds': round(frame_processing_time, 3), 'ffmpeg_seconds': round(ffmpeg_time, 3),
+                   'initial_memory_mb': round(initial_memory, 2), 'final_memory_mb': round(final_memory, 2)}
+        )
         
         # Build success message
-        audio_info = " (with audio)" if audio_stream else " (video only - no audio in original)"
+        audio_info = " (with audio)" if has_audio else " (video only - no audio in original)"
         success_message = f'Video exported with blur effect{audio_info}: {export_video_name}'
+        if skipped_frames:
+            success_message += f' ({skipped_frames} unchanged frames reused)'
         
         # Update job status to completed
         with jobs_lock:
@@ -1110,12 +3226,18 @@ def export_blurred_async(job_id, data):
                 jobs[job_id]['export_path'] = export_video_path
                 jobs[job_id]['filename'] = export_video_name
                 jobs[job_id]['message'] = success_message
-                jobs[job_id]['has_audio'] = bool(audio_stream)
+                jobs[job_id]['has_audio'] = has_audio
                 jobs[job_id]['total_time'] = total_export_time
         
+        # The saved request is only needed to resume an unfinished export
+        try:
+            os.unlink(export_request_path(job_id))
+        except OSError:
+            pass
+        
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr
-        print(f"FFmpeg error: {error_msg}")
+        export_log.error("FFmpeg error: %s", error_msg)
         
         with jobs_lock:
             if job_id in jobs:
@@ -1123,24 +3245,40 @@ def export_blurred_async(job_id, data):
                 jobs[job_id]['error'] = f'FFmpeg error: {error_msg}'
         
         # If there's an audio-related error, try without audio
-        if audio_stream and ('audio' in error_msg.lower() or 'stream' in error_msg.lower()):
-            print("Retrying export without audio due to audio stream error...")
+        if has_audio and ('audio' in error_msg.lower() or 'stream' in error_msg.lower()):
+            export_log.warning("Retrying export without audio due to audio stream error")
             try:
                 # Retry without audio
-                cmd_no_audio = [
-                    'ffmpeg', '-y',
-                    '-framerate', str(eval(video_stream['r_frame_rate'])),
-                    '-i', frame_pattern,
-                    '-c:v', video_codec,  # Use selected codec
-                    '-pix_fmt', video_stream.get('pix_fmt', 'yuv420p'),
-                ]
-                
-                if 'bit_rate' in video_stream:
-                    cmd_no_audio.extend(['-b:v', video_stream['bit_rate']])
-                
+                profiler.begin('encode_retry')
+                frame_source = None
+                if chunked:
+                    cmd_no_audio = [
+                        'ffmpeg', '-y',
+                        '-framerate', str(frame_rate),
+                        '-start_number', str(range_start + 1),
+                        '-i', frame_pattern,
+                        '-frames:v', str(total_frames),
+                    ]
+                else:
+                    # The pipeline stopped with ffmpeg, so re-render chunks it never finished
+                    unfinished_tasks = [task for task in pending_tasks
+                                        if not is_chunk_checkpointed(checkpoint, chunk_start_for_frame(task[2]),
+                                                                     chunks[chunk_start_for_frame(task[2])], blur_radius)]
+                    frame_source = pipelined_blurred_frames(frame_tasks, unfinished_tasks, job_id, max_workers=4,
+                                                            on_chunk_done=record_chunk_checkpoint,
+                                                            profiler=profiler)
+                    cmd_no_audio = [
+                        'ffmpeg', '-y', '-f', 'image2pipe', '-c:v', 'mjpeg',
+                        '-framerate', str(frame_rate), '-i', 'pipe:0',
+                    ]
+                cmd_no_audio.extend(encode_args)
                 cmd_no_audio.append(export_video_path)
                 
-                stdout, stderr = run_ffmpeg_with_progress(cmd_no_audio, job_id, total_frames, eval(video_stream['r_frame_rate']))
+                stdout, stderr = run_ffmpeg_with_progress(cmd_no_audio, job_id, total_frames, frame_rate,
+                                                          frame_source=frame_source)
+                if stdout is None:
+                    finish_cancelled_job(job_id, 'Export cancelled by user', [export_video_path])
+                    return
                 
                 with jobs_lock:
                     if job_id in jobs:
@@ -1159,11 +3297,13 @@ def export_blurred_async(job_id, data):
                         jobs[job_id]['error'] = f'FFmpeg error (retry failed): {retry_error.stderr}'
         
     except Exception as e:
-        print(f"Export error: {str(e)}")
+        export_log.exception("Export error: %s", e)
         with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]['status'] = 'error'
                 jobs[job_id]['error'] = f'Export error: {str(e)}'
+    finally:
+        save_job_profile(profiler)
 
 @app.route('/export_blurred', methods=['POST'])
 def export_blurred():
@@ -1173,6 +3313,14 @@ def export_blurred():
     # Generate unique job ID
     job_id = str(uuid.uuid4())
     
+    return start_export_job(job_id, data)
+
+def start_export_job(job_id, data, resumed_from=None):
+    """Register and queue an export job, keeping its request on disk for resuming"""
+    expire_export_requests()
+    with open(export_request_path(job_id), 'w') as f:
+        json.dump(data, f)
+    
     # Initialize job tracking
     with jobs_lock:
         jobs[job_id] = {
@@ -1181,22 +3329,43 @@ def export_blurred():
             'progress': 0,
             'message': 'Starting export...',
             'cancelled': False,
+            'job_type': 'export',
+            'resumed_from': resumed_from,
             'created_at': time.time()
         }
     
-    # Start export in background thread
-    thread = threading.Thread(target=export_blurred_async, args=(job_id, data))
-    thread.daemon = True
-    thread.start()
+    # Queue export on the job scheduler
+    job_scheduler.submit(job_id, 'export', export_blurred_async, (job_id, data))
     
     return jsonify({'job_id': job_id, 'message': 'Export started'})
 
+@app.route('/resume_export/<job_id>', methods=['POST'])
+def resume_export(job_id):
+    """Restart an unfinished export, reusing frames completed with unchanged inputs"""
+    request_path = export_request_path(job_id)
+    if not os.path.exists(request_path):
+        return jsonify({'error': 'No resumable export found for this job'}), 404
+    
+    with jobs_lock:
+        if job_id in jobs and jobs[job_id].get('status') not in TERMINAL_JOB_STATUSES:
+            return jsonify({'error': 'Export is still running'}), 409
+    
+    with open(request_path, 'r') as f:
+        data = json.load(f)
+    
+    new_job_id = str(uuid.uuid4())
+    response = start_export_job(new_job_id, data, resumed_from=job_id)
+    os.unlink(request_path)
+    return response
+
 def preview_blurred_async(job_id, data):
     """Asynchronous preview function that runs in a separate thread"""
+    profiler = JobProfiler(job_id, 'preview')
+    profiler.begin('rect_precompute')
     try:
         video_name = data['video_name']
         blur_radius = data.get('blur_radius', 5)
-        video_codec = data.get('video_codec', 'libx264')
+        video_codec = resolve_video_codec(data.get('video_codec', 'libx264'))
         start_frame = data.get('start_frame', 0)
         end_frame = data.get('end_frame', 199)
         
@@ -1209,7 +3378,7 @@ def preview_blurred_async(job_id, data):
                 return
             jobs[job_id]['status'] = 'initializing'
         
-        print(f"Creating preview from frame {start_frame} to {end_frame} ({end_frame - start_frame + 1} frames)")
+        export_log.info("Creating preview from frame %s to %s (%s frames)", start_frame, end_frame, end_frame - start_frame + 1)
         
         # Get frames data
         frames_data = data.get('frames', [])
@@ -1234,7 +3403,7 @@ def preview_blurred_async(job_id, data):
             if frame_filename in all_frame_files:
                 preview_frame_files.append(frame_filename)
         
-        print(f"Processing {len(preview_frame_files)} preview frames")
+        export_log.debug("Processing %s preview frames", len(preview_frame_files))
         
         # Process events similar to full export
         active_rectangles = {}
@@ -1309,7 +3478,8 @@ def preview_blurred_async(job_id, data):
                 frame_tasks.append((original_frame_path, blurred_frame_path, ui_frame_index, precomputed_rectangles, blur_radius))
         
         # Process frames with multithreading
-        success = process_frames_multithreaded(frame_tasks, job_id, max_workers=4)
+        profiler.begin('blur')
+        success = process_frames_multithreaded(frame_tasks, job_id, max_workers=4, profiler=profiler)
         
         if not success:
             with jobs_lock:
@@ -1322,41 +3492,39 @@ def preview_blurred_async(job_id, data):
                         jobs[job_id]['message'] = 'Error during frame processing'
             return
         
-        # Get video properties
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', original_video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        
-        video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
-        audio_stream = next((s for s in info['streams'] if s['codec_type'] == 'audio'), None)
-        
-        if not video_stream:
-            return jsonify({'error': 'No video stream found'}), 400
+        # Get video properties (cached after the first probe of this file)
+        profiler.begin('probe')
+        metadata = probe_video(original_video_path)
+        if not metadata:
+            with jobs_lock:
+                if job_id in jobs:
+                    jobs[job_id]['status'] = 'error'
+                    jobs[job_id]['error'] = 'No video stream found'
+            return
+        frame_rate = EXTRACTION_FRAME_RATE  # The rate the frame sequence was extracted at
         
         # Build FFmpeg command for preview
         frame_pattern = os.path.join(blurred_frames_folder, 'frame_%06d.jpg')
         
         cmd = [
             'ffmpeg', '-y',
-            '-framerate', str(eval(video_stream['r_frame_rate'])),
+            '-framerate', str(frame_rate),
             '-start_number', str(start_frame + 1),  # Start from the first preview frame
             '-i', frame_pattern,
         ]
         
         # Add audio if it exists (extract only the preview portion)
-        if audio_stream:
-            start_time = start_frame / eval(video_stream['r_frame_rate'])
-            duration = (end_frame - start_frame + 1) / eval(video_stream['r_frame_rate'])
-            cmd.extend(['-ss', str(start_time), '-t', str(duration), '-i', original_video_path])
+        if metadata.has_audio:
+            start_time = frame_time(start_frame)
+            duration = frame_time(end_frame - start_frame + 1)
+            cmd.extend(['-ss', f'{start_time:.6f}', '-t', f'{duration:.6f}', '-i', original_video_path])
             cmd.extend(['-c:a', 'copy'])
             cmd.extend(['-map', '0:v:0', '-map', '1:a:0'])
         
         # Video encoding settings
         cmd.extend([
             '-c:v', video_codec,
-            '-pix_fmt', video_stream.get('pix_fmt', 'yuv420p'),
+            '-pix_fmt', metadata.pix_fmt,
         ])
         
         # Limit frames for preview
@@ -1371,10 +3539,14 @@ def preview_blurred_async(job_id, data):
                 jobs[job_id]['progress'] = 80
                 jobs[job_id]['encoding_progress'] = 0
         
-        # Execute FFmpeg command with progress monitoring
-        print(f"Executing preview FFmpeg command: {' '.join(cmd)}")
+        # Execute FFmpeg command with progress monitoring (audio is muxed in the same pass)
+        profiler.begin('encode')
+        ffmpeg_log.debug("Executing preview FFmpeg command: %s", ' '.join(cmd))
         preview_frames = len(frame_tasks)
-        stdout, stderr = run_ffmpeg_with_progress(cmd, job_id, preview_frames, eval(video_stream['r_frame_rate']))
+        stdout, stderr = run_ffmpeg_with_progress(cmd, job_id, preview_frames, frame_rate)
+        if stdout is None:
+            finish_cancelled_job(job_id, 'Preview cancelled by user', [preview_video_path])
+            return
         
         # Update job status to completed
         with jobs_lock:
@@ -1384,23 +3556,25 @@ def preview_blurred_async(job_id, data):
                 jobs[job_id]['export_path'] = preview_video_path
                 jobs[job_id]['filename'] = preview_video_name
                 jobs[job_id]['message'] = f'Preview created with {len(frame_tasks)} frames'
-                jobs[job_id]['has_audio'] = bool(audio_stream)
+                jobs[job_id]['has_audio'] = metadata.has_audio
                 jobs[job_id]['start_frame'] = start_frame
                 jobs[job_id]['end_frame'] = end_frame
                 jobs[job_id]['frame_count'] = len(frame_tasks)
         
     except subprocess.CalledProcessError as e:
-        print(f"FFmpeg error during preview: {e.stderr}")
+        export_log.error("FFmpeg error during preview: %s", e.stderr)
         with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]['status'] = 'error'
                 jobs[job_id]['error'] = f'FFmpeg error during preview: {e.stderr}'
     except Exception as e:
-        print(f"Preview error: {str(e)}")
+        export_log.exception("Preview error: %s", e)
         with jobs_lock:
             if job_id in jobs:
                 jobs[job_id]['status'] = 'error'
                 jobs[job_id]['error'] = f'Preview error: {str(e)}'
+    finally:
+        save_job_profile(profiler)
 
 @app.route('/preview_blurred', methods=['POST'])
 def preview_blurred():
@@ -1418,13 +3592,12 @@ def preview_blurred():
             'progress': 0,
             'message': 'Starting preview...',
             'cancelled': False,
+            'job_type': 'preview',
             'created_at': time.time()
         }
     
-    # Start preview in background thread
-    thread = threading.Thread(target=preview_blurred_async, args=(job_id, data))
-    thread.daemon = True
-    thread.start()
+    # Queue preview on the job scheduler
+    job_scheduler.submit(job_id, 'preview', preview_blurred_async, (job_id, data))
     
     return jsonify({'job_id': job_id, 'message': 'Preview started'})
 
@@ -1444,27 +3617,195 @@ def serve_preview(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Progress streaming (Server-Sent Events)
+PROGRESS_PUBLISH_INTERVAL = 0.5  # Seconds between job state scans while anyone is subscribed
+SSE_KEEPALIVE_SECONDS = 15
+SSE_SUBSCRIBER_QUEUE_SIZE = 200  # Slow clients beyond this are dropped and reconnect
+TRACKING_STREAM_ID = 'tracking'  # Pseudo job id for tracking_state on the all-jobs stream
+
+def compact_job_state(job):
+    """Scalar fields of a job for progress events, dropping lists/dicts"""
+    state = {key: value for key, value in job.items()
+             if value is None or isinstance(value, (str, int, float, bool))}
+    if job.get('status') != 'queued' and job.get('status') not in TERMINAL_JOB_STATUSES:
+        eta = estimate_job_eta(job)
+        state['eta_seconds'] = round(eta) if eta is not None else None
+    return state
+
+class ProgressBroker:
+    """Scans job state from one thread and pushes compact deltas to subscribers
+    
+    However many streams are open, jobs_lock is taken once per interval; each
+    subscriber only receives the fields that changed since the last scan.
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._subscribers = {}  # queue -> job_id filter (None for all jobs)
+        self._lock = Lock()
+        self._has_subscribers = threading.Event()
+        self._last_states = {}
+        threading.Thread(target=self._publish_loop, name='progress-broker', daemon=True).start()
+    
+    def current_states(self, job_id=None):
+        """Full compact state of one job or of every in-memory job (plus tracking)"""
+        if job_id is not None:
+            job = get_job_snapshot(job_id)
+            return {job_id: compact_job_state(job)} if job else {}
+        with jobs_lock:
+            states = {jid: compact_job_state(job) for jid, job in jobs.items()}
+        states[TRACKING_STREAM_ID] = compact_job_state(dict(tracking_state, job_type='tracking'))
+        return states
+    
+    def subscribe(self, job_id=None):
+        subscriber = queue.Queue(maxsize=SSE_SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[subscriber] = job_id
+            self._has_subscribers.set()
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.pop(subscriber, None)
+            if not self._subscribers:
+                self._has_subscribers.clear()
+    
+    def _publish_loop(self):
+        while True:
+            if not self._has_subscribers.is_set():
+                self._last_states = {}  # Nobody listening; start fresh on the next subscribe
+                self._has_subscribers.wait()
+            time.sleep(self.interval)
+            
+            states = self.current_states()
+            deltas = {}
+            for jid, state in states.items():
+                previous = self._last_states.get(jid, {})
+                changes = {key: value for key, value in state.items() if previous.get(key) != value}
+                if changes:
+                    deltas[jid] = changes
+            self._last_states = states
+            if not deltas:
+                continue
+            
+            with self._lock:
+                subscribers = list(self._subscribers.items())
+            for subscriber, job_filter in subscribers:
+                for jid, changes in deltas.items():
+                    if job_filter is not None and jid != job_filter:
+                        continue
+                    try:
+                        subscriber.put_nowait((jid, changes))
+                    except queue.Full:
+                        # Drop the slow client; EventSource reconnects and gets a fresh snapshot
+                        self.unsubscribe(subscriber)
+                        self._discard_pending(subscriber)
+                        subscriber.put_nowait(None)
+                        break
+    
+    @staticmethod
+    def _discard_pending(subscriber):
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                return
+
+progress_broker = ProgressBroker(PROGRESS_PUBLISH_INTERVAL)
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_job_events(job_id=None):
+    """SSE generator: a full snapshot first, then deltas as they happen"""
+    subscriber = progress_broker.subscribe(job_id)
+    try:
+        states = progress_broker.current_states(job_id)
+        if job_id is not None and not states:
+            yield format_sse('end', {'job_id': job_id, 'error': 'Job not found'})
+            return
+        for jid, state in states.items():
+            yield format_sse('progress', {'job_id': jid, 'changes': state})
+            if job_id is not None and state.get('status') in TERMINAL_JOB_STATUSES:
+                yield format_sse('end', {'job_id': jid})
+                return
+        
+        while True:
+            try:
+                item = subscriber.get(timeout=SSE_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if item is None:
+                return  # Dropped for falling behind
+            jid, changes = item
+            yield format_sse('progress', {'job_id': jid, 'changes': changes})
+            if job_id is not None and changes.get('status') in TERMINAL_JOB_STATUSES:
+                yield format_sse('end', {'job_id': jid})
+                return
+    finally:
+        progress_broker.unsubscribe(subscriber)
+
+def sse_response(events):
+    return Response(events, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/job_events/<job_id>')
+def job_events(job_id):
+    """Stream progress of one job as Server-Sent Events"""
+    return sse_response(stream_job_events(job_id))
+
+@app.route('/job_events')
+def all_job_events():
+    """Stream progress deltas of every job (and tracking) on one connection"""
+    return sse_response(stream_job_events())
+
 @app.route('/export_progress/<job_id>')
 def get_export_progress(job_id):
     """Get progress of an export job"""
-    with jobs_lock:
-        if job_id in jobs:
-            job = jobs[job_id].copy()
-            return jsonify(job)
-        else:
-            return jsonify({'error': 'Job not found'}), 404
+    job = get_job_snapshot(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/interrupted_jobs')
+def interrupted_jobs():
+    """List jobs that were still running when the server last stopped"""
+    return jsonify(jobs.backend.load_by_status('interrupted'))
+
+@app.route('/scheduler_status')
+def scheduler_status():
+    """Return job scheduler limits, running counts and queue"""
+    return jsonify(job_scheduler.status())
+
+@app.route('/job_profile/<job_id>')
+def job_profile(job_id):
+    """Download the stage timing and resource profile recorded for a job"""
+    path = profile_path(job_id)
+    if not os.path.exists(path):
+        return jsonify({'error': 'No profile recorded for this job'}), 404
+    return send_file(path, as_attachment=True, download_name=f'profile_{job_id}.json', mimetype='application/json')
 
 @app.route('/cancel_export/<job_id>', methods=['POST'])
+@app.route('/cancel_extraction/<job_id>', methods=['POST'])
 def cancel_export(job_id):
-    """Cancel an export job"""
+    """Cancel an export, preview or extraction job that has not finished"""
     with jobs_lock:
         if job_id in jobs:
+            status = jobs[job_id].get('status')
+            if status in TERMINAL_JOB_STATUSES:
+                return jsonify({'error': f'Job already {status}', 'status': status}), 409
             jobs[job_id]['cancelled'] = True
             jobs[job_id]['status'] = 'cancelled'
-            print(f"Job {job_id} marked for cancellation")
-            return jsonify({'success': True, 'message': 'Job cancellation requested'})
+            jobs[job_id]['resources_released'] = False
         else:
             return jsonify({'error': 'Job not found'}), 404
+    
+    # Stop running ffmpeg children now; the worker removes partial outputs and
+    # resources_released turns true once it has returned
+    terminated = terminate_job_processes(job_id)
+    jobs_log.info("Job %s marked for cancellation (%s processes terminated)", job_id, terminated)
+    return jsonify({'success': True, 'message': 'Job cancellation requested', 'terminated_processes': terminated})
 
 
 @app.route('/save_rectangles', methods=['POST'])
@@ -1473,11 +3814,7 @@ def save_rectangles():
     video_name = data['video_name']
     all_frame_rectangles = data.get('all_frame_rectangles', {})
     
-    print(f"=== SAVE RECTANGLES DEBUG ===")
-    print(f"Video name: {video_name}")
-    print(f"Auto-save: {data.get('auto_save', False)}")
-    print(f"Received frame rectangles: {all_frame_rectangles}")
-    print(f"Number of frames with data: {len(all_frame_rectangles)}")
+    trace = rectangles_log.isEnabledFor(logging.DEBUG)
     
     # Create rectangles data structure with events
     rectangles_data = {
@@ -1496,7 +3833,8 @@ def save_rectangles():
             'events': []
         }
         
-        print(f"Frame {frame_index}: {len(rectangles)} rectangles")
+        if trace:
+            rectangles_log.debug("Frame %s: %d rectangles", frame_index, len(rectangles))
         
         for i, rect in enumerate(rectangles):
             # Check if this is a removal marker
@@ -1506,7 +3844,8 @@ def save_rectangles():
                     'eventType': 'rectangleDeleted',
                     'rectangleId': rect.get('removesRect', None)
                 }
-                print(f"  Rectangle deleted: {event_data['rectangleId']}")
+                if trace:
+                    rectangles_log.debug("  Rectangle deleted: %s", event_data['rectangleId'])
             elif rect.get('rectangleMoved', False):
                 # Handle rectangleMoved event
                 event_data = {
@@ -1517,7 +3856,8 @@ def save_rectangles():
                     'width': rect['width'],
                     'height': rect['height']
                 }
-                print(f"  Rectangle moved: {event_data['rectangleId']} to x={rect['x']}, y={rect['y']}")
+                if trace:
+                    rectangles_log.debug("  Rectangle moved: %s to x=%s, y=%s", event_data['rectangleId'], rect['x'], rect['y'])
             elif rect.get('rectangleResized', False):
                 # Handle rectangleResized event
                 event_data = {
@@ -1528,7 +3868,8 @@ def save_rectangles():
                     'width': rect['width'],
                     'height': rect['height']
                 }
-                print(f"  Rectangle resized: {event_data['rectangleId']} to w={rect['width']}, h={rect['height']}")
+                if trace:
+                    rectangles_log.debug("  Rectangle resized: %s to w=%s, h=%s", event_data['rectangleId'], rect['width'], rect['height'])
             else:
                 # Handle rectangleCreated event
                 # Use the rectangleId from the rectangle data, or generate one if missing
@@ -1541,7 +3882,8 @@ def save_rectangles():
                     'width': rect['width'],
                     'height': rect['height']
                 }
-                print(f"  Rectangle created: {rect_id} at x={rect['x']}, y={rect['y']}")
+                if trace:
+                    rectangles_log.debug("  Rectangle created: %s at x=%s, y=%s", rect_id, rect['x'], rect['y'])
             
             frame_data['events'].append(event_data)
         
@@ -1554,38 +3896,86 @@ def save_rectangles():
     filename = f"rectangles_{video_name.split('.')[0]}.json"
     filepath = os.path.join(EXPORT_FOLDER, filename)
     
-    print(f"Saving to: {filepath}")
-    print(f"Total frames: {len(rectangles_data['frames'])}")
-    print(f"Total events: {sum(len(frame['events']) for frame in rectangles_data['frames'])}")
-    print("============================")
+    total_events = sum(len(frame['events']) for frame in rectangles_data['frames'])
     
     try:
         with open(filepath, 'w') as f:
             json.dump(rectangles_data, f, indent=2)
         
+        rectangles_log.info("Saved %d frames / %d events for %s to %s%s", len(rectangles_data['frames']), total_events,
+                            video_name, filepath, ' (auto-save)' if data.get('auto_save') else '')
         return jsonify({
             'success': True,
             'filename': filename,
             'filepath': filepath,
             'total_frames': len(rectangles_data['frames']),
-            'total_events': sum(len(frame['events']) for frame in rectangles_data['frames'])
+            'total_events': total_events
         })
     
     except Exception as e:
-        print(f"Save error: {str(e)}")
+        rectangles_log.error("Save error: %s", e)
         return jsonify({'error': f'Failed to save rectangles: {str(e)}'}), 500
 
+# Tracking frame decode
+# Tracking decodes frames straight to grayscale, at half or quarter size inside the
+# JPEG decoder when the tracked rectangle and its text stay large enough, and maps
+# positions back to full-resolution coordinates. 'auto' picks the largest scale
+# within the limits below; VIDEOEDITOR_TRACKING_DECODE_SCALE or a request's
+# decode_scale can force 1, 2 or 4.
+TRACKING_DECODE_SCALE = os.environ.get('VIDEOEDITOR_TRACKING_DECODE_SCALE', 'auto')
+TRACKING_DECODE_SCALES = (4, 2, 1)
+TRACKING_MIN_TEXT_HEIGHT = 16  # Decoded pixels of the smallest tracked text line
+TRACKING_MIN_TEMPLATE_SIDE = 24  # Decoded pixels of the rectangle's shorter side
+TRACKING_MIN_FRAME_HEIGHT = 540  # Never decode frames smaller than this
+TRACKING_TEMPLATE_REFRESH_BELOW = 0.85  # At reduced scale the template is only re-cut once matches drop below this
+
+def read_tracking_frame(path, scale=1):
+    """Decode a frame as grayscale, reduced by scale (1, 2 or 4) in the JPEG decoder"""
+    flags = {
+        1: cv2.IMREAD_GRAYSCALE,
+        2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+        4: cv2.IMREAD_REDUCED_GRAYSCALE_4
+    }[scale]
+    return cv2.imread(path, flags)
+
+def parse_decode_scale(value):
+    """Decode scale from a request or the environment: None for auto, else 1, 2 or 4"""
+    if value is None or str(value).lower() == 'auto':
+        return None
+    scale = int(value)
+    if scale not in TRACKING_DECODE_SCALES:
+        raise ValueError(f'decode_scale must be auto, 1, 2 or 4, got {value!r}')
+    return scale
+
+def choose_tracking_scale(frame_height, rect_w, rect_h, target_texts):
+    """Largest decode scale that keeps the frame, rectangle and tracked text readable"""
+    text_heights = [max(point[1] for point in t['bbox']) - min(point[1] for point in t['bbox']) for t in target_texts]
+    for scale in TRACKING_DECODE_SCALES:
+        if (frame_height / scale >= TRACKING_MIN_FRAME_HEIGHT and
+                min(rect_w, rect_h) / scale >= TRACKING_MIN_TEMPLATE_SIDE and
+                all(height / scale >= TRACKING_MIN_TEXT_HEIGHT for height in text_heights)):
+            return scale
+    return 1
+
+def refine_match_peak(result, loc):
+    """Sub-pixel peak of a matchTemplate result, from a parabola fitted along each axis"""
+    def offset(before, peak, after):
+        curvature = before - 2 * peak + after
+        return 0.5 * (before - after) / curvature if curvature < 0 else 0.0
+    x, y = loc
+    dx = offset(result[y, x - 1], result[y, x], result[y, x + 1]) if 0 < x < result.shape[1] - 1 else 0.0
+    dy = offset(result[y - 1, x], result[y, x], result[y + 1, x]) if 0 < y < result.shape[0] - 1 else 0.0
+    return x + float(dx), y + float(dy)
+
 def extract_text_from_region(image, x, y, w, h):
     """Extract text from a specific region of an image using OCR"""
     try:
         # Extract the region
         region = image[y:y+h, x:x+w]
         
-        # Get OCR reader
-        reader = get_ocr_reader()
-        
         # Perform OCR
-        results = reader.readtext(region)
+        with metric_ocr_latency.time(kind='region'):
+            results = ocr_readtext(region)
         
         # Extract text with confidence
         texts = []
@@ -1599,20 +3989,20 @@ def extract_text_from_region(image, x, y, w, h):
         
         return texts
     except Exception as e:
-        print(f"OCR error: {e}")
+        tracking_log.error("OCR error: %s", e)
         return []
 
-def find_all_text_in_frame(image):
-    """Find all text elements in the entire frame"""
+def find_all_text_in_frame(image, scale=1):
+    """Find all text elements in the entire frame, in full-resolution coordinates for a frame decoded at 1/scale"""
     try:
-        reader = get_ocr_reader()
-        results = reader.readtext(image)
+        with metric_ocr_latency.time(kind='full_frame'):
+            results = ocr_readtext(image)
         
         text_elements = []
         for (bbox, text, confidence) in results:
             if confidence > 0.5:  # Only keep confident results
                 # Calculate bounding box
-                bbox_array = np.array(bbox)
+                bbox_array = np.array(bbox) * scale
                 x_coords = bbox_array[:, 0]
                 y_coords = bbox_array[:, 1]
                 
@@ -1631,7 +4021,7 @@ def find_all_text_in_frame(image):
         
         return text_elements
     except Exception as e:
-        print(f"Full frame OCR error: {e}")
+        tracking_log.error("Full frame OCR error: %s", e)
         return []
 
 def find_matching_texts(frame_texts, target_texts, similarity_threshold=70):
@@ -1663,9 +4053,14 @@ def find_matching_texts(frame_texts, target_texts, similarity_threshold=70):
     
     return matches
 
-def scan_rectangle_area(image, x, y, w, h, padding=10):
-    """Scan a specific rectangle area with optional padding"""
+def scan_rectangle_area(image, x, y, w, h, padding=10, scale=1):
+    """Scan a specific rectangle area with optional padding
+
+    Coordinates in and out are full resolution; image may be decoded at 1/scale.
+    """
     try:
+        x, y, w, h, padding = (value // scale for value in (x, y, w, h, padding))
+        
         # Add padding around the rectangle
         padded_x = max(0, x - padding)
         padded_y = max(0, y - padding)
@@ -1676,16 +4071,16 @@ def scan_rectangle_area(image, x, y, w, h, padding=10):
         region = image[padded_y:padded_y+padded_h, padded_x:padded_x+padded_w]
         
         # Run OCR on the region
-        reader = get_ocr_reader()
-        results = reader.readtext(region)
+        with metric_ocr_latency.time(kind='rectangle_area'):
+            results = ocr_readtext(region)
         
         text_elements = []
         for (bbox, text, confidence) in results:
             if confidence > 0.5:
                 # Calculate bounding box relative to original image
                 bbox_array = np.array(bbox)
-                x_coords = bbox_array[:, 0] + padded_x  # Adjust for region offset
-                y_coords = bbox_array[:, 1] + padded_y  # Adjust for region offset
+                x_coords = (bbox_array[:, 0] + padded_x) * scale  # Adjust for region offset and decode scale
+                y_coords = (bbox_array[:, 1] + padded_y) * scale
                 
                 text_elements.append({
                     'text': text.strip(),
@@ -1702,7 +4097,7 @@ def scan_rectangle_area(image, x, y, w, h, padding=10):
         
         return text_elements
     except Exception as e:
-        print(f"Rectangle area OCR error: {e}")
+        tracking_log.error("Rectangle area OCR error: %s", e)
         return []
 
 def check_all_targets_found(matches, target_texts, coverage_threshold=0.8):
@@ -1759,8 +4154,6 @@ def stabilize_rectangle_position(new_rect, current_rect, stability_threshold=3):
 def find_text_in_frame(image, target_texts, search_area=None):
     """Find similar text in a frame and return the best match location"""
     try:
-        reader = get_ocr_reader()
-        
         # If search area is specified, crop the image
         if search_area:
             x, y, w, h = search_area
@@ -1781,7 +4174,8 @@ def find_text_in_frame(image, target_texts, search_area=None):
             offset_x, offset_y = 0, 0
         
         # Perform OCR on search area
-        results = reader.readtext(search_image)
+        with metric_ocr_latency.time(kind='text_search'):
+            results = ocr_readtext(search_image)
         
         best_match = None
         best_score = 0
@@ -1825,7 +4219,7 @@ def find_text_in_frame(image, target_texts, search_area=None):
         
         return best_match
     except Exception as e:
-        print(f"Text search error: {e}")
+        tracking_log.error("Text search error: %s", e)
         return None
 
 @app.route('/tracking_progress')
@@ -1843,17 +4237,413 @@ def cancel_tracking():
 
 @app.route('/track_rectangle', methods=['POST'])
 def track_rectangle():
-    """Track an object forward through frames using OCR + template matching hybrid approach"""
+    """Track an object forward through frames, once the scheduler grants a tracking slot"""
+    return run_scheduled_tracking(request.get_json())
+
+@app.route('/track_rectangles', methods=['POST'])
+def track_rectangles():
+    """Track several rectangles forward in a single pass over the frames
+
+    Takes the /track_rectangle parameters with a 'rectangles' list in place of
+    'rectangle'. Each frame is decoded once and full-frame OCR runs at most once
+    per frame for all rectangles; 'results' holds one /track_rectangle response
+    per rectangle.
+    """
+    data = request.get_json()
+    rectangles = data.get('rectangles') if data else None
+    if not isinstance(rectangles, list) or not rectangles:
+        return jsonify({'error': 'rectangles must be a non-empty list'}), 400
+    return run_scheduled_tracking(data)
+
+def run_scheduled_tracking(data):
+    """Run tracking once the scheduler grants a tracking slot, saving its profile
+
+    The cancel flag is reset before waiting, so a cancel while queued skips the run.
+    """
+    tracking_state.update({
+        'stage': 'queued',
+        'message': 'Waiting for a tracking slot...',
+        'cancelled': False
+    })
+    tracking_id = str(uuid.uuid4())
+    with job_scheduler.slot(tracking_id, 'tracking'):
+        if tracking_state['cancelled']:
+            tracking_log.info("Tracking cancelled by user while queued")
+            tracking_state.update({
+                'active': False,
+                'stage': 'cancelled',
+                'message': 'Tracking cancelled'
+            })
+            return jsonify({'error': 'Tracking cancelled by user'}), 400
+        profiler = JobProfiler(tracking_id, 'tracking')
+        try:
+            return run_tracking(data, profiler)
+        finally:
+            save_job_profile(profiler)
+            tracking_state['profile_id'] = tracking_id
+
+class RectangleTracker:
+    """Tracking state for one rectangle: its target text, template and current position"""
+
+    def __init__(self, rectangle, start_img):
+        self.rect_id = rectangle['rectId']
+        x, y, w, h = rectangle['x'], rectangle['y'], rectangle['width'], rectangle['height']
+        self.start_x, self.start_y, self.w, self.h = x, y, w, h
+        
+        # Extract template region
+        self.template = start_img[y:y+h, x:x+w]
+        if self.template.size == 0:
+            raise ValueError(f'Invalid rectangle coordinates for {self.rect_id}')
+        
+        # Extract text from the initial rectangle for OCR tracking
+        tracking_log.debug("Extracting text from initial rectangle %s", self.rect_id)
+        self.target_texts = extract_text_from_region(start_img, x, y, w, h)
+        if tracking_log.isEnabledFor(logging.DEBUG):
+            tracking_log.debug("Found %d text elements: %s", len(self.target_texts), [t['text'] for t in self.target_texts])
+        
+        # Determine tracking method based on text availability
+        self.use_ocr_tracking = len(self.target_texts) > 0 and any(len(t['text'].strip()) > 2 for t in self.target_texts)
+        self.method_name = 'OCR + Template' if self.use_ocr_tracking else 'Template only'
+        tracking_log.info("Using %s tracking for rectangle %s", self.method_name, self.rect_id)
+        
+        self.current_x, self.current_y = x, y
+        self.scale = 1
+        self.template_h, self.template_w = self.template.shape[:2]
+        self.template_offset = (0.0, 0.0)
+        self.tracking_results = []
+        self.active = True
+    
+    def copy(self):
+        """Fresh tracker for another segment, starting from this tracker's targets, template and position"""
+        tracker = copy.copy(self)
+        tracker.tracking_results = []
+        tracker.active = True
+        return tracker
+    
+    def preferred_scale(self, frame_height):
+        return choose_tracking_scale(frame_height, self.w, self.h, self.target_texts)
+    
+    def set_scale(self, scale, scaled_start_img):
+        """Cut the template from the start frame decoded at 1/scale, False if the rectangle is too small for it"""
+        x, y, w, h = self.start_x, self.start_y, self.w, self.h
+        if scale > 1:
+            template = scaled_start_img[y // scale:(y + h) // scale, x // scale:(x + w) // scale]
+            if template.size == 0:
+                return False
+            self.template = template
+        self.scale = scale
+        self.template_h, self.template_w = self.template.shape[:2]
+        # Sub-pixel position of the rectangle inside the template, in decoded pixels,
+        # carried across template updates so re-cutting it doesn't drift at reduced scale
+        self.template_offset = (x / scale - x // scale, y / scale - y // scale)
+        return True
+    
+    def track_frame(self, current_img, frame_num, full_frame_texts, profiler):
+        """Find the rectangle in one frame decoded at 1/scale; False once tracking is lost
+
+        full_frame_texts() returns the frame's full-frame OCR, shared between the
+        rectangles tracked in the same pass.
+        """
+        w, h, scale = self.w, self.h, self.scale
+        if self.use_ocr_tracking:
+            # Two-stage OCR tracking: scan rectangle first, then full frame if needed
+            tracking_log.debug("Frame %s: Stage 1 - Scanning rectangle area (%s, %s, %s, %s)", frame_num, self.current_x, self.current_y, w, h)
+            
+            # Stage 1: Scan the inherited rectangle area (fast)
+            with profiler.measure('ocr_rectangle'):
+                rectangle_texts = scan_rectangle_area(current_img, self.current_x, self.current_y, w, h, padding=15, scale=scale)
+            text_matches = find_matching_texts(rectangle_texts, self.target_texts)
+            
+            tracking_log.debug("Frame %s: Stage 1 found %s texts, %s matches", frame_num, len(rectangle_texts), len(text_matches))
+            
+            # Check if we found enough of our target texts
+            all_found = check_all_targets_found(text_matches, self.target_texts, coverage_threshold=0.8)
+            
+            if not all_found:
+                tracking_log.debug("Frame %s: Stage 2 - Scanning entire frame (fallback)", frame_num)
+                # Stage 2: Scan entire frame (slower fallback)
+                frame_texts = full_frame_texts()
+                text_matches = find_matching_texts(frame_texts, self.target_texts)
+                tracking_log.debug("Frame %s: Stage 2 found %s texts, %s matches", frame_num, len(frame_texts), len(text_matches))
+            else:
+                tracking_log.debug("Frame %s: Stage 1 sufficient - all target texts found", frame_num)
+            
+            if text_matches:
+                # Calculate the rectangle that covers all matched texts
+                raw_covering_rect = calculate_covering_rectangle(text_matches)
+                
+                if raw_covering_rect:
+                    # Stabilize the rectangle position to prevent jitter and preserve size
+                    current_rect = {'x': self.current_x, 'y': self.current_y, 'width': w, 'height': h}
+                    # Only stabilize position, preserve original dimensions
+                    position_only_rect = {
+                        'x': raw_covering_rect['x'], 
+                        'y': raw_covering_rect['y'], 
+                        'width': w, 
+                        'height': h
+                    }
+                    covering_rect = stabilize_rectangle_position(position_only_rect, current_rect, stability_threshold=3)
+                    
+                    # Log stabilization if position was adjusted
+                    if (raw_covering_rect['x'] != covering_rect['x'] or 
+                        raw_covering_rect['y'] != covering_rect['y'] or
+                        raw_covering_rect['width'] != covering_rect['width'] or
+                        raw_covering_rect['height'] != covering_rect['height']):
+                        tracking_log.debug("Frame %s: Stabilized position: %s → %s", frame_num, raw_covering_rect, covering_rect)
+                    
+                    # Check if rectangle needs to be moved (after stabilization)
+                    # Use larger thresholds to prevent micro-movements from creating keyframes
+                    rect_moved = (abs(covering_rect['x'] - self.current_x) > 8 or 
+                                abs(covering_rect['y'] - self.current_y) > 8)
+                    rect_resized = False  # Never resize during tracking
+                    
+                    # Update position only (preserve original size)
+                    self.current_x, self.current_y = covering_rect['x'], covering_rect['y']
+                    
+                    # Calculate confidence based on number of matches and their similarities
+                    avg_similarity = sum(match['similarity'] for match in text_matches) / len(text_matches)
+                    match_ratio = len(text_matches) / len(self.target_texts)
+                    confidence = (avg_similarity * 0.7 + match_ratio * 30) / 100.0
+                    
+                    tracking_method = 'OCR_Enhanced_Stage1' if all_found else 'OCR_Enhanced_Stage2'
+                    matched_texts = [match['text'] for match in text_matches]
+                    
+                    tracking_log.debug("Frame %d: OCR Enhanced found %d texts %s, rectangle %s, new bounds (%d, %d, %d, %d)",
+                                       frame_num, len(text_matches), matched_texts, 'moved' if rect_moved else 'stable',
+                                       self.current_x, self.current_y, w, h)
+                    
+                    # Add tracking result with movement/resize flags (no resizing during tracking)
+                    self.tracking_results.append({
+                        'frame': frame_num,
+                        'x': self.current_x,
+                        'y': self.current_y,
+                        'width': w,
+                        'height': h,
+                        'confidence': float(confidence),
+                        'method': tracking_method,
+                        'matched_texts': matched_texts,
+                        'text_count': len(text_matches),
+                        'rectangle_moved': rect_moved,
+                        'rectangle_resized': rect_resized,
+                        'avg_similarity': avg_similarity
+                    })
+                    return True
+                else:
+                    tracking_log.debug("Frame %s: Could not calculate covering rectangle", frame_num)
+            else:
+                tracking_log.debug("Frame %s: No matching texts found", frame_num)
+            
+            # If OCR tracking failed, fall back to template matching
+            tracking_log.debug("Frame %s: Falling back to template matching", frame_num)
+        
+        # Perform template matching as backup or primary method
+        with profiler.measure('template_match'):
+            result = cv2.matchTemplate(current_img, self.template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        
+        # Template matching threshold
+        template_threshold = 0.6
+        
+        if max_val < template_threshold:
+            # Tracking lost
+            tracking_log.info("Frame %s: Tracking lost for rectangle %s (template confidence %.3f < %s)",
+                              frame_num, self.rect_id, max_val, template_threshold)
+            self.active = False
+            return False
+        
+        # Use template matching result, mapped back to full resolution
+        match_x, match_y = refine_match_peak(result, max_loc) if scale > 1 else max_loc
+        self.current_x = int(round((match_x + self.template_offset[0]) * scale))
+        self.current_y = int(round((match_y + self.template_offset[1]) * scale))
+        confidence = max_val
+        tracking_log.debug("Frame %s: Template found at (%s, %s) with confidence %.3f", frame_num, self.current_x, self.current_y, max_val)
+        
+        # Add successful tracking result
+        self.tracking_results.append({
+            'frame': frame_num,
+            'x': self.current_x,
+            'y': self.current_y,
+            'width': w,
+            'height': h,
+            'confidence': float(confidence),
+            'method': 'Template',
+            'text': None
+        })
+        
+        # Update template with new region for better tracking
+        if confidence > 0.8 and (scale == 1 or confidence < TRACKING_TEMPLATE_REFRESH_BELOW):
+            self.template = current_img[max_loc[1]:max_loc[1]+self.template_h, max_loc[0]:max_loc[0]+self.template_w]
+            self.template_offset = (match_x + self.template_offset[0] - max_loc[0],
+                                    match_y + self.template_offset[1] - max_loc[1])
+        return True
+    
+    def response(self, start_frame, **extra):
+        """Result in the /track_rectangle response shape"""
+        return {
+            **extra,
+            'success': True,
+            'rectangle_id': self.rect_id,
+            'start_frame': start_frame,
+            'processed_frames': len(self.tracking_results),
+            'tracking_results': self.tracking_results,
+            'tracking_method': self.method_name,
+            'decode_scale': self.scale,
+            'text_elements': [t['text'] for t in self.target_texts]
+        }
+
+# Bidirectional and segmented tracking
+# 'direction' tracks forward, backward or both ways from the start frame. Each
+# direction can be split into 'segments' that are tracked in parallel: every
+# segment after the first re-finds the rectangle in its first frame from the
+# start frame's text and template, and runs TRACKING_SEGMENT_OVERLAP frames
+# into the next one. Segments are stitched while neighbours agree on those
+# overlap frames; the first disagreement or lost track ends the result.
+TRACKING_DIRECTIONS = ('forward', 'backward', 'both')
+TRACKING_WORKERS = max(2, min(8, (os.cpu_count() or 2) // 2))
+TRACKING_AUTO_SEGMENT_FRAMES = 300  # 'auto' segments aim for about this many frames each
+TRACKING_MIN_SEGMENT_FRAMES = 30
+TRACKING_SEGMENT_OVERLAP = 5  # Frames each segment tracks into the next, compared when stitching
+TRACKING_STITCH_TOLERANCE = 8  # Pixels; the same threshold below which tracking creates no keyframe
+
+class TrackingProgress:
+    """Frame counter shared by the tracking workers, mirrored into tracking_state"""
+
+    def __init__(self, total_frames):
+        self.total_frames = total_frames  # Frames owned by a segment; overlap frames are not counted
+        self.processed_frames = 0
+        self._lock = Lock()
+    
+    def advance(self, frame_num):
+        with self._lock:
+            self.processed_frames += 1
+            processed = self.processed_frames
+        tracking_state.update({
+            'current_frame': processed,
+            'progress': int(processed / self.total_frames * 100) if self.total_frames > 0 else 0,
+            'message': f'Processing frame {frame_num} ({processed}/{self.total_frames})'
+        })
+
+def parse_tracking_segments(value, frame_count):
+    """Number of segments for one direction from a request's 'segments' (an integer or 'auto')"""
+    if str(value).lower() == 'auto':
+        requested = -(-frame_count // TRACKING_AUTO_SEGMENT_FRAMES)
+    else:
+        try:
+            requested = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'segments must be auto or a positive integer, got {value!r}')
+        if requested < 1:
+            raise ValueError(f'segments must be auto or a positive integer, got {value!r}')
+    return max(1, min(requested, frame_count // TRACKING_MIN_SEGMENT_FRAMES))
+
+def plan_tracking_segments(frames, count):
+    """Split one direction's frames, in tracking order, into count segments
+
+    Each segment is {'frames': [(frame_num, path), ...], 'own': n}, where the
+    first n frames belong to it and the rest overlap the next segment.
+    """
+    bounds = [round(i * len(frames) / count) for i in range(count + 1)]
+    return [{
+        'frames': frames[bounds[i]:bounds[i + 1] + (TRACKING_SEGMENT_OVERLAP if i < count - 1 else 0)],
+        'own': bounds[i + 1] - bounds[i]
+    } for i in range(count)]
+
+def track_frame_range(trackers, frames, own_frames, scale, profiler, progress, stop):
+    """Run trackers over frames in order, decoding each frame once; False if cancelled or stopped
+
+    Only the first own_frames frames count towards progress, the rest overlap the next segment.
+    """
+    for position, (frame_num, frame_path) in enumerate(frames):
+        if tracking_state['cancelled'] or stop.is_set():
+            return False
+        if position < own_frames:
+            progress.advance(frame_num)
+        
+        # Load current frame
+        frame_start = time.perf_counter()
+        with profiler.measure('decode'):
+            current_img = read_tracking_frame(frame_path, scale)
+        if current_img is None:
+            tracking_log.warning("Could not load frame %s, stopping tracking", frame_num)
+            break
+        
+        # Full-frame OCR is only run when a rectangle falls back to it, and once per frame
+        frame_texts = []
+        def full_frame_texts():
+            if not frame_texts:
+                with profiler.measure('ocr_full_frame'):
+                    frame_texts.append(find_all_text_in_frame(current_img, scale=scale))
+            return frame_texts[0]
+        
+        for tracker in trackers:
+            if tracker.active:
+                tracker.track_frame(current_img, frame_num, full_frame_texts, profiler)
+        
+        profiler.observe('frame', time.perf_counter() - frame_start)
+        if not any(tracker.active for tracker in trackers):
+            break
+    return True
+
+def stitch_segment_results(segment_trackers, segments):
+    """Join one rectangle's per-segment trackers into one result list in tracking order
+
+    Returns (tracking_results, number of segments stitched).
+    """
+    results = []
+    for index, (tracker, segment) in enumerate(zip(segment_trackers, segments)):
+        own_frames = {frame_num for frame_num, _ in segment['frames'][:segment['own']]}
+        if index > 0:
+            overlap = [frame_num for frame_num, _ in segment['frames'][:TRACKING_SEGMENT_OVERLAP]]
+            previous = {r['frame']: r for r in segment_trackers[index - 1].tracking_results}
+            current = {r['frame']: r for r in tracker.tracking_results}
+            agrees = all(
+                frame_num in previous and frame_num in current and
+                abs(previous[frame_num]['x'] - current[frame_num]['x']) <= TRACKING_STITCH_TOLERANCE and
+                abs(previous[frame_num]['y'] - current[frame_num]['y']) <= TRACKING_STITCH_TOLERANCE
+                for frame_num in overlap
+            )
+            if not agrees:
+                tracking_log.info("Rectangle %s: segment %d does not line up with segment %d, stopping there",
+                                  tracker.rect_id, index + 1, index)
+                return results, index
+        results.extend(r for r in tracker.tracking_results if r['frame'] in own_frames)
+    return results, len(segments)
+
+def mark_rectangle_moves(tracking_results, start_frame, start_x, start_y):
+    """Set rectangle_moved on frame-ordered results against the previous frame's position
+
+    Segments and backward tracking compare each frame with the frame tracked before it,
+    which is not the previous frame in the video; the earliest frame has nothing to move from.
+    """
+    anchor = {'frame': start_frame, 'x': start_x, 'y': start_y}
+    timeline = sorted(tracking_results + [anchor], key=lambda result: result['frame'])
+    for previous, result in zip([None] + timeline, timeline):
+        if 'rectangle_moved' in result:
+            result['rectangle_moved'] = previous is not None and (
+                abs(result['x'] - previous['x']) > 8 or abs(result['y'] - previous['y']) > 8)
+
+def run_tracking(data, profiler=None):
+    """Track one rectangle, or a 'rectangles' batch in one pass, through frames using OCR + template matching"""
+    profiler = profiler or JobProfiler(str(uuid.uuid4()), 'tracking')
+    profiler.begin('setup')
     try:
-        data = request.get_json()
         video_name = data.get('video_name')
-        rectangle = data.get('rectangle')  # {x, y, width, height, rectId}
+        batch = 'rectangles' in data
+        rectangles = data.get('rectangles') if batch else [data.get('rectangle')]  # [{x, y, width, height, rectId}]
         start_frame = data.get('start_frame')
         fps = data.get('fps', 30)
         custom_frame_limit = data.get('frame_limit', 150)  # User-selected frame limit
         
-        if not all([video_name, rectangle, start_frame is not None]):
+        if not all([video_name, rectangles, all(rectangles), start_frame is not None]):
             return jsonify({'error': 'Missing required parameters'}), 400
+        direction = data.get('direction', 'forward')
+        if direction not in TRACKING_DIRECTIONS:
+            return jsonify({'error': f"direction must be one of {', '.join(TRACKING_DIRECTIONS)}"}), 400
+        try:
+            decode_scale = parse_decode_scale(data.get('decode_scale', TRACKING_DECODE_SCALE))
+            parse_tracking_segments(data.get('segments', 1), 0)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
         
         # Handle frame limit
         if custom_frame_limit == -1:
@@ -1864,6 +4654,11 @@ def track_rectangle():
         
         global tracking_state
         
+        if ocr_status['state'] != 'ready':
+            tracking_state.update({'stage': 'loading', 'message': 'Loading OCR model...'})
+        load_tracking_modules()
+        start_ocr()
+        
         # Initialize tracking state
         tracking_state.update({
             'active': True,
@@ -1873,12 +4668,12 @@ def track_rectangle():
             'stage': 'analyzing',
             'method': '',
             'keyframes_created': 0,
-            'message': 'Analyzing initial rectangle text...',
-            'cancelled': False
+            'message': 'Analyzing initial rectangle text...'
         })
         
-        print(f"Starting tracking for rectangle {rectangle['rectId']} from frame {start_frame}")
-        print(f"Will process maximum {frame_limit} frames")
+        tracking_log.info("Starting tracking for rectangle(s) %s from frame %s",
+                          ', '.join(str(rectangle.get('rectId')) for rectangle in rectangles), start_frame)
+        tracking_log.debug("Will process maximum %s frames", frame_limit)
         
         # Get frame folder
         video_base = video_name.split('.')[0]
@@ -1899,39 +4694,34 @@ def track_rectangle():
         if not os.path.exists(start_frame_path):
             return jsonify({'error': f'Start frame {start_frame} (file: frame_{ffmpeg_frame_number:06d}.jpg) not found'}), 404
         
-        # Load start frame and extract template
-        start_img = cv2.imread(start_frame_path)
+        # Load start frame at full resolution for reading the target text
+        start_img = read_tracking_frame(start_frame_path)
         if start_img is None:
             return jsonify({'error': 'Could not load start frame'}), 500
         
-        # Extract template region
-        x, y, w, h = rectangle['x'], rectangle['y'], rectangle['width'], rectangle['height']
-        template = start_img[y:y+h, x:x+w]
-        
-        if template.size == 0:
-            return jsonify({'error': 'Invalid rectangle coordinates'}), 400
-        
-        # Extract text from the initial rectangle for OCR tracking
-        print("Extracting text from initial rectangle...")
-        target_texts = extract_text_from_region(start_img, x, y, w, h)
-        print(f"Found {len(target_texts)} text elements: {[t['text'] for t in target_texts]}")
-        
-        # Determine tracking method based on text availability
-        use_ocr_tracking = len(target_texts) > 0 and any(len(t['text'].strip()) > 2 for t in target_texts)
-        method_name = 'OCR + Template' if use_ocr_tracking else 'Template only'
-        print(f"Using {method_name} tracking")
+        try:
+            trackers = [RectangleTracker(rectangle, start_img) for rectangle in rectangles]
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # All rectangles share one decode of each frame, at the smallest scale any of them allows
+        scale = decode_scale or min(tracker.preferred_scale(start_img.shape[0]) for tracker in trackers)
+        scaled_img = read_tracking_frame(start_frame_path, scale) if scale > 1 else None
+        if not all(tracker.set_scale(scale, scaled_img) for tracker in trackers):
+            scale = 1  # A rectangle is too small for the forced scale
+            for tracker in trackers:
+                tracker.set_scale(1, None)
+        tracking_log.info("Decoding tracking frames as grayscale at 1/%d scale", scale)
         
         # Update progress
+        method_name = ', '.join(sorted({tracker.method_name for tracker in trackers}))
+        profiler.begin('track')
         tracking_state.update({
             'stage': 'tracking',
             'method': method_name,
             'message': f'Tracking using {method_name}...'
         })
         
-        # Track forward
-        tracking_results = []
-        current_x, current_y = x, y
-        
         # Get list of available frames
         frame_files = sorted([f for f in os.listdir(frame_folder) if f.startswith('frame_') and f.endswith('.jpg')])
         start_index = None
@@ -1947,175 +4737,71 @@ def track_rectangle():
         if start_index is None:
             return jsonify({'error': 'Start frame not found in sequence'}), 404
         
-        processed_frames = 0
+        # Frames to track in each direction, in tracking order, as (0-based frame number, path)
+        # FFmpeg numbers frames from 1, so subtract 1 for the result frame numbers
+        def frame_entries(files):
+            return [(int(f.split('_')[1].split('.')[0]) - 1, os.path.join(frame_folder, f)) for f in files]
+        directions = {}
+        if direction in ('forward', 'both'):
+            directions['forward'] = frame_entries(frame_files[start_index + 1:start_index + 1 + frame_limit])
+        if direction in ('backward', 'both'):
+            directions['backward'] = frame_entries(frame_files[max(0, start_index - frame_limit):start_index][::-1])
+        plans = {name: plan_tracking_segments(frames, parse_tracking_segments(data.get('segments', 1), len(frames)))
+                 for name, frames in directions.items()}
+        segment_jobs = [(name, index) for name, segments in plans.items() for index in range(len(segments))]
         
         # Update tracking state with actual total frames
-        actual_total_frames = min(frame_limit, len(frame_files) - start_index - 1)
-        tracking_state['total_frames'] = actual_total_frames
-        
-        # Process subsequent frames
-        for i in range(start_index + 1, min(start_index + 1 + frame_limit, len(frame_files))):
-            # Check for cancellation
-            if tracking_state['cancelled']:
-                print("Tracking cancelled by user")
-                tracking_state.update({
-                    'active': False,
-                    'stage': 'cancelled',
-                    'message': 'Tracking cancelled'
-                })
-                return jsonify({'error': 'Tracking cancelled by user'}), 400
-            frame_file = frame_files[i]
-            ffmpeg_frame_num = int(frame_file.split('_')[1].split('.')[0])
-            # Convert FFmpeg frame number (1-based) to 0-based index for results
-            frame_num = ffmpeg_frame_num - 1  
-            frame_path = os.path.join(frame_folder, frame_file)
-            
-            # Update progress
-            progress_percent = int((processed_frames / actual_total_frames) * 100) if actual_total_frames > 0 else 0
+        progress = TrackingProgress(sum(segment['own'] for segments in plans.values() for segment in segments))
+        tracking_state['total_frames'] = progress.total_frames
+        workers = min(TRACKING_WORKERS, len(segment_jobs))
+        if any(tracker.use_ocr_tracking for tracker in trackers):
+            # OCR requests queue for the OCR workers, so extra segments would only wait on them
+            workers = min(workers, max(1, OCR_WORKER_PROCESSES))
+        if len(segment_jobs) > 1:
+            tracking_log.info("Tracking %s in %d segments on %d workers", ' and '.join(plans), len(segment_jobs), workers)
+        
+        # Every segment tracks its own copies of the rectangles; segments after the
+        # first in a direction re-find them from the start frame's position
+        segment_trackers = {job: [tracker.copy() for tracker in trackers] for job in segment_jobs}
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(track_frame_range, segment_trackers[job], plans[job[0]][job[1]]['frames'],
+                                plans[job[0]][job[1]]['own'], scale, profiler, progress, stop): job
+                for job in segment_jobs
+            }
+            try:
+                completed = all(future.result() for future in as_completed(futures))
+            finally:
+                stop.set()
+        if not completed:
+            tracking_log.info("Tracking cancelled by user")
             tracking_state.update({
-                'current_frame': processed_frames + 1,
-                'progress': progress_percent,
-                'message': f'Processing frame {frame_num} ({processed_frames + 1}/{actual_total_frames})'
-            })
-            
-            # Load current frame
-            current_img = cv2.imread(frame_path)
-            if current_img is None:
-                print(f"Could not load frame {frame_num}, stopping tracking")
-                break
-            
-            if use_ocr_tracking:
-                # Two-stage OCR tracking: scan rectangle first, then full frame if needed
-                print(f"Frame {frame_num}: Stage 1 - Scanning rectangle area ({current_x}, {current_y}, {w}, {h})")
-                
-                # Stage 1: Scan the inherited rectangle area (fast)
-                rectangle_texts = scan_rectangle_area(current_img, current_x, current_y, w, h, padding=15)
-                text_matches = find_matching_texts(rectangle_texts, target_texts)
-                
-                print(f"Frame {frame_num}: Stage 1 found {len(rectangle_texts)} texts, {len(text_matches)} matches")
-                
-                # Check if we found enough of our target texts
-                all_found = check_all_targets_found(text_matches, target_texts, coverage_threshold=0.8)
-                
-                if not all_found:
-                    print(f"Frame {frame_num}: Stage 2 - Scanning entire frame (fallback)")
-                    # Stage 2: Scan entire frame (slower fallback)
-                    frame_texts = find_all_text_in_frame(current_img)
-                    text_matches = find_matching_texts(frame_texts, target_texts)
-                    print(f"Frame {frame_num}: Stage 2 found {len(frame_texts)} texts, {len(text_matches)} matches")
-                else:
-                    print(f"Frame {frame_num}: Stage 1 sufficient - all target texts found")
-                
-                if text_matches:
-                    # Calculate the rectangle that covers all matched texts
-                    raw_covering_rect = calculate_covering_rectangle(text_matches)
-                    
-                    if raw_covering_rect:
-                        # Stabilize the rectangle position to prevent jitter and preserve size
-                        current_rect = {'x': current_x, 'y': current_y, 'width': w, 'height': h}
-                        # Only stabilize position, preserve original dimensions
-                        position_only_rect = {
-                            'x': raw_covering_rect['x'], 
-                            'y': raw_covering_rect['y'], 
-                            'width': w, 
-                            'height': h
-                        }
-                        covering_rect = stabilize_rectangle_position(position_only_rect, current_rect, stability_threshold=3)
-                        
-                        # Log stabilization if position was adjusted
-                        if (raw_covering_rect['x'] != covering_rect['x'] or 
-                            raw_covering_rect['y'] != covering_rect['y'] or
-                            raw_covering_rect['width'] != covering_rect['width'] or
-                            raw_covering_rect['height'] != covering_rect['height']):
-                            print(f"Frame {frame_num}: Stabilized position: {raw_covering_rect} → {covering_rect}")
-                        
-                        # Check if rectangle needs to be moved (after stabilization)
-                        # Use larger thresholds to prevent micro-movements from creating keyframes
-                        rect_moved = (abs(covering_rect['x'] - current_x) > 8 or 
-                                    abs(covering_rect['y'] - current_y) > 8)
-                        rect_resized = False  # Never resize during tracking
-                        
-                        # Update position only (preserve original size)
-                        current_x, current_y = covering_rect['x'], covering_rect['y']
-                        new_w, new_h = w, h  # Keep original dimensions
-                        
-                        # Calculate confidence based on number of matches and their similarities
-                        avg_similarity = sum(match['similarity'] for match in text_matches) / len(text_matches)
-                        match_ratio = len(text_matches) / len(target_texts)
-                        confidence = (avg_similarity * 0.7 + match_ratio * 30) / 100.0
-                        
-                        tracking_method = 'OCR_Enhanced_Stage1' if all_found else 'OCR_Enhanced_Stage2'
-                        matched_texts = [match['text'] for match in text_matches]
-                        
-                        print(f"Frame {frame_num}: OCR Enhanced found {len(text_matches)} texts {matched_texts}")
-                        print(f"Frame {frame_num}: Rectangle {'moved' if rect_moved else 'stable'} (size preserved)")
-                        print(f"Frame {frame_num}: New bounds ({current_x}, {current_y}, {new_w}, {new_h})")
-                        
-                        # Keep original dimensions (no resizing during tracking)
-                        
-                        # Add tracking result with movement/resize flags
-                        tracking_results.append({
-                            'frame': frame_num,
-                            'x': current_x,
-                            'y': current_y,
-                            'width': w,
-                            'height': h,
-                            'confidence': float(confidence),
-                            'method': tracking_method,
-                            'matched_texts': matched_texts,
-                            'text_count': len(text_matches),
-                            'rectangle_moved': rect_moved,
-                            'rectangle_resized': rect_resized,
-                            'avg_similarity': avg_similarity
-                        })
-                        
-                        processed_frames += 1
-                        continue
-                    else:
-                        print(f"Frame {frame_num}: Could not calculate covering rectangle")
-                else:
-                    print(f"Frame {frame_num}: No matching texts found")
-                
-                # If OCR tracking failed, fall back to template matching
-                print(f"Frame {frame_num}: Falling back to template matching...")
-            
-            # Perform template matching as backup or primary method
-            result = cv2.matchTemplate(current_img, template, cv2.TM_CCOEFF_NORMED)
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
-            
-            # Template matching threshold
-            template_threshold = 0.6
-            
-            if max_val >= template_threshold:
-                # Use template matching result
-                current_x, current_y = max_loc
-                confidence = max_val
-                tracking_method = 'Template'
-                print(f"Frame {frame_num}: Template found at ({current_x}, {current_y}) with confidence {max_val:.3f}")
-            else:
-                # Tracking lost
-                print(f"Frame {frame_num}: Tracking lost (template confidence {max_val:.3f} < {template_threshold})")
-                break
-            
-            # Add successful tracking result
-            tracking_results.append({
-                'frame': frame_num,
-                'x': current_x,
-                'y': current_y,
-                'width': w,
-                'height': h,
-                'confidence': float(confidence),
-                'method': tracking_method,
-                'text': ocr_match['text'] if ocr_match and tracking_method == 'OCR' else None
+                'active': False,
+                'stage': 'cancelled',
+                'message': 'Tracking cancelled'
             })
-            
-            # Update template with new region for better tracking (only for template method)
-            if tracking_method == 'Template' and confidence > 0.8:
-                template = current_img[current_y:current_y+h, current_x:current_x+w]
-            
-            processed_frames += 1
-        
-        print(f"Tracking completed. Processed {processed_frames} frames, found {len(tracking_results)} matches")
+            return jsonify({'error': 'Tracking cancelled by user'}), 400
+        
+        # Stitch each rectangle's segments, backward results first, in frame order
+        responses = []
+        for rect_index, tracker in enumerate(trackers):
+            tracking_results = []
+            stitched_segments = 0
+            for name, segments in plans.items():
+                results, stitched = stitch_segment_results(
+                    [segment_trackers[(name, index)][rect_index] for index in range(len(segments))], segments)
+                tracking_results.extend(results)
+                stitched_segments += stitched
+            tracking_results.sort(key=lambda result: result['frame'])
+            mark_rectangle_moves(tracking_results, start_frame, tracker.start_x, tracker.start_y)
+            tracker.tracking_results = tracking_results
+            responses.append(tracker.response(start_frame, direction=direction, segments=len(segment_jobs),
+                                              stitched_segments=stitched_segments))
+        processed_frames = progress.processed_frames
+        
+        tracking_log.info("Tracking completed. Processed %s frames, found %s matches", processed_frames,
+                          sum(len(response['tracking_results']) for response in responses))
         
         # Update final tracking state
         tracking_state.update({
@@ -2125,20 +4811,19 @@ def track_rectangle():
             'message': f'Completed! Processed {processed_frames} frames'
         })
         
+        if not batch:
+            return jsonify(responses[0])
         return jsonify({
             'success': True,
-            'rectangle_id': rectangle['rectId'],
             'start_frame': start_frame,
             'processed_frames': processed_frames,
-            'tracking_results': tracking_results,
-            'tracking_method': 'OCR + Template' if use_ocr_tracking else 'Template only',
-            'text_elements': [t['text'] for t in target_texts] if target_texts else []
+            'decode_scale': scale,
+            'direction': direction,
+            'results': responses
         })
         
     except Exception as e:
-        print(f"Tracking error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        tracking_log.exception("Tracking error: %s", e)
         
         # Update tracking state on error
         tracking_state.update({
@@ -2162,17 +4847,11 @@ def load_rectangles(video_name):
     filename = f"rectangles_{video_name.split('.')[0]}.json"
     filepath = os.path.join(EXPORT_FOLDER, filename)
     
-    print(f"=== LOAD RECTANGLES DEBUG ===")
-    print(f"Loading for video: {video_name}")
-    print(f"Looking for file: {filepath}")
-    print(f"File exists: {os.path.exists(filepath)}")
-    
     if os.path.exists(filepath):
         try:
             with open(filepath, 'r') as f:
                 rectangles_data = json.load(f)
-            
-            print(f"Loaded rectangles data: {rectangles_data}")
+            trace = rectangles_log.isEnabledFor(logging.DEBUG)
             
             # Convert from event format back to frame rectangles format
             # Use the same logic as export processing for consistency
@@ -2184,7 +4863,8 @@ def load_rectangles(video_name):
             
             for frame_data in sorted_frames:
                 frame_number = frame_data['frame_number']
-                print(f"Frame {frame_number}: {len(frame_data['events'])} events")
+                if trace:
+                    rectangles_log.debug("Frame %d: %d events", frame_number, len(frame_data['events']))
                 
                 # Initialize frame rectangles array
                 frame_rectangles[str(frame_number)] = []
@@ -2211,7 +4891,8 @@ def load_rectangles(video_name):
                                 'height': event['height'],
                                 'rectangleId': rect_id
                             })
-                            print(f"  Rectangle created: {rect_id} at x={event['x']}, y={event['y']}")
+                            if trace:
+                                rectangles_log.debug("  Rectangle created: %s at x=%s, y=%s", rect_id, event['x'], event['y'])
                     
                     elif event_type == 'rectangleMoved':
                         # Move existing rectangle (update position)
@@ -2231,11 +4912,12 @@ def load_rectangles(video_name):
                                     'width': event['width'],
                                     'height': event['height']
                                 })
-                                print(f"  Rectangle moved: {rect_id} to x={event['x']}, y={event['y']}")
+                                if trace:
+                                    rectangles_log.debug("  Rectangle moved: %s to x=%s, y=%s", rect_id, event['x'], event['y'])
                             else:
-                                print(f"  ERROR - rectangleMoved event missing coordinates for {rect_id}")
+                                rectangles_log.warning("rectangleMoved event missing coordinates for %s", rect_id)
                         else:
-                            print(f"  WARNING - Trying to move non-existent rectangle {rect_id}")
+                            rectangles_log.warning("Trying to move non-existent rectangle %s", rect_id)
                     
                     elif event_type == 'rectangleDeleted':
                         # Delete rectangle
@@ -2246,9 +4928,10 @@ def load_rectangles(video_name):
                                 'removesRect': rect_id,
                                 'isRemovalMarker': True
                             })
-                            print(f"  Rectangle deleted: {rect_id}")
+                            if trace:
+                                rectangles_log.debug("  Rectangle deleted: %s", rect_id)
                         else:
-                            print(f"  WARNING - Trying to delete non-existent rectangle {rect_id}")
+                            rectangles_log.warning("Trying to delete non-existent rectangle %s", rect_id)
                     
                     elif event_type == 'rectangleResized':
                         # Resize existing rectangle (update dimensions)
@@ -2268,32 +4951,30 @@ def load_rectangles(video_name):
                                     'width': event['width'],
                                     'height': event['height']
                                 })
-                                print(f"  Rectangle resized: {rect_id} to w={event['width']}, h={event['height']}")
+                                if trace:
+                                    rectangles_log.debug("  Rectangle resized: %s to w=%s, h=%s", rect_id, event['width'], event['height'])
                             else:
-                                print(f"  ERROR - rectangleResized event missing coordinates for {rect_id}")
+                                rectangles_log.warning("rectangleResized event missing coordinates for %s", rect_id)
                         else:
-                            print(f"  WARNING - Trying to resize non-existent rectangle {rect_id}")
-                
-                print(f"  Frame {frame_number} created with {len(frame_rectangles[str(frame_number)])} rectangle entries")
+                            rectangles_log.warning("Trying to resize non-existent rectangle %s", rect_id)
             
-            print(f"Final frame_rectangles: {frame_rectangles}")
-            print(f"Total frames: {len(frame_rectangles)}")
-            print(f"Total rectangles: {sum(len(rects) for rects in frame_rectangles.values())}")
-            print("============================")
+            total_rectangles = sum(len(rects) for rects in frame_rectangles.values())
+            rectangles_log.info("Loaded %d frames / %d rectangle entries for %s from %s",
+                                len(frame_rectangles), total_rectangles, video_name, filepath)
             
             return jsonify({
                 'success': True,
                 'frame_rectangles': frame_rectangles,
                 'total_frames': len(frame_rectangles),
-                'total_rectangles': sum(len(rects) for rects in frame_rectangles.values()),
+                'total_rectangles': total_rectangles,
                 'filename': filename
             })
             
         except Exception as e:
-            print(f"Load error: {str(e)}")
+            rectangles_log.error("Load error for %s: %s", filepath, e)
             return jsonify({'error': f'Failed to load rectangles: {str(e)}'}), 500
     else:
-        print("No existing rectangle data found")
+        rectangles_log.info("No existing rectangle data found for %s", video_name)
         return jsonify({
             'success': True,
             'frame_rectangles': {},
@@ -2302,5 +4983,35 @@ def load_rectangles(video_name):
             'message': 'No existing rectangle data found'
         })
 
+@app.route('/health')
+def health():
+    """Liveness plus readiness of the lazily loaded OCR stack
+    
+    With ?require=ocr the response is 503 until the OCR reader is ready, for
+    use as a readiness probe when tracking must be available immediately.
+    """
+    process_start = psutil.Process().create_time()
+    ocr_ready = ocr_status['state'] == 'ready'
+    status = {
+        'status': 'ok',
+        'uptime_seconds': round(time.time() - process_start, 1),
+        'startup_seconds': STARTUP_SECONDS,
+        'ocr_warmup': OCR_WARMUP,
+        'ocr': dict(ocr_status, pool=ocr_pool.status() if ocr_pool else None),
+        'ready': {'frames': True, 'ocr': ocr_ready}
+    }
+    if request.args.get('require') == 'ocr' and not ocr_ready:
+        return jsonify(status), 503
+    return jsonify(status)
+
+# Time from process start until the app module finished loading
+STARTUP_SECONDS = round(time.time() - psutil.Process().create_time(), 3)
+jobs_log.info("App loaded %.2fs after process start", STARTUP_SECONDS)
+
 if __name__ == '__main__':
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_encoder_probe()
+    if OCR_WARMUP and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=warm_up_ocr, args=('127.0.0.1', 5000), name='ocr-warmup', daemon=True).start()
     app.run(debug=True)
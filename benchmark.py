@@ -0,0 +1,428 @@
+"""Benchmark suite for the video editor's processing pipeline
+
+Generates synthetic videos with ffmpeg's testsrc2/mandelbrot sources (optionally
+with moving text overlays for tracking) and a rectangle timeline, then times
+frame extraction, blur processing, export, preview and tracking end to end.
+Results are written as JSON so runs can be compared between commits:
+
+    python benchmark.py --resolution 1920x1080 --duration 20 --rects 4
+    python benchmark.py --compare benchmark_results/<earlier run>.json
+
+The benchmark runs in its own working directory, so the app's data, frames and
+exports folders of the checkout are left alone.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import psutil
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FOLDER = os.path.join(REPO_DIR, 'benchmark_results')
+BENCHMARKS = ('extract', 'process', 'export', 'preview', 'track')
+MEMORY_SAMPLE_INTERVAL = 0.05
+OVERLAY_TEXTS = ('PLATE 4821', 'ID 7730-KX')
+OVERLAY_FONT_SIZE = 48
+
+class PeakMemorySampler:
+    """Samples RSS of this process plus its children (ffmpeg) on a background thread"""
+
+    def __init__(self, interval=MEMORY_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        total = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass  # Child exited between listing and sampling
+        self.peak_bytes = max(self.peak_bytes, total)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+def parse_resolution(value):
+    width, _, height = value.lower().partition('x')
+    try:
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Resolution must look like 1280x720, got {value!r}')
+
+def overlay_positions(width, height):
+    """Start position and horizontal speed (px/s) of each text overlay"""
+    return [
+        (width // 10, height // 4 + i * (height // 3), 20 + i * 15)
+        for i in range(len(OVERLAY_TEXTS))
+    ]
+
+def generate_video(path, args):
+    """Render a synthetic test video with ffmpeg, plus a sine audio track"""
+    width, height = args.resolution
+    if args.source == 'mandelbrot':
+        source = f'mandelbrot=size={width}x{height}:rate={args.fps}'
+    else:
+        source = f'testsrc2=size={width}x{height}:rate={args.fps}'
+
+    filters = []
+    if args.text:
+        for text, (x, y, speed) in zip(OVERLAY_TEXTS, overlay_positions(width, height)):
+            filters.append(
+                f"drawtext=text='{text}':fontsize={OVERLAY_FONT_SIZE}:fontcolor=white:"
+                f"box=1:boxcolor=black@0.8:boxborderw=8:x='{x}+{speed}*t':y={y}"
+            )
+
+    cmd = ['ffmpeg', '-y', '-v', 'error',
+           '-f', 'lavfi', '-i', source,
+           '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=48000',
+           '-t', str(args.duration)]
+    if filters:
+        cmd += ['-vf', ','.join(filters)]
+    cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-shortest', path]
+    subprocess.run(cmd, check=True)
+
+def build_rectangle_timeline(total_frames, args):
+    """Create a seeded event timeline with args.rects rectangles
+
+    Each rectangle lives for a random span of frames and is moved every
+    args.move_every frames. Returns the export/preview 'frames' payload.
+    """
+    width, height = args.resolution
+    rng = random.Random(args.seed)
+    events = {}
+
+    def add(frame, event):
+        events.setdefault(frame, []).append(event)
+
+    for i in range(args.rects):
+        rect_id = f'bench_{i}'
+        start = rng.randrange(0, max(1, total_frames // 4))
+        end = rng.randrange(start + 1, total_frames + 1)
+        rect_w, rect_h = rng.randint(width // 10, width // 4), rng.randint(height // 10, height // 4)
+        x, y = rng.randrange(0, width - rect_w), rng.randrange(0, height - rect_h)
+        add(start, {'eventType': 'rectangleCreated', 'rectangleId': rect_id,
+                    'x': x, 'y': y, 'width': rect_w, 'height': rect_h})
+        for frame in range(start + args.move_every, end, args.move_every):
+            x = min(max(0, x + rng.randint(-20, 20)), width - rect_w)
+            y = min(max(0, y + rng.randint(-20, 20)), height - rect_h)
+            add(frame, {'eventType': 'rectangleMoved', 'rectangleId': rect_id,
+                        'x': x, 'y': y, 'width': rect_w, 'height': rect_h})
+        if end < total_frames:
+            add(end, {'eventType': 'rectangleDeleted', 'rectangleId': rect_id})
+
+    return [{'frame_number': frame, 'events': events[frame]} for frame in sorted(events)]
+
+def precompute_rectangles(timeline, total_frames):
+    """Active rectangles per 0-based frame index, as export_blurred_async derives them"""
+    events_by_frame = {frame['frame_number']: frame['events'] for frame in timeline}
+    active = {}
+    precomputed = {}
+    for frame_index in range(total_frames):
+        for event in events_by_frame.get(frame_index, ()):
+            if event['eventType'] == 'rectangleDeleted':
+                active.pop(event['rectangleId'], None)
+            else:
+                active[event['rectangleId']] = {key: event[key] for key in ('x', 'y', 'width', 'height')}
+        if active:
+            precomputed[frame_index] = dict(active)
+    return precomputed
+
+class BenchmarkRunner:
+    """Runs each benchmark against the app module inside the benchmark working directory"""
+
+    def __init__(self, app_module, args, video_name):
+        self.app = app_module
+        self.args = args
+        self.video_name = video_name
+        self.video_path = os.path.join(app_module.UPLOAD_FOLDER, video_name)
+        self.frames_folder = os.path.join(app_module.FRAMES_FOLDER, video_name.split('.')[0])
+        self.total_frames = 0
+        self.timeline = []
+        self.details = {}  # Extra result fields reported by the current benchmark
+
+    def register_job(self, job_type):
+        job_id = f'bench-{job_type}-{uuid.uuid4().hex[:8]}'
+        with self.app.jobs_lock:
+            self.app.jobs[job_id] = {
+                'id': job_id,
+                'status': 'starting',
+                'progress': 0,
+                'message': 'Benchmark',
+                'cancelled': False,
+                'job_type': job_type,
+                'created_at': time.time()
+            }
+        return job_id
+
+    def job_result(self, job_id):
+        """Raise if the job did not complete"""
+        job = self.app.get_job_snapshot(job_id) or {}
+        if job.get('status') != 'completed':
+            raise RuntimeError(job.get('error') or job.get('message') or f"job ended as {job.get('status')}")
+        return job
+
+    def count_frames(self):
+        return len([f for f in os.listdir(self.frames_folder) if f.startswith('frame_')])
+
+    def bench_extract(self):
+        shutil.rmtree(self.frames_folder, ignore_errors=True)
+        os.makedirs(self.frames_folder)
+        job_id = self.register_job('extraction')
+        self.app.extract_frames_async(job_id, self.video_name, self.video_path, self.frames_folder)
+        self.job_result(job_id)
+        self.total_frames = self.count_frames()
+        self.timeline = build_rectangle_timeline(self.total_frames, self.args)
+        return self.total_frames
+
+    def bench_process(self):
+        output_folder = os.path.join(self.app.FRAMES_FOLDER, 'benchmark_blurred')
+        shutil.rmtree(output_folder, ignore_errors=True)
+        os.makedirs(output_folder)
+        precomputed = precompute_rectangles(self.timeline, self.total_frames)
+        frame_tasks = []
+        for frame_file in sorted(f for f in os.listdir(self.frames_folder) if f.startswith('frame_')):
+            frame_index = int(frame_file.split('_')[1].split('.')[0]) - 1
+            frame_tasks.append((os.path.join(self.frames_folder, frame_file), os.path.join(output_folder, frame_file),
+                                frame_index, precomputed, self.args.blur_radius))
+        job_id = self.register_job('export')
+        if not self.app.process_frames_multithreaded(frame_tasks, job_id, max_workers=self.args.workers):
+            raise RuntimeError(self.app.get_job_snapshot(job_id).get('error', 'frame processing failed'))
+        return len(frame_tasks)
+
+    def bench_export(self):
+        job_id = self.register_job('export')
+        self.app.export_blurred_async(job_id, {
+            'video_name': self.video_name,
+            'frames': self.timeline,
+            'blur_radius': self.args.blur_radius,
+            'video_codec': self.args.codec,
+            'encode_mode': self.args.encode_mode,
+            'force_full_render': True
+        })
+        self.job_result(job_id)
+        return self.total_frames
+
+    def bench_preview(self):
+        job_id = self.register_job('preview')
+        end_frame = min(self.total_frames, 200) - 1
+        self.app.preview_blurred_async(job_id, {
+            'video_name': self.video_name,
+            'frames': self.timeline,
+            'blur_radius': self.args.blur_radius,
+            'video_codec': self.args.codec,
+            'start_frame': 0,
+            'end_frame': end_frame
+        })
+        self.job_result(job_id)
+        return end_frame + 1
+
+    def bench_track(self):
+        if not self.args.text:
+            raise RuntimeError('tracking needs text overlays, run without --no-text')
+        width, height = self.args.resolution
+        x, y, speed = overlay_positions(width, height)[0]
+        text_width = int(len(OVERLAY_TEXTS[0]) * OVERLAY_FONT_SIZE * 0.6)
+        rect_x, rect_y = max(0, x - 12), max(0, y - 12)
+        client = self.app.app.test_client()
+        response = client.post('/track_rectangle', json={
+            'video_name': self.video_name,
+            'rectangle': {'x': rect_x, 'y': rect_y, 'width': text_width + 24,
+                          'height': OVERLAY_FONT_SIZE + 24, 'rectId': 'bench_track'},
+            'start_frame': 0,
+            'fps': self.args.fps,
+            'frame_limit': min(self.args.track_frames, self.total_frames - 1),
+            'decode_scale': self.args.track_decode_scale
+        })
+        result = response.get_json() or {}
+        if response.status_code != 200:
+            raise RuntimeError(result.get('error', f'HTTP {response.status_code}'))
+
+        # The overlay moves right at a known speed, so every tracked position can be checked.
+        # Frame numbers count extracted frames, which have the app's fixed rate, not --fps
+        extraction_fps = float(self.app.EXTRACTION_FRAME_RATE)
+        errors = [
+            ((entry['x'] - (rect_x + speed * entry['frame'] / extraction_fps)) ** 2 + (entry['y'] - rect_y) ** 2) ** 0.5
+            for entry in result.get('tracking_results', [])
+        ]
+        self.details = {
+            'decode_scale': result.get('decode_scale'),
+            'mean_error_px': round(sum(errors) / len(errors), 2) if errors else None,
+            'max_error_px': round(max(errors), 2) if errors else None
+        }
+        return result.get('processed_frames', 0)
+
+    def run(self, name):
+        """Time one benchmark, returning seconds, frames, fps and peak memory"""
+        self.details = {}
+        with PeakMemorySampler() as sampler:
+            start = time.perf_counter()
+            frames = getattr(self, f'bench_{name}')()
+            seconds = time.perf_counter() - start
+        return {
+            'seconds': round(seconds, 3),
+            'frames': frames,
+            'fps': round(frames / seconds, 2) if seconds > 0 else None,
+            'peak_memory_mb': round(sampler.peak_bytes / 1024 / 1024, 1),
+            **self.details
+        }
+
+def git_revision():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def summarize(results):
+    """Median of the repeats of each benchmark"""
+    summary = {}
+    for name, runs in results.items():
+        ok = sorted((run for run in runs if 'error' not in run), key=lambda run: run['seconds'])
+        if ok:
+            summary[name] = ok[len(ok) // 2]
+        else:
+            summary[name] = {'error': runs[-1]['error']}
+    return summary
+
+def print_comparison(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('revision')} ({baseline_path}):")
+    for name, result in current['summary'].items():
+        before = baseline.get('summary', {}).get(name, {})
+        if 'seconds' not in result or 'seconds' not in before:
+            print(f"  {name:8s} not comparable")
+            continue
+        change = (result['seconds'] - before['seconds']) / before['seconds'] * 100 if before['seconds'] else 0.0
+        print(f"  {name:8s} {before['seconds']:8.2f}s -> {result['seconds']:8.2f}s ({change:+.1f}%), "
+              f"peak memory {before['peak_memory_mb']:.0f}MB -> {result['peak_memory_mb']:.0f}MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--resolution', type=parse_resolution, default=(1280, 720), help='Video size, e.g. 1920x1080')
+    parser.add_argument('--duration', type=float, default=10, help='Video length in seconds')
+    parser.add_argument('--fps', type=int, default=30, help='Video frame rate')
+    parser.add_argument('--source', choices=('testsrc2', 'mandelbrot'), default='testsrc2', help='ffmpeg test source')
+    parser.add_argument('--no-text', dest='text', action='store_false', help='Skip the text overlays (disables tracking)')
+    parser.add_argument('--rects', type=int, default=3, help='Number of rectangles in the timeline')
+    parser.add_argument('--move-every', type=int, default=10, help='Frames between rectangle moves')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the rectangle timeline')
+    parser.add_argument('--blur-radius', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4, help='Blur workers for the process benchmark')
+    parser.add_argument('--codec', default='libx264', help='Video codec for export and preview')
+    parser.add_argument('--encode-mode', choices=('pipelined', 'chunked'), default='pipelined')
+    parser.add_argument('--track-frames', type=int, default=60, help='Frames to track')
+    parser.add_argument('--track-decode-scale', choices=('auto', '1', '2', '4'), default='auto',
+                        help='Tracking decode scale, 1 for the full-resolution path')
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help='Comma separated benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per benchmark, the median is reported')
+    parser.add_argument('--workdir', help='Working directory (default: a temporary one, removed afterwards)')
+    parser.add_argument('--output', help='Result file (default: benchmark_results/<time>_<revision>.json)')
+    parser.add_argument('--compare', help='Earlier result file to compare against')
+    args = parser.parse_args()
+
+    selected = [name for name in args.only.split(',') if name]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    # Every other benchmark works on the extracted frames
+    if 'extract' not in selected:
+        selected.insert(0, 'extract')
+
+    # Paths given on the command line are relative to where the benchmark was started
+    args.output = os.path.abspath(args.output) if args.output else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='videoeditor-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    revision = git_revision()
+
+    # The app resolves data/, frames/ and exports/ relative to the working directory
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    import_start = time.perf_counter()
+    import app as app_module
+    import_seconds = time.perf_counter() - import_start
+
+    width, height = args.resolution
+    video_name = f'bench_{args.source}_{width}x{height}_{args.duration:g}s.mp4'
+    print(f"Generating {video_name} in {workdir}")
+    generate_video(os.path.join(app_module.UPLOAD_FOLDER, video_name), args)
+
+    runner = BenchmarkRunner(app_module, args, video_name)
+    results = {name: [] for name in selected}
+    try:
+        for name in selected:
+            for attempt in range(args.repeat):
+                try:
+                    result = runner.run(name)
+                except Exception as e:
+                    result = {'error': str(e)}
+                results[name].append(result)
+                print(f"{name:8s} run {attempt + 1}: {result}")
+                if name == 'extract' and 'error' in result:
+                    raise SystemExit('Frame extraction failed, nothing else can run')
+    finally:
+        if not args.workdir:
+            os.chdir(REPO_DIR)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'revision': revision,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'resolution': f'{width}x{height}', 'duration': args.duration, 'fps': args.fps, 'source': args.source,
+            'text': args.text, 'rects': args.rects, 'move_every': args.move_every, 'seed': args.seed,
+            'blur_radius': args.blur_radius, 'workers': args.workers, 'codec': args.codec,
+            'encode_mode': args.encode_mode, 'track_frames': args.track_frames,
+            'track_decode_scale': args.track_decode_scale, 'repeat': args.repeat
+        },
+        'machine': {
+            'platform': platform.platform(), 'python': platform.python_version(),
+            'cpu_count': os.cpu_count(), 'memory_mb': round(psutil.virtual_memory().total / 1024 / 1024)
+        },
+        'app_import_seconds': round(import_seconds, 3),
+        'runs': results,
+        'summary': summarize(results)
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(report, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""Load-test harness that replays editor traffic against a running server
+
+Each simulated editor scrubs through the video in /get_frame bursts, reloads
+the timeline (rectangle data plus a batch of keyframes), autosaves its
+rectangles and polls job progress, with think time in between. Latency
+percentiles and throughput are reported per route:
+
+    python app.py &
+    python loadtest.py --video sample.mp4 --users 8 --duration 60
+    python loadtest.py --video sample.mp4 --users 8 --compare loadtest_results/<earlier run>.json
+
+Frames must already be extracted for the video. Autosaves are written under a
+per-user name (exports/rectangles_loadtest_u<N>_<video>.json) so real
+rectangle data is never overwritten.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FOLDER = os.path.join(REPO_DIR, 'loadtest_results')
+PERCENTILES = (50, 90, 95, 99)
+REQUEST_TIMEOUT = 30
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+class RouteStats:
+    """Latencies, status codes and bytes per route, shared by all simulated users"""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, status, size):
+        with self._lock:
+            entry = self._routes.setdefault(route, {'latencies': [], 'statuses': {}, 'errors': 0, 'bytes': 0})
+            entry['latencies'].append(seconds)
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+            entry['bytes'] += size
+            if not isinstance(status, int) or status >= 400:
+                entry['errors'] += 1
+
+    def summary(self, elapsed):
+        with self._lock:
+            routes = {route: dict(entry, latencies=sorted(entry['latencies'])) for route, entry in self._routes.items()}
+        report = {}
+        for route, entry in sorted(routes.items()):
+            latencies = entry['latencies']
+            report[route] = {
+                'requests': len(latencies),
+                'errors': entry['errors'],
+                'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+                'mb_per_second': round(entry['bytes'] / elapsed / 1024 / 1024, 2) if elapsed > 0 else None,
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+                'statuses': {str(status): count for status, count in entry['statuses'].items()},
+                **{f'p{pct}_ms': round(percentile(latencies, pct) * 1000, 2) if latencies else None for pct in PERCENTILES}
+            }
+        return report
+
+class EditorUser(threading.Thread):
+    """One simulated editor session"""
+
+    def __init__(self, user_id, args, video_info, stats, deadline):
+        super().__init__(name=f'editor-{user_id}', daemon=True)
+        self.user_id = user_id
+        self.args = args
+        self.total_frames = video_info['total_frames']
+        self.frame_width = video_info.get('width') or 0
+        self.stats = stats
+        self.deadline = deadline
+        self.rng = random.Random(args.seed + user_id)
+        self.position = self.rng.randrange(self.total_frames)
+        self.frame_rectangles = self.build_rectangles()
+        self.save_name = f'loadtest_u{user_id}_{args.video}'
+
+    def build_rectangles(self):
+        """Frame rectangles in the editor's autosave format, args.rects rectangles over args.keyframes frames"""
+        frame_rectangles = {}
+        keyframes = sorted(self.rng.sample(range(self.total_frames), min(self.args.keyframes, self.total_frames)))
+        for i in range(self.args.rects):
+            rect_id = f'rect_{self.user_id}_{i}'
+            for n, frame in enumerate(keyframes):
+                rect = {'x': self.rng.randrange(0, 1200), 'y': self.rng.randrange(0, 600), 'width': 120, 'height': 60}
+                if n == 0:
+                    rect['rectangleId'] = rect_id
+                else:
+                    rect['rectangleMoved'] = rect_id
+                frame_rectangles.setdefault(str(frame), []).append(rect)
+        return frame_rectangles
+
+    def request(self, route, path, body=None):
+        url = self.args.url.rstrip('/') + path
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'} if data else {})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
+                size = len(response.read())
+                status = response.status
+        except urllib.error.HTTPError as e:
+            size = len(e.read())
+            status = e.code
+        except (urllib.error.URLError, OSError) as e:
+            size = 0
+            status = type(e).__name__
+        self.stats.record(route, time.perf_counter() - start, status, size)
+
+    def frame_query(self, **params):
+        if self.args.display_width and (not self.frame_width or self.args.display_width < self.frame_width):
+            params['width'] = self.args.display_width
+        return '?' + urllib.parse.urlencode(params) if params else ''
+
+    def scrub_burst(self):
+        """Drag the playhead: a run of consecutive frame requests in one direction"""
+        direction = self.rng.choice((-1, 1))
+        step = self.rng.choice((1, 1, 1, 2, 5))
+        for _ in range(self.rng.randint(self.args.burst // 2 or 1, self.args.burst)):
+            self.position = min(max(0, self.position + direction * step), self.total_frames - 1)
+            self.request('/get_frame', f'/get_frame/{self.video}/{self.position}' + self.frame_query(direction=direction))
+            time.sleep(self.args.frame_interval)
+
+    def load_timeline(self):
+        """Reload rectangle data and prefetch keyframes in one batch, like opening the video"""
+        self.request('/load_rectangles', f'/load_rectangles/{self.video}')
+        indices = sorted(int(frame) for frame in self.frame_rectangles)[:20]
+        self.request('/get_frames', f'/get_frames/{self.video}' + self.frame_query(indices=','.join(map(str, indices))))
+
+    def autosave(self):
+        self.request('/save_rectangles', '/save_rectangles', {
+            'video_name': self.save_name,
+            'all_frame_rectangles': self.frame_rectangles,
+            'timestamp': datetime.now().isoformat(),
+            'auto_save': True
+        })
+
+    def poll_progress(self):
+        self.request('/tracking_progress', '/tracking_progress')
+        self.request('/scheduler_status', '/scheduler_status')
+        if self.args.job_id:
+            self.request('/export_progress', f'/export_progress/{self.args.job_id}')
+
+    @property
+    def video(self):
+        return urllib.parse.quote(self.args.video)
+
+    def run(self):
+        next_save = time.monotonic() + self.rng.uniform(0, self.args.autosave_interval)
+        next_poll = time.monotonic() + self.rng.uniform(0, self.args.poll_interval)
+        self.load_timeline()
+        while time.monotonic() < self.deadline:
+            now = time.monotonic()
+            if now >= next_save:
+                self.autosave()
+                next_save = now + self.args.autosave_interval
+            elif now >= next_poll:
+                self.poll_progress()
+                next_poll = now + self.args.poll_interval
+            elif self.rng.random() < self.args.timeline_share:
+                self.load_timeline()
+            else:
+                self.scrub_burst()
+            time.sleep(self.rng.uniform(0, self.args.think_time))
+
+def fetch_video_info(args):
+    url = args.url.rstrip('/') + f'/get_video_info/{urllib.parse.quote(args.video)}'
+    with urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT) as response:
+        info = json.load(response)
+    if 'error' in info:
+        raise SystemExit(f"Could not read video info: {info['error']}")
+    return info
+
+def print_report(report):
+    header = f"{'route':20s} {'reqs':>7s} {'err':>5s} {'req/s':>8s} " + ' '.join(f'{f"p{p}":>8s}' for p in PERCENTILES) + f" {'max':>8s}"
+    print(header)
+    print('-' * len(header))
+    for route, entry in report['routes'].items():
+        print(f"{route:20s} {entry['requests']:7d} {entry['errors']:5d} {entry['throughput_rps']:8.1f} "
+              + ' '.join(f"{entry[f'p{p}_ms']:8.1f}" for p in PERCENTILES) + f" {entry['max_ms']:8.1f}")
+    print(f"\nTotal: {report['total_requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['total_rps']} req/s) with {report['config']['users']} users; latencies in ms")
+
+def print_comparison(report, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline['config']['users']} users):")
+    for route, entry in report['routes'].items():
+        before = baseline['routes'].get(route)
+        if not before or not before.get('p95_ms'):
+            continue
+        change = (entry['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+        print(f"  {route:20s} p95 {before['p95_ms']:8.1f} -> {entry['p95_ms']:8.1f} ms ({change:+.1f}%), "
+              f"{before['throughput_rps']:.1f} -> {entry['throughput_rps']:.1f} req/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Server base URL')
+    parser.add_argument('--video', required=True, help='Video name with extracted frames')
+    parser.add_argument('--users', type=int, default=4, help='Concurrent simulated editors')
+    parser.add_argument('--duration', type=float, default=30, help='Test length in seconds')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which users are started')
+    parser.add_argument('--burst', type=int, default=30, help='Maximum frames per scrub burst')
+    parser.add_argument('--frame-interval', type=float, default=1 / 30, help='Seconds between frames while scrubbing')
+    parser.add_argument('--display-width', type=int, default=1280, help='Requested frame width, 0 for full size')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Maximum pause between actions')
+    parser.add_argument('--timeline-share', type=float, default=0.1, help='Share of actions that reload the timeline')
+    parser.add_argument('--autosave-interval', type=float, default=10, help='Seconds between autosaves per user')
+    parser.add_argument('--poll-interval', type=float, default=1, help='Seconds between progress polls per user')
+    parser.add_argument('--rects', type=int, default=5, help='Rectangles per autosave')
+    parser.add_argument('--keyframes', type=int, default=50, help='Keyframes per rectangle in autosaves')
+    parser.add_argument('--job-id', help='Also poll /export_progress for this job')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Result file (default: loadtest_results/<time>_<users>u.json)')
+    parser.add_argument('--compare', help='Earlier result file to compare against')
+    args = parser.parse_args()
+
+    video_info = fetch_video_info(args)
+    stats = RouteStats()
+    start = time.monotonic()
+    deadline = start + args.ramp_up + args.duration
+    users = []
+    print(f"Starting {args.users} editors against {args.url} for {args.video} ({video_info['total_frames']} frames)")
+    for user_id in range(args.users):
+        user = EditorUser(user_id, args, video_info, stats, deadline)
+        user.start()
+        users.append(user)
+        if args.users > 1:
+            time.sleep(args.ramp_up / (args.users - 1))
+    for user in users:
+        user.join()
+    elapsed = time.monotonic() - start
+
+    routes = stats.summary(elapsed)
+    total_requests = sum(entry['requests'] for entry in routes.values())
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'elapsed_seconds': round(elapsed, 2),
+        'total_requests': total_requests,
+        'total_rps': round(total_requests / elapsed, 2),
+        'routes': routes
+    }
+    print_report(report)
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{args.users}u.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        print_comparison(report, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""OCR worker process used by the OCR pool in app.py
+
+Runs as a separate script so the heavy easyocr/torch stack lives outside the
+web process and is loaded once per worker. The parent writes pickled messages
+to stdin and reads pickled replies from stdout:
+
+    -> ('batch', [(request_id, image), ...])      <- ('results', [(request_id, results or None, error or None), ...])
+    -> ('stop',)
+    <- ('ready', load_seconds) once the reader is built, or ('failed', message)
+
+Results are easyocr readtext tuples converted to plain Python types.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+def to_plain(results):
+    """Convert readtext output (numpy coordinates and confidences) to plain Python"""
+    return [
+        ([[float(x), float(y)] for x, y in bbox], text, float(confidence))
+        for bbox, text, confidence in results
+    ]
+
+def read_batch(reader, images):
+    """OCR several images, batched through the detector when they share a shape"""
+    if len(images) > 1 and len({image.shape for image in images}) == 1:
+        return reader.readtext_batched(images)
+    return [reader.readtext(image) for image in images]
+
+def main():
+    parser = argparse.ArgumentParser(description='OCR worker process')
+    parser.add_argument('--languages', default='en')
+    parser.add_argument('--threads', type=int, default=0, help='Torch CPU threads, 0 for the default')
+    args = parser.parse_args()
+
+    # Keep a private handle on stdout for the protocol and send everything else
+    # libraries print (download progress, CPU warnings) to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    protocol_in = sys.stdin.buffer
+
+    def send(message):
+        pickle.dump(message, protocol_out, protocol=pickle.HIGHEST_PROTOCOL)
+        protocol_out.flush()
+
+    start = time.perf_counter()
+    try:
+        import easyocr
+        if args.threads > 0:
+            import torch
+            torch.set_num_threads(args.threads)
+        reader = easyocr.Reader(args.languages.split(','))
+    except Exception as e:
+        send(('failed', f'{type(e).__name__}: {e}'))
+        return 1
+    send(('ready', time.perf_counter() - start))
+
+    while True:
+        try:
+            message = pickle.load(protocol_in)
+        except EOFError:
+            return 0  # Parent went away
+        if message[0] == 'stop':
+            return 0
+
+        requests = message[1]
+        try:
+            outputs = read_batch(reader, [image for _, image in requests])
+            replies = [(request_id, to_plain(output), None) for (request_id, _), output in zip(requests, outputs)]
+        except Exception:
+            # Retry one by one so a single bad image only fails its own request
+            replies = []
+            for request_id, image in requests:
+                try:
+                    replies.append((request_id, to_plain(reader.readtext(image)), None))
+                except Exception as e:
+                    replies.append((request_id, None, f'{type(e).__name__}: {e}'))
+        send(('results', replies))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,15 @@ let selectedRect = null;
 let resizeHandle = null;
 let dragOffset = { x: 0, y: 0 };
 let imageScale = { x: 1, y: 1, offsetX: 0, offsetY: 0 };
+// Full-resolution frame size. Frames may be served downscaled for display, but
+// rectangle coordinates always stay in this pixel space.
+let frameSourceSize = { width: 0, height: 0 };
+const THUMBNAIL_WIDTH = 128;
+
+// Frames fetched ahead of time through /get_frames, keyed by frame index
+const prefetchedFrames = new Map();
+const PREFETCH_CACHE_LIMIT = 32;
+const KEYFRAME_PREFETCH_COUNT = 3;
 
 // Trim markers
 let trimStartFrame = null; // Frame to start export from
@@ -20,6 +29,9 @@ let trimEndFrame = null;   // Frame to end export at
 // Video playback state
 let isPlaying = false;
 let playbackInterval = null;
+let playbackStartFrame = 0;
+let playbackStartTime = 0;
+let playbackMaxFPS = 60; // Server's playback stream cap, updated when video loads
 
 // Debug: log whenever frameRectangles is modified
 console.log('Initialized frameRectangles:', frameRectangles);
@@ -57,7 +69,11 @@ async function loadVideo() {
         // First get video info to get FPS
         const videoInfoResponse = await fetch(`/get_video_info/${currentVideo}`);
         const videoInfo = await videoInfoResponse.json();
-        videoFPS = videoInfo.fps || 30; // Use actual FPS or default to 30
+        // Frame indices refer to the extracted frames, which have their own fixed rate
+        videoFPS = videoInfo.extraction_fps || videoInfo.fps || 30;
+        playbackMaxFPS = videoInfo.playback_max_fps || playbackMaxFPS;
+        frameSourceSize = { width: videoInfo.width || 0, height: videoInfo.height || 0 };
+        prefetchedFrames.clear();
 
         // Then extract frames (this returns immediately with job ID for new extractions)
         const response = await fetch(`/extract_frames/${currentVideo}`);
@@ -113,9 +129,13 @@ function finishVideoLoad(data) {
     }, 200);
 }
 
+let currentExtractionJobId = null;
+
 function showExtractionProgress(jobId) {
     const modal = document.getElementById('extractionModal');
     modal.style.display = 'flex';
+    currentExtractionJobId = jobId;
+    document.getElementById('cancelExtraction').disabled = false;
 
     // Reset progress elements
     document.querySelectorAll('.extraction-step').forEach(step => {
@@ -127,8 +147,8 @@ function showExtractionProgress(jobId) {
     document.getElementById('extractionSpeed').textContent = '-';
     document.getElementById('extractionProgressText').textContent = 'Starting...';
 
-    // Start polling for progress
-    monitorExtractionProgress(jobId);
+    // Follow progress over Server-Sent Events, polling if the stream is unavailable
+    watchJobEvents(jobId, updateExtractionFromJob, () => monitorExtractionProgress(jobId));
 }
 
 async function monitorExtractionProgress(jobId) {
@@ -142,71 +162,132 @@ async function monitorExtractionProgress(jobId) {
             return;
         }
 
-        // Update progress bar
-        const progressBar = document.getElementById('extractionProgressBarFill');
-        progressBar.style.width = job.progress + '%';
-
-        // Update details
-        if (job.total_frames) {
-            document.getElementById('totalFramesCount').textContent = job.total_frames.toLocaleString();
-        }
-        if (job.extracted_frames) {
-            document.getElementById('extractedFramesCount').textContent = job.extracted_frames.toLocaleString();
-        }
-        if (job.speed) {
-            document.getElementById('extractionSpeed').textContent = job.speed;
+        if (!updateExtractionFromJob(job)) {
+            // Continue polling
+            setTimeout(() => monitorExtractionProgress(jobId), 500);
         }
-        document.getElementById('extractionProgressText').textContent = job.message || 'Processing...';
 
-        // Update step status
-        const steps = document.querySelectorAll('.extraction-step');
-        steps.forEach(step => step.classList.remove('active', 'completed'));
+    } catch (error) {
+        document.getElementById('extractionModal').style.display = 'none';
+        showStatus('Error monitoring extraction progress: ' + error.message, 'error');
+    }
+}
 
-        if (job.status === 'analyzing') {
-            document.getElementById('extractStep1').classList.add('active');
-        } else if (job.status === 'extracting') {
-            document.getElementById('extractStep1').classList.add('completed');
-            document.getElementById('extractStep2').classList.add('active');
-        } else if (job.status === 'completing') {
-            document.getElementById('extractStep1').classList.add('completed');
-            document.getElementById('extractStep2').classList.add('completed');
-            document.getElementById('extractStep3').classList.add('active');
-        }
+// Update the extraction dialog from a job state; returns true once the job has finished
+function updateExtractionFromJob(job) {
+    // Update progress bar
+    const progressBar = document.getElementById('extractionProgressBarFill');
+    progressBar.style.width = job.progress + '%';
 
-        if (job.status === 'completed') {
-            // Extraction completed
-            steps.forEach(step => step.classList.add('completed'));
-            
-            // Use the data from the completed job
-            totalFrames = job.total;
-            const completedData = {
-                frames: job.frames_info,
-                total: job.total,
-                cached: false,
-                message: job.message
-            };
+    // Update details
+    if (job.total_frames) {
+        document.getElementById('totalFramesCount').textContent = job.total_frames.toLocaleString();
+    }
+    if (job.extracted_frames) {
+        document.getElementById('extractedFramesCount').textContent = job.extracted_frames.toLocaleString();
+    }
+    if (job.speed) {
+        document.getElementById('extractionSpeed').textContent = job.speed;
+    }
+    let extractionMessage = job.message || 'Processing...';
+    if (job.eta_seconds) {
+        extractionMessage += ` (about ${formatDuration(job.eta_seconds)} remaining)`;
+    }
+    document.getElementById('extractionProgressText').textContent = extractionMessage;
 
-            // Hide modal after a short delay
-            setTimeout(() => {
-                document.getElementById('extractionModal').style.display = 'none';
-                finishVideoLoad(completedData);
-            }, 1000);
+    // Update step status
+    const steps = document.querySelectorAll('.extraction-step');
+    steps.forEach(step => step.classList.remove('active', 'completed'));
+
+    if (job.status === 'analyzing') {
+        document.getElementById('extractStep1').classList.add('active');
+    } else if (job.status === 'extracting') {
+        document.getElementById('extractStep1').classList.add('completed');
+        document.getElementById('extractStep2').classList.add('active');
+    } else if (job.status === 'completing') {
+        document.getElementById('extractStep1').classList.add('completed');
+        document.getElementById('extractStep2').classList.add('completed');
+        document.getElementById('extractStep3').classList.add('active');
+    }
+
+    if (job.status === 'completed') {
+        // Extraction completed
+        steps.forEach(step => step.classList.add('completed'));
+        
+        // Use the data from the completed job
+        totalFrames = job.total;
+        const completedData = {
+            total: job.total,
+            cached: false,
+            message: job.message
+        };
 
-        } else if (job.status === 'error') {
-            // Error occurred
+        // Hide modal after a short delay
+        setTimeout(() => {
             document.getElementById('extractionModal').style.display = 'none';
-            showStatus('Error during frame extraction: ' + (job.error || 'Unknown error'), 'error');
-        } else {
-            // Continue polling
-            setTimeout(() => monitorExtractionProgress(jobId), 500);
+            finishVideoLoad(completedData);
+        }, 1000);
+
+    } else if (job.status === 'cancelled') {
+        document.getElementById('extractionModal').style.display = 'none';
+        showStatus('Frame extraction cancelled', 'info');
+    } else if (job.status === 'error' || job.status === 'interrupted') {
+        // Error occurred
+        document.getElementById('extractionModal').style.display = 'none';
+        showStatus('Error during frame extraction: ' + (job.error || job.message || 'Unknown error'), 'error');
+    } else {
+        return false;
+    }
+    return true;
+}
+
+const JOB_TERMINAL_STATUSES = ['completed', 'error', 'cancelled', 'interrupted'];
+
+// Follow a job over Server-Sent Events, merging the compact deltas into one job
+// object passed to onUpdate. Calls fallback() instead if the stream can't be used.
+function watchJobEvents(jobId, onUpdate, fallback) {
+    if (!window.EventSource) {
+        fallback();
+        return () => {};
+    }
+    const job = {};
+    let received = false;
+    const source = new EventSource(`/job_events/${jobId}`);
+    source.addEventListener('progress', event => {
+        received = true;
+        Object.assign(job, JSON.parse(event.data).changes);
+        onUpdate(job);
+        if (JOB_TERMINAL_STATUSES.includes(job.status)) {
+            source.close();
         }
+    });
+    source.addEventListener('end', () => source.close());
+    source.onerror = () => {
+        // EventSource reconnects by itself; only fall back if the stream never worked
+        if (!received) {
+            source.close();
+            fallback();
+        }
+    };
+    return () => source.close();
+}
 
+async function cancelExtraction() {
+    if (!currentExtractionJobId) return;
+    document.getElementById('cancelExtraction').disabled = true;
+    try {
+        await fetch(`/cancel_extraction/${currentExtractionJobId}`, { method: 'POST' });
     } catch (error) {
-        document.getElementById('extractionModal').style.display = 'none';
-        showStatus('Error monitoring extraction progress: ' + error.message, 'error');
+        console.error('Error cancelling extraction:', error);
     }
 }
 
+function formatDuration(seconds) {
+    if (seconds < 60) return `${Math.ceil(seconds)}s`;
+    const minutes = Math.floor(seconds / 60);
+    return `${minutes}m ${Math.round(seconds % 60)}s`;
+}
+
 function formatTime(seconds) {
     const minutes = Math.floor(seconds / 60);
     const secs = Math.floor(seconds % 60);
@@ -233,7 +314,7 @@ function createTimeline() {
         frameDiv.onclick = () => showFrame(i);
 
         const img = document.createElement('img');
-        img.src = `/get_frame/${currentVideo}/${i}`;
+        img.src = getFrameUrl(i, THUMBNAIL_WIDTH, false);
         img.alt = `Frame ${i}`;
 
         // Calculate time for this frame
@@ -255,7 +336,77 @@ function updateTimeline() {
     }
 }
 
-function showFrame(frameIndex) {
+function getDisplayFrameWidth() {
+    // Request roughly as many pixels as the display can actually show
+    const frameDisplay = document.getElementById('frameDisplay');
+    const containerWidth = frameDisplay ? frameDisplay.getBoundingClientRect().width : 0;
+    if (!containerWidth) return 0;
+    return Math.round(containerWidth * (window.devicePixelRatio || 1));
+}
+
+function shouldResizeFrame(width) {
+    // Only ask for a resized variant when it is actually smaller than the source
+    return width > 0 && (!frameSourceSize.width || width < frameSourceSize.width);
+}
+
+function getFrameUrl(frameIndex, width = 0, readAhead = true) {
+    const params = new URLSearchParams();
+    if (shouldResizeFrame(width)) {
+        params.set('width', width);
+    }
+    if (!readAhead) {
+        params.set('readahead', 0);
+    }
+    const query = params.toString();
+    return `/get_frame/${currentVideo}/${frameIndex}` + (query ? `?${query}` : '');
+}
+
+async function prefetchFrames(indices) {
+    // Fetch several frames in one request so later jumps are served from memory
+    const width = getDisplayFrameWidth();
+    const wanted = indices.filter(i => i >= 0 && i < totalFrames &&
+        !(prefetchedFrames.has(i) && prefetchedFrames.get(i).width === width));
+    if (wanted.length === 0) return;
+
+    const params = new URLSearchParams({ indices: wanted.join(',') });
+    if (shouldResizeFrame(width)) {
+        params.set('width', width);
+    }
+
+    try {
+        const response = await fetch(`/get_frames/${currentVideo}?${params}`);
+        const data = await response.json();
+        (data.frames || []).forEach(frame => {
+            prefetchedFrames.delete(frame.index);
+            prefetchedFrames.set(frame.index, {
+                width: width,
+                url: `data:${frame.mimetype};base64,${frame.data}`
+            });
+            if (prefetchedFrames.size > PREFETCH_CACHE_LIMIT) {
+                prefetchedFrames.delete(prefetchedFrames.keys().next().value);
+            }
+        });
+    } catch (error) {
+        console.warn('Frame prefetch failed:', error);
+    }
+}
+
+function prefetchKeyframesAround(frameIndex, direction) {
+    const framesWithChanges = getFramesWithChanges();
+    const upcoming = direction > 0 ?
+        framesWithChanges.filter(f => f > frameIndex).slice(0, KEYFRAME_PREFETCH_COUNT) :
+        framesWithChanges.filter(f => f < frameIndex).slice(-KEYFRAME_PREFETCH_COUNT);
+    prefetchFrames(upcoming);
+}
+
+function getSourceFrameSize(frameImage) {
+    if (frameSourceSize.width && frameSourceSize.height) {
+        return frameSourceSize;
+    }
+    return { width: frameImage.naturalWidth, height: frameImage.naturalHeight };
+}
+
+function showFrame(frameIndex, fromStream = false) {
     console.log(`=== SHOWING FRAME ${frameIndex} ===`);
     console.log(`Current rectangles data:`, frameRectangles);
 
@@ -264,23 +415,34 @@ function showFrame(frameIndex) {
     // Update trim display when frame changes
     updateTrimDisplay();
 
-    const img = document.getElementById('frameImage');
-    const frameUrl = `/get_frame/${currentVideo}/${frameIndex}`;
-    console.log(`Loading frame from: ${frameUrl}`);
-    img.src = frameUrl;
-
-    // Add error handler for the image
-    img.onerror = function () {
-        console.error(`Failed to load frame ${frameIndex}`);
-        showStatus(`Failed to load frame ${frameIndex + 1}`, 'error');
-    };
+    // Any explicit navigation while playing ends the stream
+    if (!fromStream && isPlaying) {
+        stopPlayback(false);
+    }
+
+    // During playback the image is fed by the MJPEG stream; only the overlay is updated here
+    if (!fromStream) {
+        const img = document.getElementById('frameImage');
+        const displayWidth = getDisplayFrameWidth();
+        const prefetched = prefetchedFrames.get(frameIndex);
+        const frameUrl = prefetched && prefetched.width === displayWidth ?
+            prefetched.url : getFrameUrl(frameIndex, displayWidth);
+        console.log(`Loading frame from: ${prefetched && frameUrl === prefetched.url ? 'prefetch cache' : frameUrl}`);
+        img.src = frameUrl;
+
+        // Add error handler for the image
+        img.onerror = function () {
+            console.error(`Failed to load frame ${frameIndex}`);
+            showStatus(`Failed to load frame ${frameIndex + 1}`, 'error');
+        };
 
-    img.onload = function () {
-        console.log(`Successfully loaded frame ${frameIndex}`);
-        // Recalculate image scale when new frame loads
-        imageScale = calculateImageScale();
-        updateFrameSizeDisplay();
-    };
+        img.onload = function () {
+            console.log(`Successfully loaded frame ${frameIndex}`);
+            // Recalculate image scale when new frame loads
+            imageScale = calculateImageScale();
+            updateFrameSizeDisplay();
+        };
+    }
 
     document.querySelectorAll('.timeline-frame').forEach((frame, index) => {
         const actualIndex = index * Math.max(1, Math.floor(totalFrames / 50));
@@ -321,7 +483,9 @@ function updateFrameSizeDisplay() {
         const displayedWidth = Math.round(scale.displayedWidth);
         const displayedHeight = Math.round(scale.displayedHeight);
 
-        frameSizeInfo.textContent = `Container: ${containerWidth}×${containerHeight} | Image: ${displayedWidth}×${displayedHeight} | Original: ${frameImage.naturalWidth}×${frameImage.naturalHeight}`;
+        const sourceSize = getSourceFrameSize(frameImage);
+
+        frameSizeInfo.textContent = `Container: ${containerWidth}×${containerHeight} | Image: ${displayedWidth}×${displayedHeight} | Original: ${sourceSize.width}×${sourceSize.height}`;
     } else {
         frameSizeInfo.textContent = `Container: ${containerWidth}×${containerHeight}`;
     }
@@ -335,8 +499,9 @@ function calculateImageScale() {
         return { x: 1, y: 1, offsetX: 0, offsetY: 0 };
     }
 
+    const sourceSize = getSourceFrameSize(frameImage);
     const containerRect = frameDisplay.getBoundingClientRect();
-    const imageAspect = frameImage.naturalWidth / frameImage.naturalHeight;
+    const imageAspect = sourceSize.width / sourceSize.height;
     const containerAspect = containerRect.width / containerRect.height;
 
     let displayedWidth, displayedHeight, offsetX, offsetY;
@@ -356,8 +521,8 @@ function calculateImageScale() {
     }
 
     return {
-        x: frameImage.naturalWidth / displayedWidth,
-        y: frameImage.naturalHeight / displayedHeight,
+        x: sourceSize.width / displayedWidth,
+        y: sourceSize.height / displayedHeight,
         offsetX: offsetX,
         offsetY: offsetY,
         displayedWidth: displayedWidth,
@@ -1854,6 +2019,21 @@ function updateExportDetails(frameCount, rectCount, audioStatus) {
 }
 
 function startProgressPolling() {
+    if (stopJobEvents) {
+        stopJobEvents();
+    }
+    const jobId = currentJobId;
+    stopJobEvents = watchJobEvents(jobId, job => {
+        if (jobId !== currentJobId) return;
+        updateProgressFromJob(job);
+        if (JOB_TERMINAL_STATUSES.includes(job.status)) {
+            stopJobEvents = null;
+            handleJobCompletion(job);
+        }
+    }, startProgressPollingTimer);
+}
+
+function startProgressPollingTimer() {
     if (progressPollingInterval) {
         clearInterval(progressPollingInterval);
     }
@@ -1874,7 +2054,7 @@ function startProgressPolling() {
             updateProgressFromJob(job);
             
             // Stop polling if job is finished
-            if (job.status === 'completed' || job.status === 'error' || job.status === 'cancelled') {
+            if (job.status === 'completed' || job.status === 'error' || job.status === 'cancelled' || job.status === 'interrupted') {
                 clearInterval(progressPollingInterval);
                 progressPollingInterval = null;
                 handleJobCompletion(job);
@@ -1890,7 +2070,10 @@ function updateProgressFromJob(job) {
     const status = job.status;
     let progress = job.progress || 0;
     
-    if (status === 'initializing') {
+    if (status === 'queued') {
+        const eta = job.eta_seconds ? ` - starts in about ${formatDuration(job.eta_seconds)}` : '';
+        updateExportProgress(5, `Waiting in queue (position ${job.queue_position})${eta}`);
+    } else if (status === 'initializing') {
         updateExportStep('step2', 'active');
         updateExportProgress(20, 'Initializing frame processing...');
     } else if (status === 'processing_frames') {
@@ -1898,6 +2081,14 @@ function updateProgressFromJob(job) {
         const processed = job.processed_frames || 0;
         const total = job.total_frames || 1;
         updateExportProgress(20 + (progress * 0.6), `Processing frames with blur... (${processed}/${total} - ${Math.round(progress)}%)`);
+    } else if (status === 'blur_encoding') {
+        // Blur and encode run concurrently; show both stages
+        updateExportStep('step2', 'active');
+        updateExportStep('step4', 'active');
+        const processed = job.processed_frames || 0;
+        const encoded = job.encoding_frame || 0;
+        const total = job.total_frames || 1;
+        updateExportProgress(20 + (progress * 0.78), `Blurring ${processed}/${total}, encoding ${encoded}/${total} frames`);
     } else if (status === 'encoding') {
         updateExportStep('step2', 'completed');
         updateExportStep('step3', 'completed', 'Frames processed');
@@ -1947,7 +2138,7 @@ function handleJobCompletion(job) {
             currentJobId = null;
         }, 2000);
         
-    } else if (job.status === 'error') {
+    } else if (job.status === 'error' || job.status === 'interrupted') {
         updateExportStep('step2', 'error');
         updateExportStep('step3', 'error');
         updateExportStep('step4', 'error');
@@ -1955,7 +2146,7 @@ function handleJobCompletion(job) {
         
         setTimeout(() => {
             hideExportModal();
-            showToast(job.error || 'Export failed', 'error');
+            showToast(job.error || job.message || 'Export failed', 'error');
             currentJobId = null;
         }, 2000);
         
@@ -2163,6 +2354,7 @@ async function previewBlurred() {
 
 let currentJobId = null;
 let progressPollingInterval = null;
+let stopJobEvents = null;
 
 async function exportBlurred() {
     // Show the export modal
@@ -2258,6 +2450,7 @@ async function exportBlurred() {
         const selectedCodec = codecSelect.value;
         const blurSelect = document.getElementById('blurAmount');
         const selectedBlur = parseInt(blurSelect.value);
+        const chunkedEncoding = document.getElementById('chunkedEncoding').checked;
 
         // Start the export job
         const response = await fetch('/export_blurred', {
@@ -2271,7 +2464,8 @@ async function exportBlurred() {
                 blur_radius: selectedBlur,  // Use selected blur amount
                 video_codec: selectedCodec, // Include selected codec
                 trim_start_frame: trimStartFrame, // Include trim start frame
-                trim_end_frame: trimEndFrame      // Include trim end frame
+                trim_end_frame: trimEndFrame,     // Include trim end frame
+                encode_mode: chunkedEncoding ? 'chunked' : 'single'
             })
         });
 
@@ -2457,29 +2651,60 @@ function navigateFrame(direction) {
     }
 }
 
+function getPlaybackFPS() {
+    // Same clamp as /stream_frames, so the overlay follows the streamed image
+    return Math.max(1, Math.min(videoFPS, playbackMaxFPS));
+}
+
+function startPlaybackStream(startFrame) {
+    // One long-lived MJPEG response replaces a /get_frame request per tick
+    const img = document.getElementById('frameImage');
+    img.onload = null;
+    img.onerror = null;
+    playbackStartFrame = startFrame;
+    playbackStartTime = performance.now();
+    img.src = `/stream_frames/${currentVideo}?start=${startFrame}&fps=${getPlaybackFPS()}&width=${getDisplayFrameWidth()}`;
+}
+
 function startPlayback() {
     if (totalFrames === 0) return;
     
     isPlaying = true;
-    const frameDelay = 1000 / videoFPS; // Convert FPS to milliseconds per frame
+    const playbackFPS = getPlaybackFPS();
+    const frameDelay = 1000 / playbackFPS; // Convert FPS to milliseconds per frame
+    
+    let startFrame = currentFrameIndex + 1;
+    if (startFrame >= totalFrames) {
+        startFrame = 0;
+    }
+    startPlaybackStream(startFrame);
     
+    // The server paces the stream on the wall clock, so the frame shown is derived from elapsed time
     playbackInterval = setInterval(() => {
-        let nextFrame = currentFrameIndex + 1;
+        const elapsed = (performance.now() - playbackStartTime) / 1000;
+        let nextFrame = playbackStartFrame + Math.floor(elapsed * playbackFPS);
         
         // Loop back to start when reaching the end
         if (nextFrame >= totalFrames) {
+            startPlaybackStream(0);
             nextFrame = 0;
         }
         
-        showFrame(nextFrame);
+        if (nextFrame !== currentFrameIndex) {
+            showFrame(nextFrame, true);
+        }
     }, frameDelay);
 }
 
-function stopPlayback() {
+function stopPlayback(showPausedFrame = true) {
     isPlaying = false;
     if (playbackInterval) {
         clearInterval(playbackInterval);
         playbackInterval = null;
+        // Close the stream and show the exact paused frame with a single fetch
+        if (showPausedFrame) {
+            showFrame(currentFrameIndex);
+        }
     }
 }
 
@@ -2592,6 +2817,7 @@ function navigateToPreviousChange() {
     }
 
     showFrame(previousChangeFrame);
+    prefetchKeyframesAround(previousChangeFrame, -1);
 
     // Show info about what's happening at this frame
     const rects = frameRectangles[previousChangeFrame] || [];
@@ -2652,6 +2878,7 @@ function navigateToNextChange() {
     }
 
     showFrame(nextChangeFrame);
+    prefetchKeyframesAround(nextChangeFrame, 1);
 
     // Show info about what's happening at this frame
     const rects = frameRectangles[nextChangeFrame] || [];
@@ -2707,6 +2934,48 @@ setTimeout(() => {
 
 loadVideos();
 checkFFmpegStatus();
+checkResumableExports();
+
+async function checkResumableExports() {
+    // Offer to resume exports that were cut short by a server restart
+    try {
+        const response = await fetch('/interrupted_jobs');
+        const interrupted = await response.json();
+        interrupted.filter(job => job.job_type === 'export').forEach(job => {
+            const started = new Date(job.created_at * 1000).toLocaleString();
+            showToastWithHTML(
+                `Export started ${started} was interrupted. ` +
+                `<button class="toast-action" onclick="resumeExport('${job.id}', this)">Resume</button>`,
+                'warning', 15000);
+        });
+    } catch (error) {
+        console.warn('Could not check for interrupted exports:', error);
+    }
+}
+
+async function resumeExport(jobId, button) {
+    if (button) {
+        removeToast(button.closest('.toast'));
+    }
+    showExportModal();
+    updateExportStep('step1', 'completed');
+    updateExportProgress(15, 'Resuming export...');
+
+    try {
+        const response = await fetch(`/resume_export/${jobId}`, { method: 'POST' });
+        const result = await response.json();
+        if (result.error) {
+            hideExportModal();
+            showToast(`Cannot resume export: ${result.error}`, 'error');
+            return;
+        }
+        currentJobId = result.job_id;
+        startProgressPolling();
+    } catch (error) {
+        hideExportModal();
+        showToast('Error resuming export: ' + error.message, 'error');
+    }
+}
 
 // Preview Link Functions
 function showPreviewLink(filename) {
@@ -2731,14 +3000,20 @@ function hidePreviewLink() {
 }
 
 // FFmpeg Status Check Function
-async function checkFFmpegStatus() {
+async function checkFFmpegStatus(polling = false) {
     try {
-        showToast('Checking FFmpeg installation...', 'info', 2000);
+        if (!polling) {
+            showToast('Checking FFmpeg installation...', 'info', 2000);
+        }
         
         const response = await fetch('/check_ffmpeg');
         const result = await response.json();
         
-        if (result.available) {
+        if (result.probing) {
+            // Encoder probes run in the background; ask again until they finish
+            showStatus(result.message, 'info');
+            setTimeout(() => checkFFmpegStatus(true), 1000);
+        } else if (result.available) {
             // Extract version number for cleaner display
             const versionMatch = result.version.match(/ffmpeg version ([\d\.\-\w]+)/i);
             const versionText = versionMatch ? versionMatch[1] : 'Unknown version';
@@ -2799,36 +3074,10 @@ function populateCodecDropdown(codecOptions) {
         console.log(`Added option: ${codec.name} (${codec.id})`);
     });
 
-    // Auto-select preferred codec with priority: NVIDIA H.264 > other hardware > software
-    let selectedOption = null;
-    
-    // First priority: NVIDIA NVENC H.264
-    const nvencH264 = Array.from(codecSelect.options).find(option => option.value === 'h264_nvenc');
-    if (nvencH264) {
-        selectedOption = nvencH264;
-        console.log('Auto-selected NVIDIA NVENC H.264 (highest priority)');
-    }
-    
-    // Second priority: Other hardware encoders
-    if (!selectedOption) {
-        const hardwareOptions = Array.from(codecSelect.options).filter(option => {
-            const codec = codecOptions.find(c => c.id === option.value);
-            return codec && (codec.type === 'nvidia' || codec.type === 'intel' || codec.type === 'amd');
-        });
-        if (hardwareOptions.length > 0) {
-            selectedOption = hardwareOptions[0];
-            console.log(`Auto-selected first hardware encoder: ${selectedOption.textContent}`);
-        }
-    }
-    
-    // Third priority: Software encoder (fallback)
-    if (!selectedOption) {
-        const softwareOption = Array.from(codecSelect.options).find(option => option.value === 'libx264');
-        if (softwareOption) {
-            selectedOption = softwareOption;
-            console.log('Auto-selected software encoder (fallback)');
-        }
-    }
+    // Options arrive ranked by measured encoder throughput; select the server's default (the fastest)
+    const defaultCodec = codecOptions.find(codec => codec.default) || codecOptions[0];
+    const selectedOption = defaultCodec ?
+        Array.from(codecSelect.options).find(option => option.value === defaultCodec.id) : null;
     
     // Apply selection
     if (selectedOption) {
@@ -2893,6 +3142,8 @@ async function trackSelectedRectangle() {
     const rect = selectedRect.rect;
     const trackBtn = document.getElementById('trackBtn');
     const frameLimit = parseInt(document.getElementById('trackingFrames').value);
+    const direction = document.getElementById('trackingDirection').value;
+    const startFrame = currentFrameIndex;
     
     try {
         // Disable button during tracking
@@ -2921,9 +3172,10 @@ async function trackSelectedRectangle() {
                     height: rect.height,
                     rectId: rect.rectId
                 },
-                start_frame: currentFrameIndex,
+                start_frame: startFrame,
                 fps: videoFPS,
-                frame_limit: frameLimit
+                frame_limit: frameLimit,
+                direction: direction
             }),
         });
         
@@ -2936,9 +3188,37 @@ async function trackSelectedRectangle() {
             // Apply enhanced OCR tracking results to create keyframes
             let keyframesCreated = 0;
             let totalEvents = 0;
+            let rectId = rect.rectId;
+            const results = result.tracking_results;
+            
+            // Backward results start the rectangle earlier: it is created at the first
+            // tracked frame and pinned to its original position at the start frame
+            let createdAt = null;
+            if (results.length > 0 && results[0].frame < startFrame) {
+                const first = results[0];
+                if (first.frame < getRectangleCreationFrame(rectId)) {
+                    rectId = moveRectangleCreation(rectId, first.frame, first);
+                    rect.rectId = rectId;
+                    createdAt = first.frame;
+                }
+                if (!frameRectangles[startFrame]) {
+                    frameRectangles[startFrame] = [];
+                }
+                frameRectangles[startFrame] = frameRectangles[startFrame].filter(r => r.rectangleMoved !== rectId);
+                frameRectangles[startFrame].push({
+                    rectangleMoved: rectId,
+                    x: rect.x,
+                    y: rect.y,
+                    width: rect.width,
+                    height: rect.height
+                });
+            }
             
-            for (const trackResult of result.tracking_results) {
+            for (const [resultIndex, trackResult] of results.entries()) {
                 const frameIndex = trackResult.frame;
+                if (frameIndex === createdAt) {
+                    continue;
+                }
                 
                 // Initialize frame if needed
                 if (!frameRectangles[frameIndex]) {
@@ -2955,13 +3235,13 @@ async function trackSelectedRectangle() {
                     
                     // Remove existing events for this rectangle
                     frameRectangles[frameIndex] = frameRectangles[frameIndex].filter(r => 
-                        !(r.rectangleMoved === rect.rectId || r.rectangleResized === rect.rectId)
+                        !(r.rectangleMoved === rectId || r.rectangleResized === rectId)
                     );
                     
                     if (trackResult.rectangle_moved) {
                         // Add move event
                         frameRectangles[frameIndex].push({
-                            rectangleMoved: rect.rectId,
+                            rectangleMoved: rectId,
                             x: trackResult.x,
                             y: trackResult.y,
                             width: trackResult.width,
@@ -2978,7 +3258,7 @@ async function trackSelectedRectangle() {
                     if (trackResult.rectangle_resized) {
                         // Add resize event
                         frameRectangles[frameIndex].push({
-                            rectangleResized: rect.rectId,
+                            rectangleResized: rectId,
                             width: trackResult.width,
                             height: trackResult.height,
                             x: trackResult.x,
@@ -2997,9 +3277,9 @@ async function trackSelectedRectangle() {
                         console.log(`Frame ${frameIndex}: Created keyframe with OCR data - texts: [${trackResult.matched_texts?.join(', ')}]`);
                     }
                 } else if (trackResult.method === 'Template') {
-                    // Handle template-based tracking (existing logic)
-                    const prevResult = result.tracking_results[result.tracking_results.indexOf(trackResult) - 1];
-                    const startPos = prevResult || { x: rect.x, y: rect.y };
+                    // Handle template-based tracking, comparing with the previous frame in frame order
+                    const prevResult = results[resultIndex - 1];
+                    const startPos = frameIndex === startFrame + 1 || !prevResult ? { x: rect.x, y: rect.y } : prevResult;
                     
                     const deltaX = Math.abs(trackResult.x - startPos.x);
                     const deltaY = Math.abs(trackResult.y - startPos.y);
@@ -3007,12 +3287,12 @@ async function trackSelectedRectangle() {
                     if (deltaX > 5 || deltaY > 5) { // Only if moved more than 5 pixels
                         // Remove existing move event for this rectangle
                         frameRectangles[frameIndex] = frameRectangles[frameIndex].filter(r => 
-                            !(r.rectangleMoved === rect.rectId)
+                            !(r.rectangleMoved === rectId)
                         );
                         
                         // Add new move event
                         frameRectangles[frameIndex].push({
-                            rectangleMoved: rect.rectId,
+                            rectangleMoved: rectId,
                             x: trackResult.x,
                             y: trackResult.y,
                             width: trackResult.width,
@@ -3054,8 +3334,52 @@ async function trackSelectedRectangle() {
         // Hide tracking modal and re-enable button
         hideTrackingModal();
         trackBtn.disabled = false;
-        trackBtn.textContent = 'Track Forward';
+        trackBtn.textContent = 'Track';
+    }
+}
+
+function getRectangleCreationFrame(rectId) {
+    // Frame holding the rectangle's creation entry
+    for (const frameIndex of Object.keys(frameRectangles)) {
+        if (frameRectangles[frameIndex].some(r => r.rectangleId === rectId)) {
+            return parseInt(frameIndex);
+        }
+    }
+    return parseInt(rectId.split('_')[0]);
+}
+
+function moveRectangleCreation(rectId, frameIndex, position) {
+    // Move a rectangle's creation entry to an earlier frame, keeping its events
+    const creationFrame = getRectangleCreationFrame(rectId);
+    const creationRects = frameRectangles[creationFrame] || [];
+    const creationIndex = creationRects.findIndex(r => r.rectangleId === rectId);
+    if (creationIndex < 0) {
+        return rectId;
     }
+    const [creation] = creationRects.splice(creationIndex, 1);
+    if (creationRects.length === 0) {
+        delete frameRectangles[creationFrame];
+    }
+    
+    if (!frameRectangles[frameIndex]) {
+        frameRectangles[frameIndex] = [];
+    }
+    // Rectangle ids are "<creation frame>_<index>", so the moved rectangle gets a new one
+    const newRectId = `${frameIndex}_${frameRectangles[frameIndex].length}`;
+    frameRectangles[frameIndex].push({
+        ...creation,
+        x: position.x,
+        y: position.y,
+        rectangleId: newRectId
+    });
+    
+    Object.values(frameRectangles).forEach(rects => rects.forEach(r => {
+        if (r.rectangleMoved === rectId) r.rectangleMoved = newRectId;
+        if (r.rectangleResized === rectId) r.rectangleResized = newRectId;
+        if (r.removesRect === rectId) r.removesRect = newRectId;
+    }));
+    console.log(`Moved creation of rectangle ${rectId} from frame ${creationFrame} to frame ${frameIndex} as ${newRectId}`);
+    return newRectId;
 }
 
 function showTrackingModal() {
@@ -3129,6 +3453,7 @@ function updateTrackingProgress(progress) {
 function updateTrackingSteps(stage) {
     const steps = ['trackStep1', 'trackStep2', 'trackStep3'];
     const stepStates = {
+        'loading': [1, 0, 0],    // OCR model still loading, part of step 1
         'analyzing': [1, 0, 0],  // Step 1 active
         'tracking': [2, 1, 0],   // Step 1 complete, Step 2 active
         'completed': [2, 2, 2],  // All steps complete